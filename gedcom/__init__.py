@@ -33,9 +33,25 @@ A Python module for parsing, analyzing, and manipulating GEDCOM files.
 
 __all__ = [
     # Subpackages
+    "bench",
     "element",
+    "export",
+    "index",
     # Modules
+    "aio",
+    "batch",
+    "compression",
+    "date",
+    "diff",
+    "duplicates",
     "helpers",
+    "memory",
     "parser",
-    "tags"
+    "phonetics",
+    "recovery",
+    "shared",
+    "stats",
+    "store",
+    "tags",
+    "validate"
 ]
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Helpers for reading and writing GEDCOM data within `asyncio`, used by `gedcom.parser.Parser.parse_async()`
+and `gedcom.parser.Parser.save_gedcom_async()`.
+
+```python
+async def handle_upload(reader, writer):
+    gedcom_parser = Parser()
+    await gedcom_parser.parse_async(reader)
+    ...
+    await gedcom_parser.save_gedcom_async(writer)
+```
+"""
+
+import asyncio
+import inspect
+import io
+from gedcom.helpers import LineBuffer
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""Number of bytes read at once from readers with a `read()` method"""
+
+
+async def iter_chunks(reader, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the chunks of bytes of an `asyncio.StreamReader`, or any reader with a `read()` coroutine,
+    or of an async iterator of bytes
+
+    :type reader: asyncio.StreamReader
+    :type chunk_size: int
+    :rtype: collections.AsyncIterator[bytes]
+    """
+    if hasattr(reader, '__aiter__') and not hasattr(reader, 'read'):
+        async for chunk in reader:
+            yield chunk
+        return
+
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def iter_lines(reader, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the lines of bytes, each ending with `\\n` apart from the last one, read from the given reader
+
+    Lines may be split across any number of chunks, see `gedcom.helpers.LineBuffer`.
+
+    :type reader: asyncio.StreamReader
+    :type chunk_size: int
+    :rtype: collections.AsyncIterator[bytes]
+    """
+    line_buffer = LineBuffer()
+    async for chunk in iter_chunks(reader, chunk_size):
+        for line in line_buffer.feed(chunk):
+            yield line
+    for line in line_buffer.close():
+        yield line
+
+
+async def write(writer, data):
+    """Writes the given bytes to an `asyncio.StreamWriter`, waiting until it's drained,
+    or to any writer with a `write()` coroutine
+
+    :type writer: asyncio.StreamWriter
+    :type data: bytes
+    """
+    result = writer.write(data)
+    if inspect.isawaitable(result):
+        await result
+    drain = getattr(writer, 'drain', None)
+    if drain is not None:
+        await drain()
+
+
+class AsyncWriterFile(io.RawIOBase):
+    """Binary file writing to an async writer, for code running within another thread than the event loop
+
+    Each write waits until the data has been written by `write()` within the event loop.
+
+    :type writer: asyncio.StreamWriter
+    :type loop: asyncio.AbstractEventLoop
+    """
+
+    def __init__(self, writer, loop):
+        super(AsyncWriterFile, self).__init__()
+        self.__writer = writer
+        self.__loop = loop
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        asyncio.run_coroutine_threadsafe(write(self.__writer, data), self.__loop).result()
+        return len(data)
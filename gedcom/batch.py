@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Parsing many GEDCOM files in parallel, reducing each of them to a small result.
+
+Each file is parsed on its own by a `gedcom.parser.Parser` and passed to a function, whose return value
+is sent back instead of the parsed records. The files are handed to a pool of worker processes in
+chunks, so starting a process and importing this package is paid once per worker instead of once
+per file. Results are yielded as soon as their chunk is finished:
+
+```python
+import gedcom.batch
+import gedcom.validate
+
+for result in gedcom.batch.parse_many(paths, workers=8, func=gedcom.validate.validate):
+    if result.error is not None:
+        print("Couldn't parse %s: %s" % (result.path, result.error))
+    else:
+        print("%s: %d problems" % (result.path, len(result.value)))
+```
+
+The function has to be picklable, so it should be defined at the top level of a module.
+"""
+
+import os
+from collections import deque, namedtuple
+
+DEFAULT_CHUNK_SIZE = 16
+"""Number of files handed to a worker at once"""
+
+BatchResult = namedtuple("BatchResult", ["path", "value", "error"])
+"""The value returned by the function for the file at the given path, or the exception raised while parsing
+or reducing it"""
+
+
+def count_records(parser):
+    """Counts the records of a parsed file by their tag, the default function of `parse_many()`
+    :type parser: gedcom.parser.Parser
+    :rtype: dict
+    """
+    counts = {}
+    for record in parser.get_root_child_elements():
+        counts[record.get_tag()] = counts.get(record.get_tag(), 0) + 1
+    return counts
+
+
+def _parse_chunk(arguments):
+    """Parses each file of a chunk and applies the function to it, returning a list of results
+
+    Exceptions are caught for each file separately, so a broken file doesn't affect the others.
+    """
+    paths, func, strict = arguments
+    from gedcom.parser import Parser
+    results = []
+    for path in paths:
+        try:
+            parser = Parser()
+            parser.parse_file(path, strict)
+            results.append(BatchResult(path, func(parser), None))
+        except Exception as error:
+            results.append(BatchResult(path, None, error))
+    return results
+
+
+def _iter_chunks(paths, chunk_size):
+    """Yields the arguments of `_parse_chunk()` for consecutive chunks of the given paths"""
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_many(paths, workers=None, func=count_records, chunk_size=DEFAULT_CHUNK_SIZE, strict=True, executor=None):
+    """Parses each of the files at the given paths and yields a `BatchResult` of `func` applied to its parser
+
+    With `workers` processes or a given `concurrent.futures.Executor`, chunks of `chunk_size` files are
+    parsed in parallel and their results are yielded as soon as the chunk is finished, so they may be
+    in a different order than the paths. Only a few chunks per worker are submitted ahead of time,
+    so `paths` may be a lazy iterable of any length. A given executor is kept open, so it may be
+    reused by further batches. Otherwise, the files are parsed one after another within this process.
+
+    Exceptions raised while parsing a file or applying the function to it are returned as the
+    `error` of its result instead of stopping the batch. If a worker dies, the pool of processes
+    gets replaced and the files of all chunks lost along with it are parsed again one at a time,
+    so only the files killing a worker get a `concurrent.futures.process.BrokenProcessPool`.
+    If the value of a file can't be sent back, all files of its chunk get the resulting exception.
+
+    :type paths: collections.Iterable[str]
+    :type workers: int
+    :type func: callable
+    :type chunk_size: int
+    :type strict: bool
+    :type executor: concurrent.futures.Executor
+    :rtype: collections.Iterator[BatchResult]
+    """
+    if executor is None and (workers is None or workers < 2):
+        for chunk in _iter_chunks(paths, chunk_size):
+            for result in _parse_chunk((chunk, func, strict)):
+                yield result
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    maximum_pending = 2 * (workers or os.cpu_count() or 1)
+
+    chunks = _iter_chunks(paths, chunk_size)
+    # Files of chunks lost along with a dying worker, parsed one at a time to find the ones killing it
+    suspects = deque()
+    # The chunk, executor and whether it's running alone, by future
+    pending = {}
+    try:
+        while True:
+            if suspects:
+                if not pending:
+                    chunk = [suspects.popleft()]
+                    pending[executor.submit(_parse_chunk, (chunk, func, strict))] = (chunk, executor, True)
+            else:
+                for chunk in chunks:
+                    pending[executor.submit(_parse_chunk, (chunk, func, strict))] = (chunk, executor, False)
+                    if len(pending) >= maximum_pending:
+                        break
+            if not pending:
+                return
+
+            done = wait(pending, return_when=FIRST_COMPLETED)[0]
+            for future in done:
+                chunk, chunk_executor, alone = pending.pop(future)
+                try:
+                    results = future.result()
+                except BrokenProcessPool as error:
+                    if chunk_executor is executor:
+                        if own_executor:
+                            executor.shutdown(wait=False)
+                        executor = ProcessPoolExecutor(max_workers=workers)
+                        own_executor = True
+                    if not alone:
+                        suspects.extend(chunk)
+                        continue
+                    results = [BatchResult(chunk[0], None, error)]
+                except Exception as error:
+                    # The results couldn't be sent back, which affects the whole chunk
+                    results = [BatchResult(path, None, error) for path in chunk]
+                for result in results:
+                    yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Deterministic generator of synthetic GEDCOM files of any size.
+
+The individuals are spread over a number of generations of about the same size. The individuals of
+each generation are paired into families and the individuals of the next generation are assigned to
+these families as children. The same arguments, including the `seed`, always produce the same file.
+
+```python
+from gedcom.bench.generator import generate_file
+
+generate_file('synthetic.ged', individuals=100000, generations=20)
+```
+"""
+
+import random
+
+GIVEN_NAMES = {
+    "M": ("Adam", "Anton", "Bernhard", "Carl", "Emil", "Franz", "Friedrich", "Georg", "Heinrich", "Johann",
+          "Josef", "Karl", "Ludwig", "Martin", "Max", "Otto", "Paul", "Peter", "Wilhelm", "Xaver"),
+    "F": ("Agnes", "Anna", "Barbara", "Clara", "Elisabeth", "Emma", "Erika", "Franziska", "Johanna", "Katharina",
+          "Luise", "Magdalena", "Margarete", "Maria", "Martha", "Rosa", "Sophie", "Theresia", "Ursula",
+          "Wilhelmine"),
+}
+SURNAMES = ("Bauer", "Becker", "Fischer", "Hoffmann", "Koch", "Meier", "Meyer", "Mueller", "Müller", "Richter",
+            "Schäfer", "Schmidt", "Schmitt", "Schneider", "Schulz", "Wagner", "Weber", "Wolf", "Zimmermann",
+            "Mustermann")
+PLACES = ("Berlin, Brandenburg, Germany", "München, Bayern, Germany", "Augsburg, Bayern, Germany",
+          "Köln, Nordrhein-Westfalen, Germany", "Hamburg, Hamburg, Germany", "Dresden, Sachsen, Germany",
+          "Wien, Wien, Austria", "Zürich, Zürich, Switzerland", "Bremen, Bremen, Germany", "Ulm, Württemberg, Germany")
+WORDS = ("the", "family", "moved", "to", "after", "war", "farm", "church", "records", "mention", "a", "brother",
+         "who", "emigrated", "in", "spring", "letters", "were", "kept", "by", "his", "daughter")
+MONTHS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+FIRST_YEAR = 1500
+GENERATION_YEARS = 25
+LINE_LENGTH = 72
+
+
+def _get_note_lines(generator, words):
+    """Returns the text of a note split into lines of at most `LINE_LENGTH` characters, with their tags"""
+    text = ' '.join(generator.choice(WORDS) for _ in range(words))
+    lines = []
+    for paragraph_number, paragraph in enumerate((text[:len(text) // 2], text[len(text) // 2:])):
+        for start in range(0, max(1, len(paragraph)), LINE_LENGTH):
+            if not lines:
+                tag = "NOTE"
+            elif start == 0:
+                tag = "CONT"
+            else:
+                tag = "CONC"
+            lines.append((tag, paragraph[start:start + LINE_LENGTH]))
+    return lines
+
+
+def generate(open_file, individuals=1000, generations=10, families=None, note_rate=0.1, note_words=60,
+             pedigree_collapse=0.05, sources=None, seed=0):
+    """Writes a synthetic GEDCOM file to a file opened in text mode, returning the number of lines written
+
+    `families` limits the number of families per generation, by default all individuals of a generation
+    get married if possible. A `note_rate` share of the individuals gets a note of `note_words` words,
+    spread over `CONC` and `CONT` lines. A `pedigree_collapse` share of the marriages is between
+    cousins, if there are any, so ancestors appear more than once within the pedigree of their
+    descendants. Each individual cites one of `sources` source records, by default one per hundred individuals.
+
+    :type open_file: file
+    :type individuals: int
+    :type generations: int
+    :type families: int
+    :type note_rate: float
+    :type note_words: int
+    :type pedigree_collapse: float
+    :type sources: int
+    :type seed: int
+    :rtype: int
+    """
+    generator = random.Random(seed)
+    generations = max(1, min(generations, individuals))
+    if sources is None:
+        sources = max(1, individuals // 100)
+
+    # Individuals are (sex, given name, surname, birth year, family as child), families are (husband, wife)
+    people = []
+    family_list = []
+    family_children = []
+    family_spouses = []
+    previous_generation = []
+
+    for generation in range(generations):
+        size = individuals // generations + (1 if generation < individuals % generations else 0)
+        generation_families = _marry(generator, people, family_list, previous_generation, families,
+                                     pedigree_collapse)
+        current_generation = []
+
+        for _ in range(size):
+            sex = generator.choice("MF")
+            family = generator.choice(generation_families) if generation_families else None
+            if family is not None:
+                surname = people[family_list[family][0]][2]
+            else:
+                surname = generator.choice(SURNAMES)
+            birth_year = FIRST_YEAR + generation * GENERATION_YEARS + generator.randrange(GENERATION_YEARS)
+            people.append((sex, generator.choice(GIVEN_NAMES[sex]), surname, birth_year, family))
+            current_generation.append(len(people) - 1)
+
+        previous_generation = current_generation
+
+    for family_number, (husband, wife) in enumerate(family_list):
+        family_children.append([])
+        for spouse in (husband, wife):
+            while len(family_spouses) <= spouse:
+                family_spouses.append([])
+            family_spouses[spouse].append(family_number)
+    for number, person in enumerate(people):
+        if person[4] is not None:
+            family_children[person[4]].append(number)
+
+    write = open_file.write
+    lines = 0
+
+    def write_lines(*record_lines):
+        write(''.join(line + '\n' for line in record_lines))
+        return len(record_lines)
+
+    lines += write_lines("0 HEAD", "1 SOUR python-gedcom", "1 SUBM @U1@", "1 GEDC", "2 VERS 5.5.1",
+                         "2 FORM LINEAGE-LINKED", "1 CHAR UTF-8", "0 @U1@ SUBM", "1 NAME python-gedcom")
+
+    for number, (sex, given_name, surname, birth_year, family) in enumerate(people):
+        record_lines = [
+            "0 @I%d@ INDI" % (number + 1),
+            "1 NAME %s /%s/" % (given_name, surname),
+            "2 GIVN %s" % given_name,
+            "2 SURN %s" % surname,
+            "1 SEX %s" % sex,
+            "1 BIRT",
+            "2 DATE %d %s %d" % (generator.randint(1, 28), generator.choice(MONTHS), birth_year),
+            "2 PLAC %s" % generator.choice(PLACES),
+        ]
+        if generator.random() < 0.8:
+            record_lines.extend([
+                "1 DEAT",
+                "2 DATE %d" % (birth_year + generator.randint(0, 90)),
+                "2 PLAC %s" % generator.choice(PLACES),
+            ])
+        if generator.random() < note_rate:
+            record_lines.extend("%d %s %s" % (1 if tag == "NOTE" else 2, tag, text)
+                                for tag, text in _get_note_lines(generator, note_words))
+        record_lines.append("1 SOUR @S%d@" % generator.randint(1, sources))
+        if family is not None:
+            record_lines.append("1 FAMC @F%d@" % (family + 1))
+        if number < len(family_spouses):
+            record_lines.extend("1 FAMS @F%d@" % (spouse_family + 1) for spouse_family in family_spouses[number])
+        lines += write_lines(*record_lines)
+
+    for number, (husband, wife) in enumerate(family_list):
+        record_lines = [
+            "0 @F%d@ FAM" % (number + 1),
+            "1 HUSB @I%d@" % (husband + 1),
+            "1 WIFE @I%d@" % (wife + 1),
+            "1 MARR",
+            "2 DATE %d" % (max(people[husband][3], people[wife][3]) + generator.randint(18, 30)),
+        ]
+        record_lines.extend("1 CHIL @I%d@" % (child + 1) for child in family_children[number])
+        lines += write_lines(*record_lines)
+
+    for number in range(sources):
+        lines += write_lines("0 @S%d@ SOUR" % (number + 1), "1 TITL Church book %d" % (number + 1),
+                             "1 AUTH Parish %s" % PLACES[number % len(PLACES)].split(',')[0])
+
+    lines += write_lines("0 TRLR")
+    return lines
+
+
+def _marry(generator, people, family_list, generation, families, pedigree_collapse):
+    """Pairs the men and women of a generation into families, returning the numbers of the new families"""
+    men = [number for number in generation if people[number][0] == "M"]
+    women = [number for number in generation if people[number][0] == "F"]
+    generator.shuffle(men)
+    generator.shuffle(women)
+
+    count = min(len(men), len(women))
+    if families is not None:
+        count = min(count, families)
+
+    # Unmarried women by the families of their grandparents, to find cousins
+    cousins = {}
+    if pedigree_collapse > 0:
+        for woman in women:
+            for grandparent_family in _get_grandparent_families(people, family_list, woman):
+                cousins.setdefault(grandparent_family, []).append(woman)
+
+    available = set(women)
+    new_families = []
+    for man in men[:count]:
+        wife = None
+        if generator.random() < pedigree_collapse:
+            for grandparent_family in _get_grandparent_families(people, family_list, man):
+                candidates = [woman for woman in cousins.get(grandparent_family, ())
+                              if woman in available and people[woman][4] != people[man][4]]
+                if candidates:
+                    wife = generator.choice(candidates)
+                    break
+        if wife is None:
+            while women and women[-1] not in available:
+                women.pop()
+            if not women:
+                break
+            wife = women.pop()
+        available.discard(wife)
+        family_list.append((man, wife))
+        new_families.append(len(family_list) - 1)
+    return new_families
+
+
+def _get_grandparent_families(people, family_list, number):
+    """Returns the families the parents of an individual were born into"""
+    family = people[number][4]
+    if family is None:
+        return []
+    return [people[parent][4] for parent in family_list[family] if people[parent][4] is not None]
+
+
+def generate_file(file_path, **arguments):
+    """Writes a synthetic GEDCOM file to the given path, returning the number of lines written
+
+    See `gedcom.bench.generator.generate()` for the arguments.
+
+    :type file_path: str
+    :rtype: int
+    """
+    with open(file_path, 'w', encoding='utf-8') as gedcom_file:
+        return generate(gedcom_file, **arguments)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Benchmark runner timing the `gedcom.parser.Parser` on synthetic files, see `gedcom.bench.generator`.
+
+Each benchmark is timed `repeat` times without tracing, keeping the fastest run, and then run once more
+while tracing memory allocations with `tracemalloc` to measure its peak memory. The results are
+printed as JSON, so they can be tracked between commits:
+
+```
+python -m gedcom.bench --sizes 1000,10000,100000 --output results.json
+```
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from gedcom.bench.generator import generate_file
+from gedcom.element.individual import IndividualElement
+from gedcom.parser import Parser
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+"""Default numbers of individuals of the synthetic files"""
+
+DEFAULT_REPEAT = 3
+
+DEFAULT_GENERATIONS = 10
+"""Default number of generations of the synthetic files
+
+`gedcom.parser.Parser.get_ancestors()` lists ancestors once per path leading to them, so its
+time grows exponentially with the number of generations rather than with the size of the file.
+"""
+
+ANCESTOR_SAMPLES = 10
+"""Number of individuals of the last generation whose ancestors are looked up"""
+
+CRITERIA = "surname=Mustermann:birth_range=1600-1700"
+
+
+def _parse(file_path, parser):
+    parser.parse_file(file_path)
+
+
+def _traverse(file_path, parser):
+    parser.invalidate_cache()
+    for element in parser.get_element_list():
+        element.get_child_elements()
+
+
+def _get_ancestors(file_path, parser):
+    individuals = [element for element in parser.get_root_child_elements() if isinstance(element, IndividualElement)]
+    for individual in individuals[-ANCESTOR_SAMPLES:]:
+        parser.get_ancestors(individual)
+
+
+def _match_criteria(file_path, parser):
+    for element in parser.get_root_child_elements():
+        if isinstance(element, IndividualElement):
+            element.criteria_match(CRITERIA)
+
+
+def _save_gedcom(file_path, parser):
+    with open(os.devnull, 'w', encoding='utf-8') as output_file:
+        parser.save_gedcom(output_file)
+
+
+BENCHMARKS = (
+    ("parse", _parse),
+    ("traversal", _traverse),
+    ("get_ancestors", _get_ancestors),
+    ("criteria", _match_criteria),
+    ("save_gedcom", _save_gedcom),
+)
+"""Benchmarks by name, each of them called with the path of the file and a parser which parsed it"""
+
+
+def _measure(benchmark, file_path, parser, repeat):
+    """Returns the fastest time of a benchmark in seconds, and its peak memory in bytes"""
+    seconds = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        benchmark(file_path, parser)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        benchmark(file_path, parser)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return seconds, peak_bytes
+
+
+def run(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, seed=0, directory=None, generations=DEFAULT_GENERATIONS):
+    """Runs all benchmarks on synthetic files with the given numbers of individuals, returning the results
+
+    The files are written to a temporary directory, unless another `directory` is given.
+
+    :type sizes: list of int
+    :type repeat: int
+    :type seed: int
+    :type directory: str
+    :type generations: int
+    :rtype: dict
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=directory) as temporary_directory:
+        for size in sizes:
+            file_path = os.path.join(temporary_directory, "synthetic-%d.ged" % size)
+            lines = generate_file(file_path, individuals=size, generations=generations, seed=seed)
+
+            parser = Parser()
+            benchmarks = {}
+            for name, benchmark in BENCHMARKS:
+                seconds, peak_bytes = _measure(benchmark, file_path, parser, repeat)
+                benchmarks[name] = {"seconds": seconds, "peak_bytes": peak_bytes}
+
+            results.append({
+                "individuals": size,
+                "generations": generations,
+                "lines": lines,
+                "bytes": os.path.getsize(file_path),
+                "lines_per_second": lines / benchmarks["parse"]["seconds"],
+                "benchmarks": benchmarks,
+            })
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main(arguments=None):
+    """Runs the benchmarks from the command line, printing the results as JSON
+    :type arguments: list of str
+    """
+    argument_parser = argparse.ArgumentParser(prog="python -m gedcom.bench", description=__doc__.split("\n\n")[0])
+    argument_parser.add_argument("--sizes", default=','.join(str(size) for size in DEFAULT_SIZES),
+                                 help="comma-separated numbers of individuals (default: %(default)s)")
+    argument_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                                 help="number of timed runs per benchmark (default: %(default)s)")
+    argument_parser.add_argument("--seed", type=int, default=0, help="seed of the generator (default: %(default)s)")
+    argument_parser.add_argument("--generations", type=int, default=DEFAULT_GENERATIONS,
+                                 help="number of generations of each file (default: %(default)s)")
+    argument_parser.add_argument("--directory", help="directory for the synthetic files")
+    argument_parser.add_argument("--output", help="file to write the results to, instead of printing them")
+    options = argument_parser.parse_args(arguments)
+
+    sizes = [int(size) for size in options.sizes.split(',')]
+    results = run(sizes, options.repeat, options.seed, options.directory, options.generations)
+
+    if options.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(options.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Command line tool for common jobs on GEDCOM files, run as `python -m gedcom`.
+
+```
+python -m gedcom stats family.ged --workers 4
+python -m gedcom find family.ged "surname=Mustermann:birth_range=1900-1950"
+python -m gedcom convert family.ged family.sqlite
+python -m gedcom validate family.ged --workers 4
+python -m gedcom extract family.ged ancestors.ged @I1@ --include ancestors --generations 4
+```
+
+Where possible, the commands parse one record at a time instead of keeping the whole file in
+memory, and `--workers` parses parts of uncompressed files in parallel processes. `--profile`
+prints the time spent and the statistics of parsing the file, including the time spent within each
+phase (see `gedcom.stats`), to the standard error as JSON. The statistics of parts parsed in parallel are
+added up, and `validate` only prints the time spent. Each command only imports the modules it needs.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+FORMATS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+"""Output formats of the `convert` command implied by the file extension, GEDCOM otherwise"""
+
+
+def _iter_records(options):
+    """Yields the records of the file one at a time, keeping the statistics of parsing it for `--profile`"""
+    from gedcom.parser import Parser
+    parser = Parser()
+    for record in parser.iter_file_records(options.file, options.strict, stats=options.profile):
+        yield record
+    options.parse_stats = parser.get_stats()
+
+
+def _parse_file(options):
+    """Parses a whole file, keeping its statistics for `--profile`
+    :rtype: gedcom.parser.Parser
+    """
+    from gedcom.parser import Parser
+    parser = Parser()
+    parser.parse_file(options.file, options.strict, stats=options.profile)
+    options.parse_stats = parser.get_stats()
+    return parser
+
+
+def _map_chunks(function, options):
+    """Calls `function` with each chunk of records of a file, in parallel if possible, returning the results in order
+
+    The function gets the path, the byte range, `strict` and whether to collect statistics, and returns
+    its result along with the statistics of parsing the chunk. The statistics of all chunks are merged
+    and kept for `--profile`. Compressed files can't be split and are passed as a single chunk covering
+    the whole file.
+
+    :type function: callable
+    :type options: argparse.Namespace
+    :rtype: list
+    """
+    from gedcom.compression import detect_compression
+    with open(options.file, 'rb') as gedcom_file:
+        compressed = detect_compression(gedcom_file.read(6)) is not None
+
+    if options.workers is None or options.workers < 2 or compressed:
+        results = [function((options.file, None, None, options.strict, options.profile))]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from gedcom.helpers import get_record_ranges
+        chunks = [(options.file, start, end, options.strict, options.profile)
+                  for start, end in get_record_ranges(options.file, options.workers * 4)]
+        with ProcessPoolExecutor(max_workers=options.workers) as executor:
+            results = list(executor.map(function, chunks))
+
+    if options.profile:
+        from gedcom.stats import merge_stats
+        options.parse_stats = merge_stats(parse_stats for _, parse_stats in results)
+    return [result for result, _ in results]
+
+
+def _iter_chunk_records(arguments, parser):
+    """Yields the records of a chunk parsed by the given parser, see `_map_chunks()`"""
+    file_path, start, end, strict, stats = arguments
+    if start is None:
+        return parser.iter_file_records(file_path, strict, stats=stats)
+
+    from gedcom.helpers import iter_file_lines
+    return parser.iter_records(iter_file_lines(file_path, start, end), strict, stats=stats)
+
+
+def _count_chunk(arguments):
+    """Counts the records by type and the elements by tag of a chunk"""
+    from gedcom.parser import Parser
+    parser = Parser()
+    records = {}
+    tags = {}
+    maximum_depth = 0
+    for record in _iter_chunk_records(arguments, parser):
+        records[record.get_tag()] = records.get(record.get_tag(), 0) + 1
+        stack = [record]
+        while stack:
+            element = stack.pop()
+            tags[element.get_tag()] = tags.get(element.get_tag(), 0) + 1
+            maximum_depth = max(maximum_depth, element.get_level())
+            stack.extend(element.get_child_elements())
+    return (records, tags, maximum_depth), parser.get_stats()
+
+
+def _find_chunk(arguments):
+    """Returns pointer and name of the individuals of a chunk matching the criteria"""
+    from gedcom.element.individual import IndividualElement
+    from gedcom.parser import Parser
+    parser = Parser()
+    criteria = arguments[-1]
+    matches = []
+    for record in _iter_chunk_records(arguments[:-1], parser):
+        if isinstance(record, IndividualElement) and record.criteria_match(criteria):
+            matches.append((record.get_pointer(), ' '.join(part for part in record.get_name() if part)))
+    return matches, parser.get_stats()
+
+
+class _FindChunk(object):
+    """Picklable callable finding individuals within a chunk, see `_find_chunk()`"""
+
+    def __init__(self, criteria):
+        self.__criteria = criteria
+
+    def __call__(self, arguments):
+        return _find_chunk(arguments + (self.__criteria,))
+
+
+def stats(options, output):
+    """Prints the number of records by type, of elements by tag and the maximum depth as JSON"""
+    records = {}
+    tags = {}
+    maximum_depth = 0
+    for chunk_records, chunk_tags, chunk_maximum_depth in _map_chunks(_count_chunk, options):
+        for totals, counts in ((records, chunk_records), (tags, chunk_tags)):
+            for key, count in counts.items():
+                totals[key] = totals.get(key, 0) + count
+        maximum_depth = max(maximum_depth, chunk_maximum_depth)
+
+    json.dump({
+        "elements": sum(tags.values()),
+        "records": records,
+        "tags": tags,
+        "maximum_depth": maximum_depth,
+    }, output, indent=2, sort_keys=True)
+    output.write('\n')
+    return 0
+
+
+def find(options, output):
+    """Prints pointer and name of each individual matching the criteria, see `criteria_match()`"""
+    count = 0
+    for matches in _map_chunks(_FindChunk(options.criteria), options):
+        for pointer, name in matches:
+            output.write("%s\t%s\n" % (pointer, name))
+            count += 1
+    return 0 if count > 0 else 1
+
+
+def convert(options, output):
+    """Converts a file into JSON, newline-delimited JSON, SQLite or (compressed) GEDCOM"""
+    import os
+    output_format = options.format
+    if output_format is None:
+        output_format = FORMATS.get(os.path.splitext(options.output)[1].lower(), "gedcom")
+
+    if output_format == "sqlite":
+        from gedcom.export.sqlite import write_sqlite
+        write_sqlite(_iter_records(options), options.output)
+    elif output_format in ("json", "ndjson"):
+        from gedcom.export.json import write_json, write_ndjson
+        write = write_json if output_format == "json" else write_ndjson
+        with open(options.output, 'wb') as output_file:
+            write(_iter_records(options), output_file)
+    else:
+        parser = _parse_file(options)
+        parser.save_file(options.output)
+    return 0
+
+
+def validate(options, output):
+    """Prints the problems found within a file, one per line"""
+    from gedcom.validate import SEVERITY_ERROR, validate_file
+    errors = 0
+    for diagnostic in validate_file(options.file, options.workers, options.strict):
+        output.write("%d: %s %s %s\n" % diagnostic)
+        if diagnostic.severity == SEVERITY_ERROR:
+            errors += 1
+    return 1 if errors > 0 else 0
+
+
+def extract(options, output):
+    """Writes individuals together with their ancestors and/or descendants into a standalone file"""
+    import gedcom.compression
+    parser = _parse_file(options)
+
+    element_dictionary = parser.get_element_dictionary()
+    missing = [pointer for pointer in options.pointers if pointer not in element_dictionary]
+    if missing:
+        sys.stderr.write("Unknown pointers: %s\n" % ', '.join(missing))
+        return 2
+
+    individuals = [element_dictionary[pointer] for pointer in options.pointers]
+    records = parser.extract(individuals, options.include.upper(), options.generations)
+    with gedcom.compression.open_file(options.output, 'wb') as output_file:
+        parser.write_gedcom(output_file, records=records)
+    return 0
+
+
+COMMANDS = {
+    "stats": stats,
+    "find": find,
+    "convert": convert,
+    "validate": validate,
+    "extract": extract,
+}
+
+
+def get_argument_parser():
+    """Returns the parser of the command line arguments
+    :rtype: argparse.ArgumentParser
+    """
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument("--workers", type=int, help="number of processes parsing in parallel")
+    common_parser.add_argument("--profile", action="store_true",
+                               help="print the time spent and parse statistics to standard error")
+    common_parser.set_defaults(parse_stats=None)
+    common_parser.add_argument("--lenient", dest="strict", action="store_false",
+                               help="fix malformed lines instead of failing, see gedcom.recovery")
+
+    argument_parser = argparse.ArgumentParser(prog="python -m gedcom",
+                                              description=__doc__.split("\n\n")[0].strip())
+    subparsers = argument_parser.add_subparsers(dest="command", metavar="command")
+    subparsers.required = True
+
+    command_parser = subparsers.add_parser("stats", parents=[common_parser],
+                                           help="count records and elements")
+    command_parser.add_argument("file")
+
+    command_parser = subparsers.add_parser("find", parents=[common_parser],
+                                           help="find individuals matching criteria")
+    command_parser.add_argument("file")
+    command_parser.add_argument("criteria", help="criteria like surname=Mustermann:birth_range=1900-1950")
+
+    command_parser = subparsers.add_parser("convert", parents=[common_parser],
+                                           help="convert into JSON, SQLite or compressed GEDCOM")
+    command_parser.add_argument("file")
+    command_parser.add_argument("output")
+    command_parser.add_argument("--format", choices=("gedcom", "json", "ndjson", "sqlite"),
+                                help="output format, implied by the extension of the output by default")
+
+    command_parser = subparsers.add_parser("validate", parents=[common_parser],
+                                           help="report structural problems and broken links")
+    command_parser.add_argument("file")
+
+    command_parser = subparsers.add_parser("extract", parents=[common_parser],
+                                           help="write individuals with their relatives into a new file")
+    command_parser.add_argument("file")
+    command_parser.add_argument("output")
+    command_parser.add_argument("pointers", nargs="+", metavar="pointer", help="pointer like @I1@")
+    command_parser.add_argument("--include", choices=("ancestors", "descendants", "both"), default="both")
+    command_parser.add_argument("--generations", type=int)
+
+    return argument_parser
+
+
+def main(arguments=None, output=None):
+    """Runs a command from the command line, exiting with its status
+    :type arguments: list of str
+    :type output: file
+    """
+    options = get_argument_parser().parse_args(arguments)
+
+    start = time.perf_counter()
+    status = COMMANDS[options.command](options, output if output is not None else sys.stdout)
+
+    if options.profile:
+        profile = {
+            "command": options.command,
+            "seconds": time.perf_counter() - start,
+        }
+        if options.parse_stats is not None:
+            profile["parse"] = options.parse_stats.to_dict()
+        json.dump(profile, sys.stderr)
+        sys.stderr.write('\n')
+
+    sys.exit(status)
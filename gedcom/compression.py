@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Transparent reading and writing of compressed GEDCOM files.
+
+Compressed files are detected by their first bytes when reading, so `gedcom.parser.Parser.parse_file()`
+reads `.ged.gz` files the same way as `.ged` files. Data gets decompressed while parsing, without a
+temporary file. `zstd` is supported as of Python 3.14, where the standard library offers it.
+"""
+
+import importlib
+
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_BZIP2 = "bz2"
+COMPRESSION_XZ = "xz"
+COMPRESSION_ZSTD = "zstd"
+
+MAGIC_NUMBERS = (
+    (b"\x1f\x8b", COMPRESSION_GZIP),
+    (b"BZh", COMPRESSION_BZIP2),
+    (b"\xfd7zXZ\x00", COMPRESSION_XZ),
+    (b"\x28\xb5\x2f\xfd", COMPRESSION_ZSTD),
+)
+"""Leading bytes of the supported compression formats"""
+
+FILE_EXTENSIONS = {
+    ".gz": COMPRESSION_GZIP,
+    ".bz2": COMPRESSION_BZIP2,
+    ".xz": COMPRESSION_XZ,
+    ".zst": COMPRESSION_ZSTD,
+}
+"""File extensions implying a compression format when writing"""
+
+
+class UnsupportedCompressionError(Exception):
+    pass
+
+
+def detect_compression(data):
+    """Returns the compression format of data starting with the given bytes, or `None` if it isn't compressed
+    :type data: bytes
+    :rtype: str
+    """
+    for magic_number, compression in MAGIC_NUMBERS:
+        if data.startswith(magic_number):
+            return compression
+    return None
+
+
+def get_compression_from_path(file_path):
+    """Returns the compression format implied by the extension of a file path, or `None`
+    :type file_path: str
+    :rtype: str
+    """
+    for extension, compression in FILE_EXTENSIONS.items():
+        if str(file_path).lower().endswith(extension):
+            return compression
+    return None
+
+
+def _get_zstd_module():
+    try:
+        return importlib.import_module("compression.zstd")
+    except ImportError:
+        raise UnsupportedCompressionError("zstd compression requires Python 3.14 or newer")
+
+
+def open_file(file_path, mode="rb", compression=None, compression_level=None):
+    """Opens a possibly compressed file in binary mode
+
+    When reading (`mode` is `rb`) the compression format is detected from the first bytes of the file,
+    uncompressed files are opened as usual. When writing (`mode` is `wb`) the compression format is
+    either given by `compression` or implied by the file extension, like `.gz` for `COMPRESSION_GZIP`.
+    `compression_level` defaults to the default level of each format.
+
+    :type file_path: str
+    :type mode: str
+    :type compression: str
+    :type compression_level: int
+    :rtype: file
+    """
+    if mode not in ("rb", "wb"):
+        raise ValueError("Mode must be either 'rb' or 'wb', not %r" % mode)
+
+    if mode == "rb":
+        with open(file_path, "rb") as gedcom_file:
+            compression = detect_compression(gedcom_file.read(8))
+    elif compression is None:
+        compression = get_compression_from_path(file_path)
+
+    if compression is None:
+        return open(file_path, mode)
+
+    options = {}
+    if mode == "wb" and compression_level is not None:
+        options["preset" if compression == COMPRESSION_XZ else "compresslevel"] = compression_level
+
+    if compression == COMPRESSION_GZIP:
+        import gzip
+        return gzip.open(file_path, mode, **options)
+    if compression == COMPRESSION_BZIP2:
+        import bz2
+        return bz2.open(file_path, mode, **options)
+    if compression == COMPRESSION_XZ:
+        import lzma
+        return lzma.open(file_path, mode, **options)
+    if compression == COMPRESSION_ZSTD:
+        zstd = _get_zstd_module()
+        if "compresslevel" in options:
+            options = {"level": options["compresslevel"]}
+        return zstd.open(file_path, mode, **options)
+
+    raise UnsupportedCompressionError("Unknown compression format %r" % compression)
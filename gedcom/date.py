@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Conversion of GEDCOM 5.5 date values into ranges of day numbers.
+
+Days are counted like `datetime.date.toordinal()` does (the 1st of January of the year 1 is day 1),
+extended proleptically to years outside of the range supported by `datetime`.
+Open-ended dates such as `BEF 1900` or `AFT 1900` reach to `MINIMUM_DAY` or `MAXIMUM_DAY`.
+"""
+
+import re as regex
+
+MINIMUM_DAY = -10 ** 9
+"""The first day of an open-ended date range like `BEF 1900`."""
+
+MAXIMUM_DAY = 10 ** 9
+"""The last day of an open-ended date range like `AFT 1900`."""
+
+CALENDAR_GREGORIAN = "@#DGREGORIAN@"
+CALENDAR_JULIAN = "@#DJULIAN@"
+
+MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12
+}
+
+# Offset between a Julian day number and a day number as returned by `datetime.date.toordinal()`
+_JULIAN_DAY_NUMBER_OFFSET = 1721425
+
+_DATE_REGEX = regex.compile(
+    r'^(?:(@#D[A-Z ]+@) )?(?:(?:(\d{1,2}) )?([A-Z]{3}) )?(\d{1,4})(?:/(\d{2}))?( B\.?C\.?(?:E\.?)?)?$'
+)
+
+
+def get_day(year, month=1, day=1, calendar=CALENDAR_GREGORIAN):
+    """Returns the day number of a date of the Gregorian or the Julian calendar
+
+    Years are astronomical years, so the year 1 B.C. is the year 0.
+
+    :type year: int
+    :type month: int
+    :type day: int
+    :type calendar: str
+    :rtype: int
+    """
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+
+    julian_day_number = day + (153 * m + 2) // 5 + 365 * y + y // 4
+    if calendar == CALENDAR_JULIAN:
+        julian_day_number -= 32083
+    else:
+        julian_day_number += y // 400 - y // 100 - 32045
+
+    return julian_day_number - _JULIAN_DAY_NUMBER_OFFSET
+
+
+def get_year_range(from_year, to_year=None):
+    """Returns the first day of `from_year` and the last day of `to_year` as a tuple: (`int` first_day, `int` last_day)
+
+    If `to_year` is not given, the range covers `from_year` only.
+
+    :type from_year: int
+    :type to_year: int
+    :rtype: tuple
+    """
+    if to_year is None:
+        to_year = from_year
+    return get_day(from_year), get_day(to_year + 1) - 1
+
+
+def _parse_simple_date(value, calendar):
+    """Returns the range of days covered by a date without modifiers like `ABT` or `BET`
+    :type value: str
+    :type calendar: str
+    :rtype: tuple or None
+    """
+    regex_match = _DATE_REGEX.match(value)
+    if regex_match is None:
+        return None
+
+    escape, day, month, year, dual_year, before_christ = regex_match.groups()
+
+    if escape is not None:
+        calendar = escape
+    if calendar not in (CALENDAR_GREGORIAN, CALENDAR_JULIAN):
+        return None
+
+    year = int(year)
+    if dual_year is not None:
+        # A dual year like `1699/00` names the year according to the old and the new style
+        year += 1
+    if before_christ is not None:
+        year = 1 - year
+
+    if month is None:
+        if day is not None:
+            return None
+        return get_day(year, 1, 1, calendar), get_day(year + 1, 1, 1, calendar) - 1
+
+    if month not in MONTHS:
+        return None
+    month = MONTHS[month]
+    next_month_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    last_day_of_month = get_day(next_month_year, next_month, 1, calendar) - 1
+
+    if day is None:
+        return get_day(year, month, 1, calendar), last_day_of_month
+
+    day = get_day(year, month, int(day), calendar)
+    if day > last_day_of_month:
+        return None
+    return day, day
+
+
+def get_date_range(value):
+    """Returns the range of days covered by a GEDCOM date value as a tuple: (`int` first_day, `int` last_day)
+
+    Approximated dates (`ABT`, `CAL`, `EST`) cover the same range as the exact date, `BEF` and `TO`
+    dates start at `MINIMUM_DAY` and `AFT` and `FROM` dates end at `MAXIMUM_DAY`. Dates of the
+    Julian calendar are converted, dates of other calendars and date phrases return `None`.
+
+    :type value: str
+    :rtype: tuple or None
+    """
+    value = value.strip().upper()
+
+    # Interpreted dates carry a phrase after the actual date
+    if value.startswith("INT "):
+        value = value[4:].split('(', 1)[0].strip()
+
+    calendar = CALENDAR_GREGORIAN
+    parts = value.split(' ', 1)
+    modifier = parts[0]
+
+    if modifier in ("ABT", "CAL", "EST") and len(parts) > 1:
+        return _parse_simple_date(parts[1], calendar)
+
+    if modifier == "BEF" and len(parts) > 1:
+        date_range = _parse_simple_date(parts[1], calendar)
+        return None if date_range is None else (MINIMUM_DAY, date_range[0] - 1)
+
+    if modifier == "AFT" and len(parts) > 1:
+        date_range = _parse_simple_date(parts[1], calendar)
+        return None if date_range is None else (date_range[1] + 1, MAXIMUM_DAY)
+
+    if modifier in ("BET", "FROM") and len(parts) > 1:
+        separator = " AND " if modifier == "BET" else " TO "
+        if separator not in parts[1]:
+            if modifier == "BET":
+                return None
+            date_range = _parse_simple_date(parts[1], calendar)
+            return None if date_range is None else (date_range[0], MAXIMUM_DAY)
+
+        first_value, last_value = parts[1].split(separator, 1)
+        first_range = _parse_simple_date(first_value.strip(), calendar)
+        last_range = _parse_simple_date(last_value.strip(), calendar)
+        if first_range is None or last_range is None:
+            return None
+        return first_range[0], max(first_range[1], last_range[1])
+
+    if modifier == "TO" and len(parts) > 1:
+        date_range = _parse_simple_date(parts[1], calendar)
+        return None if date_range is None else (MINIMUM_DAY, date_range[1])
+
+    return _parse_simple_date(value, calendar)
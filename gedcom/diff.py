@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Structural comparison of two GEDCOM files, independent of the order of their records.
+
+Each record and each of its subtrees gets a content hash. Records with equal hashes are unchanged and
+aren't compared any further, only the subtrees of changed records get compared to find out what changed.
+
+```python
+from gedcom.diff import diff
+from gedcom.parser import Parser
+
+old_parser = Parser()
+old_parser.parse_file('old.ged')
+new_parser = Parser()
+new_parser.parse_file('new.ged')
+
+result = diff(old_parser, new_parser, ignore_changes=True)
+for record_change in result.modified:
+    for change in record_change.changes:
+        print(change.kind, change.path)
+```
+"""
+
+from collections import namedtuple
+import hashlib
+import gedcom.tags
+
+Diff = namedtuple("Diff", ["added", "removed", "modified"])
+"""Result of a comparison: lists of added and removed records as well as a list of `RecordChange`"""
+
+RecordChange = namedtuple("RecordChange", ["key", "old", "new", "changes"])
+"""A record existing in both files but differing in content, together with a list of `Change`"""
+
+Change = namedtuple("Change", ["kind", "path", "old", "new"])
+"""A single change within a record
+
+`kind` is one of `CHANGE_ADDED`, `CHANGE_REMOVED` or `CHANGE_MODIFIED`. `path` locates the element like
+`@I1@/BIRT[0]/DATE[0]`, where the number counts the preceding siblings having the same tag.
+`old` or `new` is `None` for added or removed elements.
+"""
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_MODIFIED = "modified"
+
+
+def get_record_key(record, occurrence=0):
+    """Returns the key identifying a record in both files
+
+    Records having a pointer are identified by it. Other records like `HEAD` or `TRLR` are identified
+    by their tag and the number of preceding records having the same tag.
+
+    :type record: Element
+    :type occurrence: int
+    :rtype: str
+    """
+    if record.get_pointer():
+        return record.get_pointer()
+    return "%s[%d]" % (record.get_tag(), occurrence)
+
+
+def get_hash(element, ignore_changes=False, cache=None):
+    """Returns a content hash of an element and all of its sub-elements
+
+    If `ignore_changes` is `True`, `gedcom.tags.GEDCOM_TAG_CHANGE` elements of records are left out,
+    so records differing only in their change dates get the same hash. If a `cache` dict is given, the
+    hashes of all sub-elements get stored within it, keyed by the `id()` of the sub-element.
+
+    :type element: Element
+    :type ignore_changes: bool
+    :type cache: dict
+    :rtype: bytes
+    """
+    content = hashlib.blake2b(digest_size=16)
+    content.update(("%s\0%s\0%s\0" % (element.get_pointer() or "", element.get_tag(), element.get_value()))
+                   .encode('utf-8', 'surrogatepass'))
+
+    for child in element.get_child_elements():
+        if ignore_changes and element.get_level() == 0 and child.get_tag() == gedcom.tags.GEDCOM_TAG_CHANGE:
+            continue
+        content.update(get_hash(child, False, cache))
+
+    digest = content.digest()
+    if cache is not None:
+        cache[id(element)] = digest
+    return digest
+
+
+def get_record_hashes(records, ignore_changes=False):
+    """Returns the content hashes of the given records as a dict, keyed by `get_record_key()`
+
+    The hashes may be stored to find out later on which records did change.
+
+    :type records: list of Element
+    :type ignore_changes: bool
+    :rtype: dict
+    """
+    hashes = {}
+    occurrences = {}
+
+    for record in records:
+        occurrence = occurrences.get(record.get_tag(), 0)
+        occurrences[record.get_tag()] = occurrence + 1
+        hashes[get_record_key(record, occurrence)] = get_hash(record, ignore_changes)
+
+    return hashes
+
+
+def _is_same_line(old, new):
+    """:type old: Element
+    :type new: Element
+    :rtype: bool
+    """
+    return (old.get_pointer() == new.get_pointer() and old.get_tag() == new.get_tag()
+            and old.get_value() == new.get_value())
+
+
+def _get_path(parent_path, element, siblings):
+    """:type parent_path: str
+    :type element: Element
+    :type siblings: list of Element
+    :rtype: str
+    """
+    occurrence = 0
+    for sibling in siblings:
+        if sibling is element:
+            break
+        if sibling.get_tag() == element.get_tag():
+            occurrence += 1
+    return "%s/%s[%d]" % (parent_path, element.get_tag(), occurrence)
+
+
+def _get_unmatched(children, hashes, other_children, other_hashes):
+    """Returns the children which don't have a counterpart with an equal hash among `other_children`
+    :type children: list of Element
+    :type hashes: dict
+    :type other_children: list of Element
+    :type other_hashes: dict
+    :rtype: list of Element
+    """
+    counts = {}
+    for child in other_children:
+        counts[other_hashes[id(child)]] = counts.get(other_hashes[id(child)], 0) + 1
+
+    unmatched = []
+    for child in children:
+        digest = hashes[id(child)]
+        if counts.get(digest, 0) > 0:
+            counts[digest] -= 1
+        else:
+            unmatched.append(child)
+    return unmatched
+
+
+def _diff_children(path, old, new, old_hashes, new_hashes, ignore_changes, changes):
+    """Compares the children of two elements known to differ, appending all changes found to `changes`
+
+    Children having equal hashes are unchanged. The remaining children are paired up by their tag
+    in order of appearance and compared recursively, unpaired children were added or removed.
+    """
+    old_children = old.get_child_elements()
+    new_children = new.get_child_elements()
+    if ignore_changes and old.get_level() == 0:
+        old_children = [child for child in old_children if child.get_tag() != gedcom.tags.GEDCOM_TAG_CHANGE]
+        new_children = [child for child in new_children if child.get_tag() != gedcom.tags.GEDCOM_TAG_CHANGE]
+
+    removed = _get_unmatched(old_children, old_hashes, new_children, new_hashes)
+    added = _get_unmatched(new_children, new_hashes, old_children, old_hashes)
+
+    removed_by_tag = {}
+    for child in removed:
+        removed_by_tag.setdefault(child.get_tag(), []).append(child)
+
+    paired = set()
+    for new_child in added:
+        candidates = removed_by_tag.get(new_child.get_tag())
+        child_path = _get_path(path, new_child, new_children)
+        if not candidates:
+            changes.append(Change(CHANGE_ADDED, child_path, None, new_child))
+            continue
+
+        old_child = candidates.pop(0)
+        paired.add(id(old_child))
+        if not _is_same_line(old_child, new_child):
+            changes.append(Change(CHANGE_MODIFIED, child_path, old_child, new_child))
+        _diff_children(child_path, old_child, new_child, old_hashes, new_hashes, False, changes)
+
+    for old_child in removed:
+        if id(old_child) not in paired:
+            changes.append(Change(CHANGE_REMOVED, _get_path(path, old_child, old_children), old_child, None))
+
+
+def diff_records(old_records, new_records, ignore_changes=False):
+    """Compares two lists of records
+
+    Only records whose hashes differ get compared element by element.
+
+    :type old_records: list of Element
+    :type new_records: list of Element
+    :type ignore_changes: bool
+    :rtype: Diff
+    """
+    old_keys = {}
+    occurrences = {}
+    for record in old_records:
+        occurrence = occurrences.get(record.get_tag(), 0)
+        occurrences[record.get_tag()] = occurrence + 1
+        old_keys[get_record_key(record, occurrence)] = record
+
+    added = []
+    modified = []
+    occurrences = {}
+    for record in new_records:
+        occurrence = occurrences.get(record.get_tag(), 0)
+        occurrences[record.get_tag()] = occurrence + 1
+        key = get_record_key(record, occurrence)
+
+        old_record = old_keys.pop(key, None)
+        if old_record is None:
+            added.append(record)
+            continue
+
+        if get_hash(old_record, ignore_changes) == get_hash(record, ignore_changes):
+            continue
+
+        old_hashes = {}
+        new_hashes = {}
+        get_hash(old_record, ignore_changes, old_hashes)
+        get_hash(record, ignore_changes, new_hashes)
+
+        changes = []
+        if not _is_same_line(old_record, record):
+            changes.append(Change(CHANGE_MODIFIED, key, old_record, record))
+        _diff_children(key, old_record, record, old_hashes, new_hashes, ignore_changes, changes)
+        modified.append(RecordChange(key, old_record, record, changes))
+
+    return Diff(added, list(old_keys.values()), modified)
+
+
+def diff(old_parser, new_parser, ignore_changes=False):
+    """Compares the records of two parsers
+
+    See `diff_records()` for details.
+
+    :type old_parser: gedcom.parser.Parser
+    :type new_parser: gedcom.parser.Parser
+    :type ignore_changes: bool
+    :rtype: Diff
+    """
+    return diff_records(old_parser.get_root_child_elements(), new_parser.get_root_child_elements(), ignore_changes)
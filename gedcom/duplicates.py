@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Detection of individuals which are likely to be duplicates of each other.
+
+Comparing each individual to each other individual isn't feasible for large files. Instead, individuals
+are grouped into blocks of the same phonetic surname, birth decade and sex, and only individuals
+within the same block are compared to each other.
+"""
+
+from collections import namedtuple
+from difflib import SequenceMatcher
+from itertools import combinations
+from gedcom.element.individual import IndividualElement
+from gedcom.phonetics import normalize, soundex
+
+DuplicateCandidate = namedtuple("DuplicateCandidate", ["score", "first", "second"])
+"""A pair of individuals which are likely to be duplicates, `score` ranges from 0 to 1"""
+
+WEIGHTS = {
+    "given_name": 0.3,
+    "surname": 0.25,
+    "birth_year": 0.2,
+    "birth_place": 0.1,
+    "death_year": 0.1,
+    "death_place": 0.05
+}
+"""Default weights of the fields when scoring a pair of individuals"""
+
+# Order of the fields within the tuples passed to the workers
+_FIELDS = ("given_name", "surname", "birth_year", "birth_place", "death_year", "death_place")
+
+
+def get_blocking_key(individual):
+    """Returns the key of the block an individual belongs to: (`str` surname code, `int` birth decade, `str` sex)
+
+    The birth decade is `None` if the birth year is unknown.
+
+    :type individual: IndividualElement
+    :rtype: tuple
+    """
+    given_name, surname = individual.get_name()
+    birth_year = individual.get_birth_year()
+    return soundex(surname), (birth_year // 10 if birth_year != -1 else None), individual.get_gender()
+
+
+def _get_fields(individual):
+    """Returns the compared fields of an individual in the order of `_FIELDS`
+    :type individual: IndividualElement
+    :rtype: tuple
+    """
+    given_name, surname = individual.get_name()
+    birth_place = individual.get_birth_data()[1]
+    death_place = individual.get_death_data()[1]
+    return (normalize(given_name), normalize(surname), individual.get_birth_year(), normalize(birth_place),
+            individual.get_death_year(), normalize(death_place))
+
+
+def get_similarity(first_fields, second_fields, weights):
+    """Returns the weighted similarity of two tuples of fields, ranging from 0 to 1
+
+    Names and places are compared as strings, years are considered less similar the more they differ,
+    up to ten years. Fields unknown for either individual are left out.
+
+    :type first_fields: tuple
+    :type second_fields: tuple
+    :type weights: tuple of float
+    :rtype: float
+    """
+    total_weight = 0.0
+    score = 0.0
+
+    for first, second, weight in zip(first_fields, second_fields, weights):
+        if isinstance(first, int):
+            if first == -1 or second == -1:
+                continue
+            similarity = max(0.0, 1.0 - abs(first - second) / 10.0)
+        else:
+            if first == "" or second == "":
+                continue
+            similarity = 1.0 if first == second else SequenceMatcher(None, first, second).ratio()
+
+        total_weight += weight
+        score += weight * similarity
+
+    return score / total_weight if total_weight else 0.0
+
+
+def _score_block(block, weights, minimum_score):
+    """Scores all pairs within a block and returns those reaching `minimum_score`
+
+    This is a module level function to be usable by worker processes.
+
+    :type block: list of tuple (`int` position, `tuple` fields)
+    :type weights: tuple of float
+    :type minimum_score: float
+    :rtype: list of tuple (`float` score, `int` first position, `int` second position)
+    """
+    candidates = []
+    for (first_position, first_fields), (second_position, second_fields) in combinations(block, 2):
+        score = get_similarity(first_fields, second_fields, weights)
+        if score >= minimum_score:
+            candidates.append((score, first_position, second_position))
+    return candidates
+
+
+def find_duplicate_candidates(individuals, minimum_score=0.8, weights=None, workers=None):
+    """Returns pairs of individuals which are likely to be duplicates, ranked by their score
+
+    Only individuals with the same blocking key (see `get_blocking_key()`) get compared, pairs
+    scoring at least `minimum_score` are returned. `weights` may override the default `WEIGHTS`.
+
+    Blocks are scored one after another, or with `workers` processes in parallel. Only the fields
+    of the individuals and the candidates found are kept in memory, the pairs of a block are
+    generated while scoring it.
+
+    :type individuals: list of IndividualElement
+    :type minimum_score: float
+    :type weights: dict
+    :type workers: int
+    :rtype: list of DuplicateCandidate
+    """
+    individuals = [individual for individual in individuals if isinstance(individual, IndividualElement)]
+
+    field_weights = dict(WEIGHTS)
+    if weights is not None:
+        field_weights.update(weights)
+    field_weights = tuple(field_weights[field] for field in _FIELDS)
+
+    blocks = {}
+    for position, individual in enumerate(individuals):
+        blocks.setdefault(get_blocking_key(individual), []).append((position, _get_fields(individual)))
+    blocks = [block for block in blocks.values() if len(block) > 1]
+
+    if workers is not None and workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_size = max(1, len(blocks) // (workers * 4))
+            results = list(executor.map(_score_block, blocks, [field_weights] * len(blocks),
+                                        [minimum_score] * len(blocks), chunksize=chunk_size))
+    else:
+        results = [_score_block(block, field_weights, minimum_score) for block in blocks]
+
+    candidates = [candidate for block_candidates in results for candidate in block_candidates]
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+
+    return [DuplicateCandidate(score, individuals[first], individuals[second])
+            for (score, first, second) in candidates]
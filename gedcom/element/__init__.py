@@ -35,6 +35,7 @@ __all__ = [
     "family",
     "file",
     "individual",
+    "journal",
     "object",
     "root"
 ]
@@ -30,10 +30,15 @@ Base GEDCOM element
 """
 
 from sys import version_info
+from gedcom.element.journal import state
 from gedcom.helpers import deprecated
 import gedcom.tags
 
 
+class FrozenElementError(Exception):
+    pass
+
+
 class Element(object):
     """GEDCOM element
 
@@ -60,8 +65,20 @@ class Element(object):
     See a GEDCOM file for examples of tags and their values.
 
     Tags available to an element are seen here: `gedcom.tags`
+
+    Records (elements with a level of zero) read by a `gedcom.parser.Parser` remember where they
+    were located within the source file. As long as a record isn't modified, it may be copied
+    verbatim from the source file when saving.
+
+    Frozen elements (see `freeze()`) keep their children within a tuple and raise a
+    `FrozenElementError` when changed, so they may be read by many threads at once.
     """
 
+    # Only set on records, see `set_source_span()`, `mark_modified()` and `set_modified_callback()`
+    __source_span = None
+    __modified = False
+    __on_modified = None
+
     def __init__(self, level, pointer, tag, value, crlf="\n", multi_line=True):
         # basic element info
         self.__level = level
@@ -101,26 +118,50 @@ class Element(object):
         """
         return self.__value
 
+    def get_crlf(self):
+        """Returns the line break ending this element
+        :rtype: str
+        """
+        return self.__crlf
+
     def set_value(self, value):
         """Sets the value of this element
         :type value: str
         """
+        self.__check_not_frozen()
+        if state.journal is not None:
+            state.journal.record_value(self, self.__value)
         self.__value = value
+        self.mark_modified()
+
+    def set_pointer(self, pointer):
+        """Sets the pointer identifying this element
+
+        References to this element aren't changed, see `gedcom.parser.Parser.renumber_pointers()`.
+
+        :type pointer: str
+        """
+        self.__check_not_frozen()
+        old_pointer = self.__pointer
+        self.__pointer = pointer
+        self.mark_modified()
+        if state.journal is not None:
+            state.journal.record_pointer(self, old_pointer)
 
     def get_multi_line_value(self):
         """Returns the value of this element including concatenations or continuations
         :rtype: str
         """
         result = self.get_value()
-        last_crlf = self.__crlf
+        last_crlf = self.get_crlf()
         for element in self.get_child_elements():
             tag = element.get_tag()
             if tag == gedcom.tags.GEDCOM_TAG_CONCATENATION:
                 result += element.get_value()
-                last_crlf = element.__crlf
+                last_crlf = element.get_crlf()
             elif tag == gedcom.tags.GEDCOM_TAG_CONTINUED:
                 result += last_crlf + element.get_value()
-                last_crlf = element.__crlf
+                last_crlf = element.get_crlf()
         return result
 
     def __available_characters(self):
@@ -178,6 +219,8 @@ class Element(object):
         :type value: str
         """
         self.set_value('')
+        if state.journal is not None:
+            state.journal.record_children(self, self.get_child_elements())
         self.get_child_elements()[:] = [child for child in self.get_child_elements() if
                                         child.get_tag() not in (gedcom.tags.GEDCOM_TAG_CONCATENATION, gedcom.tags.GEDCOM_TAG_CONTINUED)]
 
@@ -193,6 +236,9 @@ class Element(object):
 
     def get_child_elements(self):
         """Returns the direct child elements of this element
+
+        Frozen elements return a tuple instead of a list.
+
         :rtype: list of Element
         """
         return self.__children
@@ -212,15 +258,15 @@ class Element(object):
 
         # Differentiate between the type of the new child element
         if tag == gedcom.tags.GEDCOM_TAG_FAMILY:
-            child_element = FamilyElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = FamilyElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_FILE:
-            child_element = FileElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = FileElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL:
-            child_element = IndividualElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = IndividualElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         elif tag == gedcom.tags.GEDCOM_TAG_OBJECT:
-            child_element = ObjectElement(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = ObjectElement(self.get_level() + 1, pointer, tag, value, self.get_crlf())
         else:
-            child_element = Element(self.get_level() + 1, pointer, tag, value, self.__crlf)
+            child_element = Element(self.get_level() + 1, pointer, tag, value, self.get_crlf())
 
         self.add_child_element(child_element)
 
@@ -231,11 +277,30 @@ class Element(object):
 
         :type element: Element
         """
+        self.__check_not_frozen()
+        parent = element.get_parent_element()
         self.get_child_elements().append(element)
         element.set_parent_element(self)
+        self.mark_modified()
+        if state.journal is not None:
+            state.journal.record_add(self, element, parent)
 
         return element
 
+    def remove_child_element(self, element):
+        """Removes a child element from this element
+
+        :type element: Element
+        """
+        self.__check_not_frozen()
+        children = self.get_child_elements()
+        position = children.index(element)
+        del children[position]
+        element.set_parent_element(None)
+        self.mark_modified()
+        if state.journal is not None:
+            state.journal.record_remove(self, element, position)
+
     def get_parent_element(self):
         """Returns the parent element of this element
         :rtype: Element
@@ -250,8 +315,102 @@ class Element(object):
 
         :type element: Element
         """
+        self.__check_not_frozen()
         self.__parent = element
 
+    def get_record(self):
+        """Returns the record (the element with a level of zero) containing this element
+
+        Elements not attached to a record return themselves.
+
+        :rtype: Element
+        """
+        element = self
+        parent = element.get_parent_element()
+        while parent is not None and parent.get_level() >= 0:
+            element = parent
+            parent = element.get_parent_element()
+        return element
+
+    def mark_modified(self, modified=True):
+        """Marks the record containing this element as modified
+
+        All methods changing an element call this method automatically. Only if the lists returned by
+        `get_child_elements()` are changed directly, it should be called manually.
+
+        :type modified: bool
+        """
+        record = self.get_record()
+        record.__check_not_frozen()
+        if state.journal is not None:
+            state.journal.record_modified(record, record.__modified)
+        record.__modified = modified
+        if modified and record.__on_modified is not None:
+            record.__on_modified(record)
+
+    def set_modified_callback(self, callback):
+        """Sets a function to be called with this record whenever it gets marked as modified
+
+        Used by `gedcom.store.SqliteStore` to keep modified records until they are written back.
+
+        :type callback: callable
+        """
+        self.__on_modified = callback
+
+    def is_modified(self):
+        """Checks if the record containing this element was modified since it has been read
+        :rtype: bool
+        """
+        return self.get_record().__modified
+
+    def get_source_span(self):
+        """Returns where this record was located within the source file, formatted as a tuple:
+        (`object` source, `int` start, `int` end)
+
+        Returns `None` for elements which weren't read from a file.
+
+        :rtype: tuple
+        """
+        return self.__source_span
+
+    def set_source_span(self, source, start, end):
+        """Sets where this record was located within the source file, marking it as unmodified
+
+        There's usually no need to call this method manually, the `gedcom.parser.Parser` calls it
+        while parsing.
+
+        :type source: object
+        :type start: int
+        :type end: int
+        """
+        self.__check_not_frozen()
+        self.__source_span = (source, start, end)
+        self.__modified = False
+
+    def freeze(self):
+        """Freezes this element and all of its sub-elements, so none of them may be changed anymore
+
+        The children of each element are turned into a tuple. Changing a frozen element raises a
+        `FrozenElementError`, while reading it is safe from any number of threads.
+        """
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            if not element.is_frozen():
+                element.__children = tuple(element.__children)
+                stack.extend(element.__children)
+
+    def is_frozen(self):
+        """Checks if this element has been frozen by `freeze()`
+        :rtype: bool
+        """
+        return type(self.__children) is tuple
+
+    def __check_not_frozen(self):
+        """Raises a `FrozenElementError` if this element has been frozen"""
+        if type(self.__children) is tuple:
+            raise FrozenElementError("Element %s can't be changed after being frozen" % self.__tag)
+
     @deprecated
     def get_individual(self):
         """Returns this element and all of its sub-elements represented as a GEDCOM string
@@ -266,6 +425,19 @@ class Element(object):
         :rtype: str
         """
 
+        if recursive:
+            # Join all lines at once, since concatenating them one by one copies the result over and over again
+            lines = []
+            stack = [self]
+            while stack:
+                element = stack.pop()
+                lines.append(element.to_gedcom_string())
+                stack.extend(reversed(element.get_child_elements()))
+            return ''.join(lines)
+
+        if self.get_level() < 0:
+            return ''
+
         result = str(self.get_level())
 
         if self.get_pointer() != "":
@@ -276,16 +448,7 @@ class Element(object):
         if self.get_value() != "":
             result += ' ' + self.get_value()
 
-        result += self.__crlf
-
-        if self.get_level() < 0:
-            result = ''
-
-        if recursive:
-            for child_element in self.get_child_elements():
-                result += child_element.to_gedcom_string(True)
-
-        return result
+        return result + self.get_crlf()
 
     def __str__(self):
         """:rtype: str"""
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Recording changes of elements, so they may be undone, see `gedcom.parser.Parser.batch()`.
+
+While a `Journal` is started, every change of an element attached to a record made within the same
+thread is noted down, along with what's needed to undo it. Changes of elements not attached to a
+record yet, like ones created by `gedcom.element.element.Element.new_child_element()`, aren't noted
+down, since they are undone by undoing the change attaching them.
+"""
+
+import threading
+
+
+class _State(threading.local):
+    journal = None
+
+
+state = _State()
+"""Holds the journal started within the current thread as `state.journal`, checked by each change of an element"""
+
+
+def _is_attached(element):
+    """Checks if the given element is a root element or part of a record held by one
+    :type element: Element
+    :rtype: bool
+    """
+    record = element.get_record()
+    return record.get_level() < 0 or record.get_parent_element() is not None
+
+
+class Journal(object):
+    """Changes of elements made within the current thread while started, which may be undone
+
+    `on_record_change` is called whenever a record gets added to or removed from an element,
+    or the pointer of a record changes, with the parent of the record, the record, its old
+    pointer and its new pointer. Pointers are `None` while the record isn't part of the parent.
+
+    :type on_record_change: callable
+    """
+
+    def __init__(self, on_record_change=None):
+        self.__on_record_change = on_record_change
+        self.__changes = []
+        self.__modified = {}
+
+    def __len__(self):
+        return len(self.__changes)
+
+    def start(self):
+        """Starts noting down the changes made within the current thread"""
+        if state.journal is not None:
+            raise RuntimeError("Another journal has already been started within this thread")
+        state.journal = self
+
+    def stop(self):
+        """Stops noting down changes"""
+        if state.journal is self:
+            state.journal = None
+
+    def record_value(self, element, value):
+        """Notes down the old value of an element before it gets changed
+        :type element: Element
+        :type value: str
+        """
+        if _is_attached(element):
+            self.__changes.append((self.__undo_value, element, value))
+
+    def record_pointer(self, element, pointer):
+        """Notes down the old pointer of an element after it has been changed
+        :type element: Element
+        :type pointer: str
+        """
+        if _is_attached(element):
+            self.__changes.append((self.__undo_pointer, element, pointer))
+            if element.get_level() == 0 and self.__on_record_change is not None:
+                self.__on_record_change(element.get_parent_element(), element, pointer, element.get_pointer())
+
+    def record_children(self, element, children):
+        """Notes down the old child elements of an element before they get replaced
+        :type element: Element
+        :type children: list of Element
+        """
+        if _is_attached(element):
+            self.__changes.append((self.__undo_children, element, list(children)))
+
+    def record_add(self, element, child, parent):
+        """Notes down a child element after it has been added, along with its old parent
+        :type element: Element
+        :type child: Element
+        :type parent: Element
+        """
+        if _is_attached(element):
+            self.__changes.append((self.__undo_add, element, (child, parent)))
+            if child.get_level() == 0 and self.__on_record_change is not None:
+                self.__on_record_change(element, child, None, child.get_pointer())
+
+    def record_remove(self, element, child, position):
+        """Notes down a child element after it has been removed, along with its old position
+        :type element: Element
+        :type child: Element
+        :type position: int
+        """
+        if _is_attached(element):
+            self.__changes.append((self.__undo_remove, element, (child, position)))
+            if child.get_level() == 0 and self.__on_record_change is not None:
+                self.__on_record_change(element, child, child.get_pointer(), None)
+
+    def record_modified(self, record, modified):
+        """Notes down whether a record has been modified before, the first time it gets changed
+        :type record: Element
+        :type modified: bool
+        """
+        if record not in self.__modified and record.get_parent_element() is not None:
+            self.__modified[record] = modified
+
+    def rollback(self):
+        """Stops noting down changes and undoes all of them, latest first"""
+        self.stop()
+        while self.__changes:
+            undo, element, argument = self.__changes.pop()
+            undo(element, argument)
+        for record, modified in self.__modified.items():
+            record.mark_modified(modified)
+        self.__modified = {}
+
+    @staticmethod
+    def __undo_value(element, value):
+        element.set_value(value)
+
+    @staticmethod
+    def __undo_pointer(element, pointer):
+        element.set_pointer(pointer)
+
+    @staticmethod
+    def __undo_children(element, children):
+        element.get_child_elements()[:] = children
+
+    @staticmethod
+    def __undo_add(element, argument):
+        child, parent = argument
+        element.remove_child_element(child)
+        child.set_parent_element(parent)
+
+    @staticmethod
+    def __undo_remove(element, argument):
+        child, position = argument
+        element.get_child_elements().insert(position, child)
+        child.set_parent_element(element)
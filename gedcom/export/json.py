@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Export of GEDCOM records as JSON.
+
+Each record is converted into a JSON object like
+
+```json
+{"level": 0, "pointer": "@I1@", "tag": "INDI", "value": "", "children": [
+    {"level": 1, "pointer": null, "tag": "NAME", "value": "Max /Mustermann/", "children": []}
+]}
+```
+
+Records may come from a parsed tree or directly from `gedcom.parser.Parser.iter_records()`,
+in which case a file of any size gets exported with constant memory:
+
+```python
+from gedcom.export.json import write_ndjson
+from gedcom.parser import Parser
+
+with open('family.ndjson', 'w', encoding='utf-8') as ndjson_file:
+    write_ndjson(Parser().iter_file_records('family.ged'), ndjson_file)
+```
+"""
+
+import json
+from gedcom.helpers import is_binary_file
+import gedcom.tags
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+"""Number of characters written at once"""
+
+
+def element_to_dict(element, fold_multi_line=False):
+    """Converts an element and all of its sub-elements into a `dict`
+
+    If `fold_multi_line` is `True`, `gedcom.tags.GEDCOM_TAG_CONCATENATION` and `gedcom.tags.GEDCOM_TAG_CONTINUED`
+    elements are folded into the value of their parent, see `gedcom.element.element.Element.get_multi_line_value()`.
+
+    :type element: Element
+    :type fold_multi_line: bool
+    :rtype: dict
+    """
+    children = element.get_child_elements()
+    value = element.get_value()
+
+    if fold_multi_line:
+        folded_children = [child for child in children if child.get_tag() not in
+                           (gedcom.tags.GEDCOM_TAG_CONCATENATION, gedcom.tags.GEDCOM_TAG_CONTINUED)]
+        if len(folded_children) != len(children):
+            value = element.get_multi_line_value()
+            children = folded_children
+
+    return {
+        "level": element.get_level(),
+        "pointer": element.get_pointer() or None,
+        "tag": element.get_tag(),
+        "value": value,
+        "children": [element_to_dict(child, fold_multi_line) for child in children]
+    }
+
+
+def _write(open_file, chunks, binary):
+    if binary:
+        open_file.write("".join(chunks).encode("utf-8"))
+    else:
+        open_file.writelines(chunks)
+
+
+def write_ndjson(records, open_file, fold_multi_line=False, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Writes one JSON object per record and line (newline-delimited JSON)
+
+    Records are converted one after another and written in batches of about `buffer_size` characters.
+    Files opened in binary mode get UTF-8 encoded JSON.
+
+    :type records: collections.Iterable[Element]
+    :type open_file: file
+    :type fold_multi_line: bool
+    :type buffer_size: int
+    :rtype: int
+    :return: the number of records written
+    """
+    binary = is_binary_file(open_file)
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    chunks = []
+    size = 0
+    count = 0
+
+    for record in records:
+        chunk = encoder.encode(element_to_dict(record, fold_multi_line)) + "\n"
+        chunks.append(chunk)
+        size += len(chunk)
+        count += 1
+
+        if size >= buffer_size:
+            _write(open_file, chunks, binary)
+            chunks = []
+            size = 0
+
+    if chunks:
+        _write(open_file, chunks, binary)
+
+    return count
+
+
+def write_json(records, open_file, fold_multi_line=False, buffer_size=DEFAULT_BUFFER_SIZE):
+    """Writes all records as a single JSON array, one record at a time
+
+    See `write_ndjson()` for details.
+
+    :type records: collections.Iterable[Element]
+    :type open_file: file
+    :type fold_multi_line: bool
+    :type buffer_size: int
+    :rtype: int
+    :return: the number of records written
+    """
+    binary = is_binary_file(open_file)
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    chunks = ["["]
+    size = 1
+    count = 0
+
+    for record in records:
+        chunk = ("," if count else "") + "\n" + encoder.encode(element_to_dict(record, fold_multi_line))
+        chunks.append(chunk)
+        size += len(chunk)
+        count += 1
+
+        if size >= buffer_size:
+            _write(open_file, chunks, binary)
+            chunks = []
+            size = 0
+
+    chunks.append("\n]\n")
+    _write(open_file, chunks, binary)
+
+    return count
@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Export of GEDCOM records into an SQLite database with a relational schema.
+
+The database consists of the following tables:
+
+* `records`: pointer and tag of each record
+* `individuals`: pointer, name, sex, birth and death of each individual
+* `families`: pointer, husband and wife of each family
+* `family_members`: one row per `HUSB`, `WIFE` and `CHIL` of each family
+* `events`: one row per event (like `BIRT` or `MARR`) of individuals and families, including the range of
+  days covered by its date, see `gedcom.date.get_date_range()`
+* `places`: each distinct place, referenced by individuals and events
+* `sources`: pointer, title and author of each source
+* `elements`: every single element, allowing queries for anything not covered by the tables above
+
+Records are identified by the `id` of their row within `records` rather than by their pointer, so files
+with duplicate pointers are exported as they are. Individuals, families and sources share the `id` of
+their record, and events, family members and elements refer to it by `record_id`, `family_id` and
+`individual_id`. The latter refers to the first individual with the pointer given by the family. The
+pointers are kept as well, and are `NULL` for records without a pointer.
+
+```python
+import sqlite3
+from gedcom.export.sqlite import write_sqlite
+from gedcom.parser import Parser
+
+write_sqlite(Parser().iter_file_records('family.ged'), 'family.sqlite')
+
+connection = sqlite3.connect('family.sqlite')
+connection.execute("SELECT surname, COUNT(*) FROM individuals GROUP BY surname ORDER BY 2 DESC").fetchall()
+```
+"""
+
+import sqlite3
+from gedcom.date import get_date_range
+from gedcom.index.name import get_name_parts
+import gedcom.tags
+
+DEFAULT_BATCH_SIZE = 10000
+"""Number of rows inserted at once into each table"""
+
+SCHEMA = (
+    "CREATE TABLE places (id INTEGER PRIMARY KEY, name TEXT NOT NULL)",
+    "CREATE TABLE records (id INTEGER PRIMARY KEY, pointer TEXT, tag TEXT NOT NULL)",
+    "CREATE TABLE individuals (id INTEGER PRIMARY KEY REFERENCES records (id), pointer TEXT, given_name TEXT,"
+    " surname TEXT, sex TEXT, birth_date TEXT, birth_place_id INTEGER REFERENCES places (id),"
+    " death_date TEXT, death_place_id INTEGER REFERENCES places (id))",
+    "CREATE TABLE families (id INTEGER PRIMARY KEY REFERENCES records (id), pointer TEXT, husband TEXT, wife TEXT)",
+    "CREATE TABLE family_members (family_id INTEGER NOT NULL REFERENCES families (id), family TEXT,"
+    " individual_id INTEGER REFERENCES individuals (id), individual TEXT NOT NULL, role TEXT NOT NULL)",
+    "CREATE TABLE events (id INTEGER PRIMARY KEY, record_id INTEGER NOT NULL REFERENCES records (id), record TEXT,"
+    " tag TEXT NOT NULL, date TEXT, first_day INTEGER, last_day INTEGER, place_id INTEGER REFERENCES places (id))",
+    "CREATE TABLE sources (id INTEGER PRIMARY KEY REFERENCES records (id), pointer TEXT, title TEXT, author TEXT)",
+    "CREATE TABLE elements (id INTEGER PRIMARY KEY, parent_id INTEGER, record_id INTEGER NOT NULL"
+    " REFERENCES records (id), record TEXT, level INTEGER NOT NULL, pointer TEXT, tag TEXT NOT NULL, value TEXT)",
+)
+"""Statements creating the tables"""
+
+INDEXES = (
+    "CREATE UNIQUE INDEX places_name ON places (name)",
+    "CREATE INDEX records_pointer ON records (pointer)",
+    "CREATE INDEX individuals_pointer ON individuals (pointer)",
+    "CREATE INDEX individuals_surname ON individuals (surname, given_name)",
+    "CREATE INDEX families_pointer ON families (pointer)",
+    "CREATE INDEX family_members_family_id ON family_members (family_id)",
+    "CREATE INDEX family_members_individual_id ON family_members (individual_id)",
+    "CREATE INDEX family_members_individual ON family_members (individual)",
+    "CREATE INDEX events_record_id ON events (record_id)",
+    "CREATE INDEX events_record ON events (record)",
+    "CREATE INDEX events_tag_first_day ON events (tag, first_day)",
+    "CREATE INDEX events_place_id ON events (place_id)",
+    "CREATE INDEX sources_pointer ON sources (pointer)",
+    "CREATE INDEX elements_record_id ON elements (record_id)",
+    "CREATE INDEX elements_parent_id ON elements (parent_id)",
+    "CREATE INDEX elements_tag_value ON elements (tag, value)",
+)
+"""Statements creating the indexes, executed after all rows have been inserted"""
+
+_LINK_FAMILY_MEMBERS = ("UPDATE family_members SET individual_id ="
+                        " (SELECT MIN(id) FROM individuals WHERE individuals.pointer = family_members.individual)")
+
+_INSERTS = {
+    "places": "INSERT INTO places (id, name) VALUES (?, ?)",
+    "records": "INSERT INTO records VALUES (?, ?, ?)",
+    "individuals": "INSERT INTO individuals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "families": "INSERT INTO families VALUES (?, ?, ?, ?)",
+    "family_members": "INSERT INTO family_members (family_id, family, individual, role) VALUES (?, ?, ?, ?)",
+    "events": "INSERT INTO events (record_id, record, tag, date, first_day, last_day, place_id)"
+              " VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "sources": "INSERT INTO sources VALUES (?, ?, ?, ?)",
+    "elements": "INSERT INTO elements VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+}
+
+
+class _Writer(object):
+    """Collects rows per table and inserts them in batches"""
+
+    def __init__(self, connection, batch_size):
+        """
+        :type connection: sqlite3.Connection
+        :type batch_size: int
+        """
+        self.__connection = connection
+        self.__batch_size = batch_size
+        self.__rows = {table: [] for table in _INSERTS}
+        self.__places = {}
+        self.__record_id = 0
+        self.__element_id = 0
+
+    def flush(self, table=None):
+        """Inserts the collected rows of a single table or of all tables if `table` is `None`
+        :type table: str or None
+        """
+        for name in ([table] if table is not None else list(self.__rows)):
+            if self.__rows[name]:
+                self.__connection.executemany(_INSERTS[name], self.__rows[name])
+                self.__rows[name] = []
+
+    def add(self, table, row):
+        """Collects a row of a table, inserting the collected rows once there are `batch_size` of them
+        :type table: str
+        :type row: tuple
+        """
+        rows = self.__rows[table]
+        rows.append(row)
+        if len(rows) >= self.__batch_size:
+            # Places are referenced by other rows, so they have to be inserted first
+            self.flush("places")
+            self.flush(table)
+
+    def get_place_id(self, place):
+        """Returns the id of a place, adding it if it's new, or `None` for an empty place
+        :type place: str
+        :rtype: int or None
+        """
+        if place == "":
+            return None
+        place_id = self.__places.get(place)
+        if place_id is None:
+            place_id = len(self.__places) + 1
+            self.__places[place] = place_id
+            self.add("places", (place_id, place))
+        return place_id
+
+    def add_elements(self, record, record_id):
+        """Adds a row for the record and for each of its descendants
+        :type record: Element
+        :type record_id: int
+        """
+        pointer = record.get_pointer() or None
+        stack = [(record, None)]
+        while stack:
+            element, parent_id = stack.pop()
+            self.__element_id += 1
+            self.add("elements", (self.__element_id, parent_id, record_id, pointer, element.get_level(),
+                                  element.get_pointer() or None, element.get_tag(), element.get_value()))
+            stack.extend((child, self.__element_id) for child in reversed(element.get_child_elements()))
+
+    def add_record(self, record):
+        """Adds the rows of a record to all tables it belongs in
+        :type record: Element
+        """
+        tag = record.get_tag()
+        pointer = record.get_pointer() or None
+
+        self.__record_id += 1
+        record_id = self.__record_id
+        self.add("records", (record_id, pointer, tag))
+        self.add_elements(record, record_id)
+
+        if tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL:
+            self.add_individual(record, record_id, pointer)
+        elif tag == gedcom.tags.GEDCOM_TAG_FAMILY:
+            self.add_family(record, record_id, pointer)
+        elif tag == gedcom.tags.GEDCOM_TAG_SOURCE:
+            title = None
+            author = None
+            for child in record.get_child_elements():
+                if child.get_tag() == gedcom.tags.GEDCOM_TAG_TITLE:
+                    title = child.get_multi_line_value()
+                elif child.get_tag() == gedcom.tags.GEDCOM_TAG_AUTHOR:
+                    author = child.get_multi_line_value()
+            self.add("sources", (record_id, pointer, title, author))
+
+    def add_events(self, record, record_id, pointer):
+        """Adds the events of a record and returns the first one of each tag as a dict: tag -> (date, place id)
+        :type record: Element
+        :type record_id: int
+        :type pointer: str or None
+        :rtype: dict
+        """
+        events = {}
+        for child in record.get_child_elements():
+            if child.get_tag() == gedcom.tags.GEDCOM_TAG_CHANGE:
+                continue
+
+            date = None
+            place_id = None
+            for child_of_child in child.get_child_elements():
+                if child_of_child.get_tag() == gedcom.tags.GEDCOM_TAG_DATE:
+                    date = child_of_child.get_value()
+                elif child_of_child.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE:
+                    place_id = self.get_place_id(child_of_child.get_value())
+
+            if date is None and place_id is None:
+                continue
+
+            date_range = get_date_range(date) if date is not None else None
+            first_day, last_day = date_range if date_range is not None else (None, None)
+            self.add("events", (record_id, pointer, child.get_tag(), date, first_day, last_day, place_id))
+            events.setdefault(child.get_tag(), (date, place_id))
+        return events
+
+    def add_individual(self, record, record_id, pointer):
+        """
+        :type record: Element
+        :type record_id: int
+        :type pointer: str or None
+        """
+        given_name = None
+        surname = None
+        sex = None
+
+        for child in record.get_child_elements():
+            if child.get_tag() == gedcom.tags.GEDCOM_TAG_NAME and given_name is None:
+                given_names, surnames = get_name_parts(child)
+                given_name = next((name.strip() for name in given_names if name.strip()), "")
+                surname = next((name.strip() for name in surnames if name.strip()), "")
+            elif child.get_tag() == gedcom.tags.GEDCOM_TAG_SEX:
+                sex = child.get_value()
+
+        events = self.add_events(record, record_id, pointer)
+        birth_date, birth_place_id = events.get(gedcom.tags.GEDCOM_TAG_BIRTH, (None, None))
+        death_date, death_place_id = events.get(gedcom.tags.GEDCOM_TAG_DEATH, (None, None))
+        self.add("individuals", (record_id, pointer, given_name, surname, sex, birth_date, birth_place_id,
+                                 death_date, death_place_id))
+
+    def add_family(self, record, record_id, pointer):
+        """
+        :type record: Element
+        :type record_id: int
+        :type pointer: str or None
+        """
+        husband = None
+        wife = None
+
+        for child in record.get_child_elements():
+            tag = child.get_tag()
+            if tag in (gedcom.tags.GEDCOM_TAG_HUSBAND, gedcom.tags.GEDCOM_TAG_WIFE, gedcom.tags.GEDCOM_TAG_CHILD):
+                self.add("family_members", (record_id, pointer, child.get_value(), tag))
+                if tag == gedcom.tags.GEDCOM_TAG_HUSBAND and husband is None:
+                    husband = child.get_value()
+                elif tag == gedcom.tags.GEDCOM_TAG_WIFE and wife is None:
+                    wife = child.get_value()
+
+        self.add_events(record, record_id, pointer)
+        self.add("families", (record_id, pointer, husband, wife))
+
+
+def write_sqlite(records, database, batch_size=DEFAULT_BATCH_SIZE):
+    """Writes records into a new SQLite database
+
+    `database` is either the path of the database file or an open `sqlite3.Connection`. All rows get
+    inserted in batches of `batch_size` rows within a single transaction, and the indexes get created
+    after all rows have been inserted.
+
+    Records may come from a parsed tree or directly from `gedcom.parser.Parser.iter_records()`,
+    in which case only a single batch of rows is held in memory at once.
+
+    :type records: collections.Iterable[Element]
+    :type database: str or sqlite3.Connection
+    :type batch_size: int
+    :rtype: int
+    :return: the number of records written
+    """
+    if isinstance(database, sqlite3.Connection):
+        connection = database
+    else:
+        connection = sqlite3.connect(database)
+        # The database is new, so there's nothing to recover in case of a crash
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("PRAGMA journal_mode = MEMORY")
+
+    try:
+        with connection:
+            for statement in SCHEMA:
+                connection.execute(statement)
+
+            writer = _Writer(connection, batch_size)
+            count = 0
+            for record in records:
+                writer.add_record(record)
+                count += 1
+            writer.flush()
+
+            for statement in INDEXES:
+                connection.execute(statement)
+            connection.execute(_LINK_FAMILY_MEMBERS)
+    finally:
+        if connection is not database:
+            connection.close()
+
+    return count
@@ -29,8 +29,10 @@
 Helper methods.
 """
 
-import warnings
 import functools
+import io
+import os
+import warnings
 
 
 def deprecated(func):
@@ -50,3 +52,91 @@ def deprecated(func):
         return func(*args, **kwargs)
 
     return new_func
+
+
+def is_binary_file(open_file):
+    """Checks if the given file was opened in binary mode
+    :type open_file: file
+    :rtype: bool
+    """
+    return isinstance(open_file, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(open_file, 'mode', '')
+
+
+def is_pointer(value):
+    """Checks if the given value is a pointer like `@I1@`, referencing another record
+    :type value: str
+    :rtype: bool
+    """
+    return len(value) > 2 and value[0] == '@' and value[-1] == '@' and value[1] != '#' and ' ' not in value
+
+
+def get_record_ranges(file_path, count):
+    """Splits a file into about `count` byte ranges, each of them starting at a record (a line starting with `0`)
+
+    Used to parse parts of a file in parallel, see `gedcom.helpers.iter_file_lines()`.
+
+    :type file_path: str
+    :type count: int
+    :rtype: list of tuple
+    """
+    size = os.path.getsize(file_path)
+    offsets = [0]
+    with open(file_path, 'rb') as gedcom_file:
+        for index in range(1, count):
+            gedcom_file.seek(max(offsets[-1], size * index // count))
+            gedcom_file.readline()
+            while True:
+                offset = gedcom_file.tell()
+                line = gedcom_file.readline()
+                if not line or line.startswith(b'0 '):
+                    break
+            if offsets[-1] < offset < size:
+                offsets.append(offset)
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def iter_file_lines(file_path, start, end):
+    """Yields the lines of a file within the given byte range, as bytes
+    :type file_path: str
+    :type start: int
+    :type end: int
+    :rtype: collections.Iterable[bytes]
+    """
+    with open(file_path, 'rb') as gedcom_file:
+        gedcom_file.seek(start)
+        position = start
+        while position < end:
+            line = gedcom_file.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+class LineBuffer(object):
+    """Joins chunks of bytes, split at any position, into complete lines of bytes ending with `\\n`
+
+    Multi-byte characters of UTF-8 never contain the byte of `\\n`, so complete lines never
+    contain parts of characters.
+    """
+
+    def __init__(self):
+        self.__rest = b''
+
+    def feed(self, chunk):
+        """Adds a chunk, returning the lines completed by it
+        :type chunk: bytes
+        :rtype: list of bytes
+        """
+        lines = (self.__rest + chunk).split(b'\n')
+        self.__rest = lines.pop()
+        return [line + b'\n' for line in lines]
+
+    def close(self):
+        """Returns the last line if it didn't end with `\\n`, leaving the buffer empty
+        :rtype: list of bytes
+        """
+        rest = self.__rest
+        self.__rest = b''
+        return [rest] if rest else []
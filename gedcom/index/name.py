@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Index over the names of individuals, matching names exactly or by their pronunciation.
+"""
+
+from gedcom.element.individual import IndividualElement
+from gedcom.phonetics import normalize, soundex
+import gedcom.tags
+
+
+def get_name_parts(name_element):
+    """Returns all given names and surnames of a `gedcom.tags.GEDCOM_TAG_NAME` element as a tuple:
+    (`list` given_names, `list` surnames)
+
+    Names are taken from the value, which is formatted like `Given /Surname/`, as well as from the
+    `gedcom.tags.GEDCOM_TAG_GIVEN_NAME` and `gedcom.tags.GEDCOM_TAG_SURNAME` child elements.
+
+    :type name_element: Element
+    :rtype: tuple
+    """
+    given_names = []
+    surnames = []
+
+    name = name_element.get_value().split('/')
+    if len(name) > 0:
+        given_names.append(name[0])
+        if len(name) > 1:
+            surnames.append(name[1])
+        if len(name) > 2:
+            given_names.append(name[2])
+
+    for child in name_element.get_child_elements():
+        if child.get_tag() == gedcom.tags.GEDCOM_TAG_GIVEN_NAME:
+            given_names.append(child.get_value())
+        elif child.get_tag() == gedcom.tags.GEDCOM_TAG_SURNAME:
+            surnames.extend(child.get_value().split(','))
+
+    return given_names, surnames
+
+
+class NameIndex(object):
+    """Index over the given names and surnames of all individuals
+
+    Names are split into words, which are stored normalized (lower case, without accents)
+    as well as encoded by a phonetic algorithm. All `gedcom.tags.GEDCOM_TAG_NAME` elements
+    of an individual are indexed, including alternate names.
+
+    The phonetic algorithm defaults to `gedcom.phonetics.soundex()`, which may be replaced by
+    `gedcom.phonetics.cologne_phonetics()` or any other function returning a code for a word.
+    """
+
+    def __init__(self, records, phonetic_algorithm=soundex):
+        """
+        :type records: list of Element
+        :type phonetic_algorithm: callable
+        """
+        self.__phonetic_algorithm = phonetic_algorithm
+        self.__individuals = []
+        self.__surnames = {}
+        self.__surname_codes = {}
+        self.__given_names = {}
+        self.__given_name_codes = {}
+
+        # Avoid encoding the same word over and over again
+        codes = {}
+
+        for record in records:
+            if not isinstance(record, IndividualElement):
+                continue
+
+            position = len(self.__individuals)
+            self.__individuals.append(record)
+
+            for child in record.get_child_elements():
+                if child.get_tag() != gedcom.tags.GEDCOM_TAG_NAME:
+                    continue
+
+                given_names, surnames = get_name_parts(child)
+                for names, words_index, codes_index in ((given_names, self.__given_names, self.__given_name_codes),
+                                                        (surnames, self.__surnames, self.__surname_codes)):
+                    for name in names:
+                        for word in normalize(name).split():
+                            words_index.setdefault(word, set()).add(position)
+                            if word not in codes:
+                                codes[word] = phonetic_algorithm(word)
+                            codes_index.setdefault(codes[word], set()).add(position)
+
+    def __len__(self):
+        return len(self.__individuals)
+
+    def __find_positions(self, name, words_index, codes_index, fuzzy):
+        """Returns the positions of all individuals having every word of the given name
+        :type name: str
+        :type words_index: dict
+        :type codes_index: dict
+        :type fuzzy: bool
+        :rtype: set of int
+        """
+        positions = None
+
+        for word in normalize(name).split():
+            if fuzzy:
+                word_positions = codes_index.get(self.__phonetic_algorithm(word), set())
+            else:
+                word_positions = words_index.get(word, set())
+
+            positions = set(word_positions) if positions is None else positions & word_positions
+            if not positions:
+                return set()
+
+        return set() if positions is None else positions
+
+    def find(self, surname=None, given_name=None, fuzzy=False):
+        """Returns all individuals having the given surname and given name
+
+        Names are compared word by word, ignoring case and accents, so `Müller` matches `MULLER`
+        and `Anna` matches `Anna Maria`. If `fuzzy` is `True`, words are compared by their phonetic
+        code instead, so `Meyer` matches `Meier` and `Mayr` as well.
+
+        Individuals are in the same order as they appeared in the file.
+
+        :type surname: str
+        :type given_name: str
+        :type fuzzy: bool
+        :rtype: list of IndividualElement
+        """
+        positions = None
+
+        if surname is not None:
+            positions = self.__find_positions(surname, self.__surnames, self.__surname_codes, fuzzy)
+
+        if given_name is not None and (positions is None or positions):
+            given_name_positions = self.__find_positions(given_name, self.__given_names,
+                                                         self.__given_name_codes, fuzzy)
+            positions = given_name_positions if positions is None else positions & given_name_positions
+
+        if positions is None:
+            return list(self.__individuals)
+
+        return [self.__individuals[position] for position in sorted(positions)]
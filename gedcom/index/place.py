@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Hierarchical index over the places of events, answering queries like "all events in Bavaria, Germany".
+"""
+
+import gedcom.tags
+
+
+def get_jurisdictions(place):
+    """Returns the jurisdictions of a place, from the most general to the most specific one
+
+    A place like `Town, County, State, Country` results in `['country', 'state', 'county', 'town']`.
+    Jurisdictions are compared case-insensitively and without surrounding whitespace.
+
+    :type place: str
+    :rtype: list of str
+    """
+    return [jurisdiction.strip().casefold() for jurisdiction in reversed(place.split(','))]
+
+
+class PlaceIndex(object):
+    """Index over all elements having a `gedcom.tags.GEDCOM_TAG_PLACE`
+
+    The places are stored within a trie over their comma-separated jurisdictions,
+    starting with the most general one. Looking up all events of a place and its
+    sub-places takes time proportional to the number of events found.
+    """
+
+    def __init__(self, records):
+        """:type records: list of Element"""
+        # Each node is a list of `[children, events]`, children are keyed by jurisdiction
+        self.__root = [{}, []]
+        self.__places = {}
+        self.__size = 0
+
+        stack = list(reversed(records))
+        while stack:
+            element = stack.pop()
+            children = element.get_child_elements()
+
+            for child in children:
+                if child.get_tag() == gedcom.tags.GEDCOM_TAG_PLACE and child.get_value() != "":
+                    self.__add(child.get_value(), element)
+
+            stack.extend(reversed(children))
+
+    def __add(self, place, element):
+        """:type place: str
+        :type element: Element
+        """
+        node = self.__places.get(place)
+        if node is None:
+            node = self.__root
+            for jurisdiction in get_jurisdictions(place):
+                children = node[0]
+                if jurisdiction not in children:
+                    children[jurisdiction] = [{}, []]
+                node = children[jurisdiction]
+            self.__places[place] = node
+
+        node[1].append((self.__size, element))
+        self.__size += 1
+
+    def __len__(self):
+        return self.__size
+
+    def get_places(self):
+        """Returns all distinct places as they were written within the GEDCOM file
+        :rtype: list of str
+        """
+        return list(self.__places)
+
+    def get_events(self, place_prefix=None, tags=None):
+        """Returns all elements located at the given place or any place within it
+
+        `place_prefix` lists jurisdictions the same way a `gedcom.tags.GEDCOM_TAG_PLACE` does, so
+        `Bavaria, Germany` finds events in `Munich, Bavaria, Germany` as well as in `Bavaria, Germany`.
+        If no `place_prefix` is given, all elements having a place are returned.
+
+        Optionally only elements whose tag is one of `tags` are returned.
+        Elements are in the same order as they appeared in the file.
+
+        :type place_prefix: str
+        :type tags: list of str
+        :rtype: list of Element
+        """
+        node = self.__root
+        if place_prefix is not None:
+            for jurisdiction in get_jurisdictions(place_prefix):
+                node = node[0].get(jurisdiction)
+                if node is None:
+                    return []
+
+        events = []
+        stack = [node]
+        while stack:
+            children, node_events = stack.pop()
+            events.extend(node_events)
+            stack.extend(children.values())
+
+        events.sort(key=lambda item: item[0])
+        return [element for (position, element) in events if tags is None or element.get_tag() in tags]
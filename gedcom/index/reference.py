@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+Index over the references between records, answering queries like "all elements pointing to `@I1@`".
+"""
+
+from gedcom.helpers import is_pointer
+
+
+class ReferenceIndex(object):
+    """Index over all elements whose value is a pointer to a record
+
+    Unlike the other indexes, this index may be updated as elements are added or removed, which
+    takes time proportional to the number of references changed. It's used by
+    `gedcom.parser.Parser.remove_record()` and `gedcom.parser.Parser.renumber_pointers()`.
+    """
+
+    def __init__(self, records):
+        """:type records: list of Element"""
+        self.__references = {}
+        self.__size = 0
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return self.__size
+
+    def add(self, element):
+        """Adds all references of the given element and its sub-elements
+        :type element: Element
+        """
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            value = element.get_value()
+            if is_pointer(value):
+                if value in self.__references:
+                    self.__references[value].append(element)
+                else:
+                    self.__references[value] = [element]
+                self.__size += 1
+            stack.extend(reversed(element.get_child_elements()))
+
+    def remove(self, element):
+        """Removes all references of the given element and its sub-elements
+        :type element: Element
+        """
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            references = self.__references.get(element.get_value())
+            if references is not None:
+                for position, reference in enumerate(references):
+                    if reference is element:
+                        del references[position]
+                        self.__size -= 1
+                        break
+                if not references:
+                    del self.__references[element.get_value()]
+            stack.extend(element.get_child_elements())
+
+    def rename(self, pointers):
+        """Moves the references of each pointer to the pointer it's mapped to, without changing any element
+        :type pointers: dict of str
+        """
+        references = {}
+        for pointer, elements in self.__references.items():
+            pointer = pointers.get(pointer, pointer)
+            if pointer in references:
+                references[pointer].extend(elements)
+            else:
+                references[pointer] = elements
+        self.__references = references
+
+    def get_pointers(self):
+        """Returns all pointers referenced by any element, including the ones of records which don't exist
+        :rtype: list of str
+        """
+        return list(self.__references)
+
+    def get_references(self, pointer):
+        """Returns all elements pointing to the given pointer, in the order they were added
+        :type pointer: str
+        :rtype: list of Element
+        """
+        return list(self.__references.get(pointer, ()))
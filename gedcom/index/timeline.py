@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Index over the dated events of individuals and families answering range queries like
+"all events between 1914 and 1918" or "everyone alive in 1880".
+"""
+
+from collections import namedtuple
+from gedcom.date import MAXIMUM_DAY, MINIMUM_DAY, get_date_range, get_year_range
+from gedcom.element.family import FamilyElement
+from gedcom.element.individual import IndividualElement
+import gedcom.tags
+
+BIRTH_TAGS = (gedcom.tags.GEDCOM_TAG_BIRTH, gedcom.tags.GEDCOM_TAG_CHRISTENING, gedcom.tags.GEDCOM_TAG_BAPTISM)
+"""Tags of events marking the beginning of a life, in order of preference"""
+
+DEATH_TAGS = (gedcom.tags.GEDCOM_TAG_DEATH, gedcom.tags.GEDCOM_TAG_BURIAL, gedcom.tags.GEDCOM_TAG_CREMATION)
+"""Tags of events marking the end of a life, in order of preference"""
+
+TimelineEvent = namedtuple("TimelineEvent", ["first_day", "last_day", "pointer", "tag", "element"])
+"""A dated event: the day range, the pointer of the record it belongs to, its tag and the event element itself"""
+
+
+class IntervalTree(object):
+    """Static centered interval tree
+
+    Answers which of the stored intervals overlap a given interval in O(log n + k).
+    Intervals are closed, so `(1, 5)` and `(5, 9)` overlap.
+    """
+
+    def __init__(self, intervals):
+        """:type intervals: list of tuple (`int` first, `int` last, `object` item)"""
+        self.__size = len(intervals)
+        self.__root = self.__build(list(intervals))
+
+    def __len__(self):
+        return self.__size
+
+    @staticmethod
+    def __build(intervals):
+        """Builds the tree top-down, splitting the intervals at the median of their points, and returns its root node
+
+        Nodes are built from an explicit stack instead of recursively, so deep trees don't hit the recursion limit.
+
+        Each node is a list of `[center, by_first, by_last, left, right]` where `by_first` holds the
+        intervals containing `center` sorted by their first point and `by_last` holds the same intervals
+        sorted by their last point in descending order.
+
+        :type intervals: list of tuple
+        :rtype: list
+        """
+        root = [None]
+        stack = [(intervals, root, 0)]
+
+        while stack:
+            intervals, parent, slot = stack.pop()
+            if not intervals:
+                continue
+
+            points = sorted([interval[0] for interval in intervals] + [interval[1] for interval in intervals])
+            center = points[len(points) // 2]
+
+            left = []
+            right = []
+            here = []
+            for interval in intervals:
+                if interval[1] < center:
+                    left.append(interval)
+                elif interval[0] > center:
+                    right.append(interval)
+                else:
+                    here.append(interval)
+
+            node = [
+                center,
+                sorted(here, key=lambda interval: interval[0]),
+                sorted(here, key=lambda interval: interval[1], reverse=True),
+                None,
+                None
+            ]
+            parent[slot] = node
+            stack.append((left, node, 3))
+            stack.append((right, node, 4))
+
+        return root[0]
+
+    def find_overlapping(self, first, last):
+        """Returns the items of all intervals overlapping the interval from `first` to `last`
+        :type first: int
+        :type last: int
+        :rtype: list
+        """
+        result = []
+        stack = [self.__root]
+
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+
+            center, by_first, by_last, left, right = node
+            if last < center:
+                for interval in by_first:
+                    if interval[0] > last:
+                        break
+                    result.append(interval[2])
+                stack.append(left)
+            elif first > center:
+                for interval in by_last:
+                    if interval[1] < first:
+                        break
+                    result.append(interval[2])
+                stack.append(right)
+            else:
+                result.extend(interval[2] for interval in by_first)
+                stack.append(left)
+                stack.append(right)
+
+        return result
+
+
+class TimelineIndex(object):
+    """Index over all dated events of individuals and families
+
+    Every direct child element of an individual or family record carrying a
+    `gedcom.tags.GEDCOM_TAG_DATE` is indexed as an event, except for `gedcom.tags.GEDCOM_TAG_CHANGE`.
+    This covers births, deaths, burials, censuses, marriages and occupations as well as all other events.
+
+    Besides the events, the index holds the assumed lifespan of each individual, reaching from
+    the birth (or christening) to the death (or burial). Individuals with only one of both dates
+    are assumed to have lived at most `maximum_lifespan` years.
+
+    Days are day numbers as returned by `gedcom.date.get_date_range()`.
+    """
+
+    def __init__(self, records, maximum_lifespan=110):
+        """
+        :type records: list of Element
+        :type maximum_lifespan: int
+        """
+        maximum_lifespan_days = int(maximum_lifespan * 365.2425)
+
+        events = []
+        lifespans = []
+        position = 0
+
+        for record in records:
+            if not isinstance(record, (IndividualElement, FamilyElement)):
+                continue
+
+            birth = None
+            death = None
+
+            for child in record.get_child_elements():
+                tag = child.get_tag()
+                if tag == gedcom.tags.GEDCOM_TAG_CHANGE:
+                    continue
+
+                for child_of_child in child.get_child_elements():
+                    if child_of_child.get_tag() != gedcom.tags.GEDCOM_TAG_DATE:
+                        continue
+
+                    date_range = get_date_range(child_of_child.get_value())
+                    if date_range is None:
+                        continue
+
+                    event = TimelineEvent(date_range[0], date_range[1], record.get_pointer(), tag, child)
+                    events.append((date_range[0], date_range[1], (position, event)))
+                    position += 1
+
+                    if tag in BIRTH_TAGS and (birth is None or BIRTH_TAGS.index(tag) < BIRTH_TAGS.index(birth[0])):
+                        birth = (tag, date_range)
+                    if tag in DEATH_TAGS and (death is None or DEATH_TAGS.index(tag) < DEATH_TAGS.index(death[0])):
+                        death = (tag, date_range)
+
+            if isinstance(record, IndividualElement) and (birth is not None or death is not None):
+                first_day = MINIMUM_DAY
+                last_day = MAXIMUM_DAY
+                if birth is not None:
+                    first_day = birth[1][0]
+                    last_day = min(last_day, birth[1][1] + maximum_lifespan_days)
+                if death is not None:
+                    first_day = max(first_day, death[1][0] - maximum_lifespan_days)
+                    last_day = min(last_day, death[1][1])
+                if first_day <= last_day:
+                    lifespans.append((first_day, last_day, (position, record)))
+                    position += 1
+
+        self.__events = IntervalTree(events)
+        self.__lifespans = IntervalTree(lifespans)
+
+    def __len__(self):
+        return len(self.__events)
+
+    def get_events(self, first_day, last_day, tags=None):
+        """Returns all events whose date range overlaps the range from `first_day` to `last_day`
+
+        Optionally only events whose tag is one of `tags` are returned.
+        Events are ordered by their first day, events starting at the same day by their order in the file.
+
+        :type first_day: int
+        :type last_day: int
+        :type tags: list of str
+        :rtype: list of TimelineEvent
+        """
+        events = self.__events.find_overlapping(first_day, last_day)
+        events.sort(key=lambda item: (item[1].first_day, item[0]))
+        return [event for (position, event) in events if tags is None or event.tag in tags]
+
+    def get_events_in_years(self, from_year, to_year, tags=None):
+        """Returns all events whose date range overlaps the years from `from_year` to `to_year`
+        :type from_year: int
+        :type to_year: int
+        :type tags: list of str
+        :rtype: list of TimelineEvent
+        """
+        first_day, last_day = get_year_range(from_year, to_year)
+        return self.get_events(first_day, last_day, tags)
+
+    def get_alive_individuals(self, first_day, last_day):
+        """Returns all individuals who may have been alive at some day from `first_day` to `last_day`
+
+        Individuals are ordered by their order in the file.
+
+        :type first_day: int
+        :type last_day: int
+        :rtype: list of IndividualElement
+        """
+        individuals = self.__lifespans.find_overlapping(first_day, last_day)
+        individuals.sort(key=lambda item: item[0])
+        return [individual for (position, individual) in individuals]
+
+    def get_alive_individuals_in_years(self, from_year, to_year):
+        """Returns all individuals who may have been alive at some time from `from_year` to `to_year`
+        :type from_year: int
+        :type to_year: int
+        :rtype: list of IndividualElement
+        """
+        first_day, last_day = get_year_range(from_year, to_year)
+        return self.get_alive_individuals(first_day, last_day)
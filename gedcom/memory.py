@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Estimates of the memory used by parsed GEDCOM data, see `gedcom.parser.Parser.memory_report()`.
+
+The size of an element object is measured once per element class with `tracemalloc`, since
+`sys.getsizeof()` doesn't account for the attributes of an object on all Python versions. Strings are
+counted once, no matter how many elements share them.
+"""
+
+import sys
+import tracemalloc
+
+_CALIBRATION_SAMPLES = 1000
+
+_instance_sizes = {}
+
+
+def get_instance_size(element_class):
+    """Returns the bytes used by an element of the given class with its attributes, without its children list
+    :type element_class: type
+    :rtype: int
+    """
+    if element_class not in _instance_sizes:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            samples = [element_class(1, '', 'X', '', '\n', multi_line=False) for _ in range(_CALIBRATION_SAMPLES)]
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        size = (after - before - sys.getsizeof(samples)) // len(samples) - sys.getsizeof([])
+        _instance_sizes[element_class] = max(size, sys.getsizeof(samples[0]))
+    return _instance_sizes[element_class]
+
+
+def _add(totals, key, count, size):
+    if key not in totals:
+        totals[key] = {"count": 0, "bytes": 0}
+    totals[key]["count"] += count
+    totals[key]["bytes"] += size
+
+
+def get_memory_report(records, element_list=None, element_dictionary=None, places=None):
+    """Estimates the memory used by the given records, and optionally the caches built over them
+
+    The returned dictionary holds the total bytes, the bytes by kind of object (element objects,
+    strings, lists of children and caches), and the number of elements and their bytes by tag and
+    by the type of record they belong to. The records are walked iteratively, once.
+
+    :type records: list of Element
+    :type element_list: list of Element
+    :type element_dictionary: dict of Element
+    :type places: dict of str
+    :rtype: dict
+    """
+    seen_strings = set()
+    element_bytes = 0
+    string_bytes = 0
+    children_bytes = 0
+    by_tag = {}
+    by_record_type = {}
+
+    for record in records:
+        record_count = 0
+        record_bytes = 0
+        stack = [record]
+        while stack:
+            element = stack.pop()
+            children = element.get_child_elements()
+
+            size = get_instance_size(type(element))
+            element_bytes += size
+            children_size = sys.getsizeof(children)
+            children_bytes += children_size
+            size += children_size
+
+            for string in (element.get_tag(), element.get_value(), element.get_pointer()):
+                if string is not None and id(string) not in seen_strings:
+                    seen_strings.add(id(string))
+                    string_size = sys.getsizeof(string)
+                    string_bytes += string_size
+                    size += string_size
+
+            _add(by_tag, element.get_tag(), 1, size)
+            record_count += 1
+            record_bytes += size
+            stack.extend(children)
+
+        _add(by_record_type, record.get_tag(), record_count, record_bytes)
+
+    caches = {
+        "element_list": sys.getsizeof(element_list) if element_list is not None else 0,
+        "element_dictionary": sys.getsizeof(element_dictionary) if element_dictionary is not None else 0,
+        "places": sys.getsizeof(places) if places is not None else 0,
+    }
+
+    return {
+        "total_bytes": element_bytes + string_bytes + children_bytes + sum(caches.values()),
+        "element_bytes": element_bytes,
+        "string_bytes": string_bytes,
+        "children_bytes": children_bytes,
+        "cache_bytes": caches,
+        "by_tag": by_tag,
+        "by_record_type": by_record_type,
+    }
+
+
+def measure_parse(gedcom_stream):
+    """Parses a stream while tracing memory allocations, returning the estimated and the measured bytes of its records
+
+    Used to verify the estimates of `get_memory_report()`.
+
+    :type gedcom_stream: a file stream, or str array of lines with new line at the end
+    :rtype: dict
+    """
+    from gedcom.parser import Parser
+    parser = Parser()
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        parser.parse(gedcom_stream)
+        measured_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    report = parser.memory_report()
+    return {"estimated_bytes": report["total_bytes"], "measured_bytes": measured_bytes}
@@ -30,27 +30,92 @@ Module containing the actual `gedcom.parser.Parser` used to generate elements -
 which can in return be manipulated.
 """
 
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+import io
+import os
 import re as regex
-from sys import version_info
+import stat
+import time
+from types import MappingProxyType
+import gedcom.compression
+import gedcom.recovery
+from gedcom.stats import PHASE_CONSTRUCT, PHASE_DECODE, PHASE_LINK, PHASE_TOKENIZE, PHASES, ParseStats
 from gedcom.element.element import Element
 from gedcom.element.family import FamilyElement, NotAnActualFamilyError
 from gedcom.element.file import FileElement
 from gedcom.element.individual import IndividualElement, NotAnActualIndividualError
+from gedcom.element.journal import Journal
 from gedcom.element.object import ObjectElement
 from gedcom.element.root import RootElement
+from gedcom.helpers import LineBuffer, is_binary_file, is_pointer
+from gedcom.index.name import NameIndex
+from gedcom.index.place import PlaceIndex
+from gedcom.index.reference import ReferenceIndex
+from gedcom.index.timeline import TimelineIndex
 import gedcom.tags
 
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+"""Number of characters written at once by `gedcom.parser.Parser.write_gedcom()`"""
+
+DEFAULT_CACHE_SIZE = 10000
+"""Number of records kept in memory by a `gedcom.store.SqliteStore`"""
+
+PROGRESS_INTERVAL = 10000
+"""Number of lines between calls of the `on_progress` hook of `gedcom.parser.Parser.parse()`"""
+
+PLACE_CACHE_SIZE = 10000
+"""Number of recently parsed places shared by the records of `gedcom.parser.Parser.iter_records()`"""
+
+ASYNC_INTERVAL = 1000
+"""Number of lines parsed by `gedcom.parser.Parser.parse_async()` before giving other tasks a chance to run"""
+
 FAMILY_MEMBERS_TYPE_ALL = "ALL"
 FAMILY_MEMBERS_TYPE_CHILDREN = gedcom.tags.GEDCOM_TAG_CHILD
 FAMILY_MEMBERS_TYPE_HUSBAND = gedcom.tags.GEDCOM_TAG_HUSBAND
 FAMILY_MEMBERS_TYPE_PARENTS = "PARENTS"
 FAMILY_MEMBERS_TYPE_WIFE = gedcom.tags.GEDCOM_TAG_WIFE
 
+# Level must start with non-negative int, no leading zeros.
+# Pointer optional, if it exists it must be flanked by `@`
+# Tag must be an alphanumeric string
+# Value optional, consists of anything after a space to end of line
+# End of line defined by `\n` or `\r`
+_LINE_REGEX = regex.compile('^(0|[1-9]+[0-9]*) (@[^@]+@ |)([A-Za-z0-9_]+)( [^\n\r]*|)([\r\n]{1,2})')
+
+# Lines with any tag and without end of line, see `gedcom.recovery`
+_LENIENT_LINE_REGEX = regex.compile('^(0|[1-9]+[0-9]*) (@[^@]+@ |)([^ \r\n]+)( [^\n\r]*|)([\r\n]{0,2})')
+_TAG_REGEX = regex.compile('^[A-Za-z0-9_]+$')
+_CONTINUATION_REGEX = regex.compile('([^\n\r]*)([\r\n]*)')
+
+POINTER_PREFIXES = {
+    gedcom.tags.GEDCOM_TAG_FAMILY: "F",
+    gedcom.tags.GEDCOM_TAG_INDIVIDUAL: "I",
+    gedcom.tags.GEDCOM_TAG_NOTE: "N",
+    gedcom.tags.GEDCOM_TAG_OBJECT: "O",
+    gedcom.tags.GEDCOM_TAG_REPOSITORY: "R",
+    gedcom.tags.GEDCOM_TAG_SOURCE: "S",
+    gedcom.tags.GEDCOM_TAG_SUBMITTER: "U",
+}
+"""Prefixes of the pointers given by `gedcom.parser.Parser.renumber_pointers()` by default, `X` for other records"""
+
+EXTRACT_ANCESTORS = "ANCESTORS"
+EXTRACT_BOTH = "BOTH"
+EXTRACT_DESCENDANTS = "DESCENDANTS"
+
 
 class GedcomFormatViolationError(Exception):
     pass
 
 
+class FrozenParserError(Exception):
+    pass
+
+
+class ReferencedRecordError(Exception):
+    pass
+
+
 class Parser(object):
     """Parses and manipulates GEDCOM 5.5 format data
 
@@ -62,21 +127,51 @@ class Parser(object):
 
     * a `list` through `gedcom.parser.Parser.get_element_list()`
     * a `dict` through `gedcom.parser.Parser.get_element_dictionary()`
+
+    Files too large to be held in memory may be parsed into an SQLite database, see
+    `gedcom.parser.Parser.parse_file()` and `gedcom.parser.Parser.load_store()`.
+
+    Indexes answering specific queries may be accessed via:
+
+    * `gedcom.parser.Parser.get_timeline_index()` for events and lifespans within a date range
+    * `gedcom.parser.Parser.get_place_index()` for events within a place
+    * `gedcom.parser.Parser.get_name_index()` for individuals by their (phonetic) names
+
+    Parsed records shared by many threads should be made immutable by `gedcom.parser.Parser.freeze()`.
     """
 
     def __init__(self):
         self.__element_list = []
         self.__element_dictionary = {}
+        self.__timeline_index = None
+        self.__place_index = None
+        self.__name_index = None
+        self.__reference_index = None
+        self.__reference_index_changes = 0
+        self.__journal = None
+        self.__places = {}
+        self.__source = None
+        self.__recovery = None
+        self.__problems = 0
+        self.__stats = None
+        self.__store = None
+        self.__shared_tree = None
+        self.__frozen = False
         self.__root_element = RootElement()
 
     def invalidate_cache(self):
-        """Empties the element list and dictionary to cause `gedcom.parser.Parser.get_element_list()`
-        and `gedcom.parser.Parser.get_element_dictionary()` to return updated data.
+        """Empties the element list, dictionary and indexes to cause `gedcom.parser.Parser.get_element_list()`,
+        `gedcom.parser.Parser.get_element_dictionary()` and the index methods to return updated data.
 
         The update gets deferred until each of the methods actually gets called.
         """
+        self.__check_not_frozen()
         self.__element_list = []
         self.__element_dictionary = {}
+        self.__timeline_index = None
+        self.__place_index = None
+        self.__name_index = None
+        self.__reference_index = None
 
     def get_element_list(self):
         """Returns a list containing all elements from within the GEDCOM file
@@ -92,7 +187,13 @@ class Parser(object):
 
         :rtype: list of Element
         """
-        if not self.__element_list:
+        if self.__store is not None:
+            from gedcom.store import StoredElementList
+            return StoredElementList(self.__store)
+        if self.__shared_tree is not None:
+            return self.__shared_tree.get_elements()
+
+        if not self.__element_list and not self.__frozen:
             for element in self.get_root_child_elements():
                 self.__build_list(element, self.__element_list)
         return self.__element_list
@@ -109,13 +210,106 @@ class Parser(object):
 
         :rtype: dict of Element
         """
-        if not self.__element_dictionary:
+        if self.__store is not None:
+            from gedcom.store import StoredRecordDictionary
+            return StoredRecordDictionary(self.__store)
+        if self.__shared_tree is not None:
+            return self.__shared_tree.get_pointer_dictionary()
+
+        if not self.__element_dictionary and not self.__frozen:
             self.__element_dictionary = {
                 element.get_pointer(): element for element in self.get_root_child_elements() if element.get_pointer()
             }
 
         return self.__element_dictionary
 
+    def get_timeline_index(self):
+        """Returns an index over all dated events of individuals and families
+
+        This index gets generated on-the-fly, but gets cached. If the database
+        was modified, you should call `invalidate_cache()` once to let this
+        method return updated data.
+
+        :rtype: TimelineIndex
+        """
+        if self.__timeline_index is None:
+            self.__timeline_index = TimelineIndex(self.get_root_child_elements())
+
+        return self.__timeline_index
+
+    def get_place_index(self):
+        """Returns a hierarchical index over the places of all elements
+
+        This index gets generated on-the-fly, but gets cached. If the database
+        was modified, you should call `invalidate_cache()` once to let this
+        method return updated data.
+
+        :rtype: PlaceIndex
+        """
+        if self.__place_index is None:
+            self.__place_index = PlaceIndex(self.get_root_child_elements())
+
+        return self.__place_index
+
+    def find_events(self, place_prefix=None, tags=None):
+        """Returns all elements located at the given place or any place within it
+
+        See `gedcom.index.place.PlaceIndex.get_events()` for details.
+
+        :type place_prefix: str
+        :type tags: list of str
+        :rtype: list of Element
+        """
+        return self.get_place_index().get_events(place_prefix, tags)
+
+    def get_name_index(self):
+        """Returns an index over the names of all individuals
+
+        This index gets generated on-the-fly, but gets cached. If the database
+        was modified, you should call `invalidate_cache()` once to let this
+        method return updated data.
+
+        :rtype: NameIndex
+        """
+        if self.__name_index is None:
+            self.__name_index = NameIndex(self.get_root_child_elements())
+
+        return self.__name_index
+
+    def find_individuals(self, surname=None, given_name=None, fuzzy=False):
+        """Returns all individuals having the given surname and given name
+
+        See `gedcom.index.name.NameIndex.find()` for details.
+
+        :type surname: str
+        :type given_name: str
+        :type fuzzy: bool
+        :rtype: list of IndividualElement
+        """
+        return self.get_name_index().find(surname, given_name, fuzzy)
+
+    def get_reference_index(self):
+        """Returns an index over all elements pointing to records, like `gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE`
+
+        This index gets generated on-the-fly, but gets cached. If the database
+        was modified, you should call `invalidate_cache()` once to let this
+        method return updated data. `gedcom.parser.Parser.remove_record()` and
+        `gedcom.parser.Parser.renumber_pointers()` keep it up to date. Within
+        `gedcom.parser.Parser.batch()`, it gets rebuilt after any other change of elements.
+
+        :rtype: ReferenceIndex
+        """
+        if self.__journal is not None and len(self.__journal) != self.__reference_index_changes:
+            # Elements changed within the batch may have added or removed references
+            self.__reference_index = None
+
+        if self.__reference_index is None:
+            self.__reference_index = ReferenceIndex(self.get_root_child_elements())
+            if self.__journal is not None:
+                self.__reference_index_changes = len(self.__journal)
+
+        return self.__reference_index
+
     def get_root_element(self):
         """Returns a virtual root element containing all logical records as children
 
@@ -132,35 +326,582 @@ class Parser(object):
 
         :rtype: list of Element
         """
+        if self.__store is not None:
+            from gedcom.store import StoredRecordList
+            return StoredRecordList(self.__store)
+
         return self.get_root_element().get_child_elements()
 
-    def parse_file(self, file_path, strict=True):
+    def parse_file(self, file_path, strict=True, store=None, cache_size=DEFAULT_CACHE_SIZE, recovery=None,
+                   stats=False, on_record=None, on_progress=None):
         """Opens and parses a file, from the given file path, as GEDCOM 5.5 formatted data
+
+        Files compressed by gzip, bzip2, xz or zstd get decompressed while parsing,
+        see `gedcom.compression.open_file()`.
+
+        If a `store` is given, the records get written into an SQLite database at that path instead
+        of being kept in memory, see `gedcom.parser.Parser.load_store()`. Statistics and hooks aren't
+        available then, so passing them together with a `store` raises a `ValueError`.
+
         :type file_path: str
         :type strict: bool
+        :type store: str
+        :type cache_size: int
+        :type recovery: gedcom.recovery.Recovery
+        :type stats: bool
+        :type on_record: callable
+        :type on_progress: callable
+        """
+        if store is not None:
+            if stats or on_record is not None or on_progress is not None:
+                raise ValueError("Statistics and hooks aren't available while parsing into a store")
+            from gedcom.store import SqliteStore
+            self.__reset()
+            sqlite_store = SqliteStore(store, self.__parse_record, cache_size)
+            sqlite_store.fill(self.iter_file_records(file_path, strict, recovery))
+            self.__store = sqlite_store
+            return
+
+        with gedcom.compression.open_file(file_path) as gedcom_stream:
+            self.parse(gedcom_stream, strict, recovery, stats, on_record, on_progress)
+
+    def load_store(self, store, cache_size=DEFAULT_CACHE_SIZE):
+        """Uses the records of an SQLite database previously written by `gedcom.parser.Parser.parse_file()`
+
+        Records are loaded on demand and at most `cache_size` records are kept in memory, so files of any
+        size may be accessed with a fixed memory budget. `gedcom.parser.Parser.get_root_child_elements()`,
+        `gedcom.parser.Parser.get_element_dictionary()`, `gedcom.parser.Parser.get_element_list()` and
+        all methods based on them load records from the store. The virtual root element is empty.
+
+        Modified records get written back when they are evicted from the cache or
+        when `gedcom.parser.Parser.flush_store()` gets called.
+
+        :type store: str
+        :type cache_size: int
+        """
+        from gedcom.store import SqliteStore
+        self.__reset()
+        self.__store = SqliteStore(store, self.__parse_record, cache_size)
+
+    def load_shared(self, shared_tree):
+        """Uses the read-only records of a buffer shared by many processes, see `gedcom.shared`
+
+        The records and the element dictionary are read from the buffer on access, so each process
+        only keeps the caches and indexes it actually uses. Like after `gedcom.parser.Parser.freeze()`,
+        the records can't be changed and the parser can't be used for parsing again.
+
+        :type shared_tree: gedcom.shared.SharedTree
+        """
+        self.__reset()
+        self.__shared_tree = shared_tree
+        self.__root_element = shared_tree.get_root_element()
+        self.__frozen = True
+
+    def share(self, name=None):
+        """Writes the parsed records into a new block of shared memory, which other processes may attach to
+        by `gedcom.shared.attach_shared_memory()` and `gedcom.parser.Parser.load_shared()`
+
+        The returned shared memory should be closed and unlinked once it isn't needed anymore.
+
+        :type name: str
+        :rtype: multiprocessing.shared_memory.SharedMemory
         """
-        with open(file_path, 'rb') as gedcom_stream:
-            self.parse(gedcom_stream, strict)
+        import gedcom.shared
+        return gedcom.shared.create_shared_memory(self.get_root_child_elements(), name)
+
+    def freeze(self):
+        """Makes the parsed records immutable, so they may be read by many threads at once without locking
 
-    def parse(self, gedcom_stream, strict=True):
+        The element list, the element dictionary and all indexes get built right away, since they can't
+        be built later on. All elements get frozen, see `gedcom.element.element.Element.freeze()`.
+        Afterwards, `gedcom.parser.Parser.get_element_list()` and
+        `gedcom.parser.Parser.get_root_child_elements()` return tuples and
+        `gedcom.parser.Parser.get_element_dictionary()` returns a read-only mapping.
+
+        Changing a frozen element raises a `gedcom.element.element.FrozenElementError`, while parsing
+        again or invalidating the cache of a frozen parser raises a `gedcom.parser.FrozenParserError`.
+        Records kept in a store can't be frozen.
+        """
+        if self.__frozen:
+            return
+        if self.__store is not None:
+            raise FrozenParserError("Records kept in a store can't be frozen")
+
+        self.__element_list = tuple(self.get_element_list())
+        self.__element_dictionary = MappingProxyType(self.get_element_dictionary())
+        self.get_timeline_index()
+        self.get_place_index()
+        self.get_name_index()
+        self.get_reference_index()
+
+        self.__root_element.freeze()
+        self.__frozen = True
+
+    def is_frozen(self):
+        """Checks if the parsed records have been made immutable by `gedcom.parser.Parser.freeze()`
+        :rtype: bool
+        """
+        return self.__frozen
+
+    def __check_not_frozen(self):
+        """Raises a `FrozenParserError` if the parser has been frozen"""
+        if self.__frozen:
+            raise FrozenParserError("Parser can't be changed after being frozen")
+
+    def flush_store(self):
+        """Writes all modified records back into the SQLite database of `gedcom.parser.Parser.load_store()`"""
+        if self.__store is not None:
+            self.__store.flush()
+
+    def parse(self, gedcom_stream, strict=True, recovery=None, stats=False, on_record=None, on_progress=None):
         """Parses a stream, or an array of lines, as GEDCOM 5.5 formatted data
+
+        With `strict=False`, malformed lines get fixed as configured by `recovery` instead of raising
+        a `gedcom.parser.GedcomFormatViolationError`. The problems found are available through
+        `gedcom.parser.Parser.get_recovery()` afterwards, see `gedcom.recovery`.
+
+        With `stats=True`, the time spent within each phase of parsing, the number of elements by tag and
+        more get collected, available through `gedcom.parser.Parser.get_stats()` afterwards.
+
+        `on_record` is called with each record as soon as it is complete, and `on_progress` is called
+        with the number of lines and bytes read every `PROGRESS_INTERVAL` lines and at the end. If either
+        of them returns `False`, parsing stops and the parser keeps the records completed so far.
+
+        Parsing without statistics and hooks takes a separate path, so they cost nothing unless used.
+
         :type gedcom_stream: a file stream, or str array of lines with new line at the end
         :type strict: bool
+        :type recovery: gedcom.recovery.Recovery
+        :type stats: bool
+        :type on_record: callable
+        :type on_progress: callable
         """
-        self.invalidate_cache()
-        self.__root_element = RootElement()
+        self.__reset()
+        self.__start_recovery(strict, recovery)
+        self.__source = self.__get_source(gedcom_stream)
+
+        if stats or on_record is not None or on_progress is not None:
+            parse_stats = self.__parse_instrumented(gedcom_stream, strict, on_record, on_progress)
+            if stats:
+                self.__stats = parse_stats
+            return
 
         line_number = 1
         last_element = self.get_root_element()
 
+        # Remember the byte offsets of records read from a file, see `write_gedcom()`
+        # Records containing fixed lines differ from the source file, so they don't get a span
+        offset = gedcom_stream.tell() if self.__source is not None else 0
+        record = None
+        record_start = offset
+        record_problems = 0
+
         for line in gedcom_stream:
+            problems = self.__problems
+            element = self.__parse_line(line_number, line.decode('utf-8-sig'), last_element, strict)
+            line_number += 1
+
+            # Skipped lines return the last element, which may be a record without sub-elements
+            if element is not last_element and element.get_level() == 0:
+                if record is not None and self.__source is not None and record_problems == problems:
+                    record.set_source_span(self.__source, record_start, offset)
+                record = element
+                record_start = offset
+                record_problems = problems
+            last_element = element
+            offset += len(line)
+
+        if record is not None and self.__source is not None and record_problems == self.__problems:
+            record.set_source_span(self.__source, record_start, offset)
+
+    def __parse_instrumented(self, gedcom_stream, strict, on_record, on_progress):
+        """Parses like `gedcom.parser.Parser.parse()`, timing each phase and calling the hooks
+        :type gedcom_stream: a file stream, or str array of lines with new line at the end
+        :type strict: bool
+        :type on_record: callable
+        :type on_progress: callable
+        :rtype: ParseStats
+        """
+        clock = time.perf_counter
+        phase_seconds = dict.fromkeys(PHASES, 0.0)
+        tag_counts = {}
+        maximum_depth = 0
+        records = 0
+        cancelled = False
+
+        line_number = 1
+        root_element = self.get_root_element()
+        last_element = root_element
+
+        offset = gedcom_stream.tell() if self.__source is not None else 0
+        start_offset = offset
+        record = None
+        record_start = offset
+        record_problems = 0
+        start = clock()
+
+        for line in gedcom_stream:
+            problems = self.__problems
+            decode_start = clock()
+            decoded_line = line.decode('utf-8-sig')
+            tokenize_start = clock()
+            line_parts = self.__tokenize_line(line_number, decoded_line, last_element, strict)
+            construct_start = clock()
+            phase_seconds[PHASE_DECODE] += tokenize_start - decode_start
+            phase_seconds[PHASE_TOKENIZE] += construct_start - tokenize_start
+
+            if line_parts is not None:
+                element = self.__create_element(*line_parts)
+                link_start = clock()
+                last_element = self.__link_element(element, last_element)
+
+                if line_parts[0] == 0:
+                    if record is not None:
+                        if self.__source is not None and record_problems == problems:
+                            record.set_source_span(self.__source, record_start, offset)
+                        records += 1
+                        if on_record is not None and on_record(record) is False:
+                            # Leave out the record which just started
+                            root_element.get_child_elements().pop()
+                            cancelled = True
+                    record = last_element
+                    record_start = offset
+                    record_problems = problems
+
+                tag = line_parts[2]
+                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+                if line_parts[0] > maximum_depth:
+                    maximum_depth = line_parts[0]
+                phase_seconds[PHASE_CONSTRUCT] += link_start - construct_start
+                phase_seconds[PHASE_LINK] += clock() - link_start
+
+            offset += len(line)
+            if cancelled:
+                break
+
+            if on_progress is not None and line_number % PROGRESS_INTERVAL == 0 \
+                    and on_progress(line_number, offset - start_offset) is False:
+                cancelled = True
+                break
+            line_number += 1
+
+        if not cancelled:
+            line_number -= 1
+            if record is not None:
+                if self.__source is not None and record_problems == self.__problems:
+                    record.set_source_span(self.__source, record_start, offset)
+                records += 1
+                if on_record is not None and on_record(record) is False:
+                    cancelled = True
+            if on_progress is not None and on_progress(line_number, offset - start_offset) is False:
+                cancelled = True
+
+        return ParseStats(line_number, offset - start_offset, clock() - start, phase_seconds, tag_counts,
+                          maximum_depth, records, cancelled)
+
+    def iter_records(self, gedcom_stream, strict=True, recovery=None, stats=False):
+        """Parses a stream, or an array of lines, as GEDCOM 5.5 formatted data, yielding one record at a time
+
+        Each record (an element with a level of zero, including all of its sub-elements) is yielded
+        as soon as it is complete. The records aren't kept by the parser, so even huge files may be
+        processed with constant memory.
+
+        Equal places share a single string, like while parsing with `gedcom.parser.Parser.parse()`, but only
+        the last `PLACE_CACHE_SIZE` distinct places of each call are remembered for sharing.
+
+        With `stats=True`, statistics are collected like by `gedcom.parser.Parser.parse()` and available
+        through `gedcom.parser.Parser.get_stats()` once all lines have been parsed. The time spent by the
+        caller while a record is being yielded isn't included.
+
+        :type gedcom_stream: a file stream, or str array of lines with new line at the end
+        :type strict: bool
+        :type recovery: gedcom.recovery.Recovery
+        :type stats: bool
+        :rtype: collections.Iterable[Element]
+        """
+        self.__start_recovery(strict, recovery)
+        self.__stats = None
+        if stats:
+            records = self.__iter_records_instrumented(gedcom_stream, strict)
+        else:
+            records = self.__iter_records(gedcom_stream, strict)
+        for record in records:
+            yield record
+
+    def __iter_records(self, gedcom_stream, strict):
+        """Yields the records of a stream, see `gedcom.parser.Parser.iter_records()`, using the current recovery
+        :type gedcom_stream: a file stream, or str array of lines with new line at the end
+        :type strict: bool
+        :rtype: collections.Iterable[Element]
+        """
+        places = _PlaceCache(PLACE_CACHE_SIZE)
+        root_element = RootElement()
+        records = root_element.get_child_elements()
+
+        line_number = 1
+        last_element = root_element
+
+        for line in gedcom_stream:
+            last_element = self.__parse_line(line_number, line.decode('utf-8-sig'), last_element, strict, places)
+            line_number += 1
+
+            if len(records) > 1:
+                record = records.pop(0)
+                record.set_parent_element(None)
+                yield record
+
+        for record in records:
+            record.set_parent_element(None)
+            yield record
+
+    def __iter_records_instrumented(self, gedcom_stream, strict):
+        """Yields the records of a stream like `__iter_records()`, timing each phase, see `gedcom.stats`
+        :type gedcom_stream: a file stream, or str array of lines with new line at the end
+        :type strict: bool
+        :rtype: collections.Iterable[Element]
+        """
+        clock = time.perf_counter
+        phase_seconds = dict.fromkeys(PHASES, 0.0)
+        tag_counts = {}
+        maximum_depth = 0
+        record_count = 0
+        byte_count = 0
+
+        places = _PlaceCache(PLACE_CACHE_SIZE)
+        root_element = RootElement()
+        records = root_element.get_child_elements()
+
+        line_number = 0
+        last_element = root_element
+        start = clock()
+
+        for line in gedcom_stream:
+            line_number += 1
+            byte_count += len(line)
+            decode_start = clock()
+            decoded_line = line.decode('utf-8-sig')
+            tokenize_start = clock()
+            line_parts = self.__tokenize_line(line_number, decoded_line, last_element, strict)
+            construct_start = clock()
+            phase_seconds[PHASE_DECODE] += tokenize_start - decode_start
+            phase_seconds[PHASE_TOKENIZE] += construct_start - tokenize_start
+            if line_parts is None:
+                continue
+
+            element = self.__create_element(*line_parts, places=places)
+            link_start = clock()
+            last_element = self.__link_element(element, last_element)
+
+            tag = line_parts[2]
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            if line_parts[0] > maximum_depth:
+                maximum_depth = line_parts[0]
+            phase_seconds[PHASE_CONSTRUCT] += link_start - construct_start
+            phase_seconds[PHASE_LINK] += clock() - link_start
+
+            if len(records) > 1:
+                record = records.pop(0)
+                record.set_parent_element(None)
+                record_count += 1
+                # Leave out the time spent by the caller
+                yield_start = clock()
+                yield record
+                start += clock() - yield_start
+
+        self.__stats = ParseStats(line_number, byte_count, clock() - start, phase_seconds, tag_counts,
+                                  maximum_depth, record_count + len(records))
+
+        for record in records:
+            record.set_parent_element(None)
+            yield record
+
+    def iter_file_records(self, file_path, strict=True, recovery=None, stats=False):
+        """Opens a file, from the given file path, and parses it one record at a time
+
+        See `gedcom.parser.Parser.iter_records()` for details.
+
+        :type file_path: str
+        :type strict: bool
+        :type recovery: gedcom.recovery.Recovery
+        :type stats: bool
+        :rtype: collections.Iterable[Element]
+        """
+        with gedcom.compression.open_file(file_path) as gedcom_stream:
+            for record in self.iter_records(gedcom_stream, strict, recovery, stats):
+                yield record
+
+    async def parse_async(self, reader, strict=True, recovery=None, executor=None):
+        """Parses GEDCOM 5.5 formatted data read from an `asyncio.StreamReader` or an async iterator of bytes
+
+        The lines are parsed as soon as they are received, giving other tasks a chance to run every
+        `ASYNC_INTERVAL` lines, so parsing a large file doesn't hold up the event loop.
+
+        Optionally, all data gets received first and is parsed by the given `concurrent.futures.Executor`.
+        A `concurrent.futures.ProcessPoolExecutor` parses without competing for the interpreter lock,
+        at the cost of sending the records back. The problems found with `strict=False` are available
+        through `gedcom.parser.Parser.get_recovery()` then, not through the given `recovery`.
+
+        :type reader: asyncio.StreamReader
+        :type strict: bool
+        :type recovery: gedcom.recovery.Recovery
+        :type executor: concurrent.futures.Executor
+        """
+        import asyncio
+        from gedcom.aio import iter_lines
+
+        if executor is not None:
+            lines = [line async for line in iter_lines(reader)]
+            parser = await asyncio.get_running_loop().run_in_executor(executor, _parse_lines, lines, strict, recovery)
+            self.__reset()
+            self.__root_element = parser.__root_element
+            self.__places = parser.__places
+            self.__recovery = parser.__recovery
+            return
+
+        self.__reset()
+        self.__start_recovery(strict, recovery)
+
+        line_number = 1
+        last_element = self.get_root_element()
+
+        async for line in iter_lines(reader):
             last_element = self.__parse_line(line_number, line.decode('utf-8-sig'), last_element, strict)
+            if line_number % ASYNC_INTERVAL == 0:
+                await asyncio.sleep(0)
             line_number += 1
 
+    @classmethod
+    def incremental(cls, strict=True, recovery=None, on_record=None, keep=True):
+        """Returns a push parser, which is fed with chunks of bytes split at any position, see `IncrementalParser`
+
+        Each record is passed to `on_record` and returned by `gedcom.parser.IncrementalParser.feed()`
+        as soon as it is complete. With `keep=False`, the records aren't kept by the parser
+        afterwards, so a stream of any length may be processed with constant memory. Only the last
+        `PLACE_CACHE_SIZE` distinct places are remembered for sharing then, see `gedcom.parser.Parser.iter_records()`.
+
+        :type strict: bool
+        :type recovery: gedcom.recovery.Recovery
+        :type on_record: callable
+        :type keep: bool
+        :rtype: IncrementalParser
+        """
+        parser = cls()
+        parser.__start_recovery(strict, recovery)
+        if not keep:
+            parser.__places = _PlaceCache(PLACE_CACHE_SIZE)
+        return IncrementalParser(parser, parser.__parse_line, strict, on_record, keep)
+
+    def get_stats(self):
+        """Returns the statistics of the last parse or iteration of records with `stats=True`, or `None` otherwise
+        :rtype: gedcom.stats.ParseStats
+        """
+        return self.__stats
+
+    def get_recovery(self):
+        """Returns the recovery used by the last parse with `strict=False`, holding the problems found
+
+        Returns `None` after parsing with `strict=True`.
+
+        :rtype: gedcom.recovery.Recovery
+        """
+        return self.__recovery
+
     # Private methods
 
+    def __reset(self):
+        """Drops all records and caches, closing the store if there is one"""
+        self.invalidate_cache()
+        self.__root_element = RootElement()
+        self.__places = {}
+        self.__source = None
+        self.__stats = None
+        if self.__store is not None:
+            self.__store.close()
+            self.__store = None
+
+    def __start_recovery(self, strict, recovery):
+        """Sets up the recovery from malformed lines for the next parse
+        :type strict: bool
+        :type recovery: gedcom.recovery.Recovery
+        """
+        self.__check_not_frozen()
+        self.__problems = 0
+        if strict:
+            self.__recovery = None
+        else:
+            self.__recovery = recovery if recovery is not None else gedcom.recovery.Recovery()
+
+    def __report_problem(self, line_number, code, line):
+        """Reports a malformed line to the recovery, returning the fix to apply, see `gedcom.recovery.Recovery.report()`
+        :type line_number: int
+        :type code: str
+        :type line: str
+        :rtype: str
+        """
+        self.__problems += 1
+        return self.__recovery.report(line_number, code, line)
+
+    def __parse_record(self, data):
+        """Parses a single record from GEDCOM formatted text
+        :type data: str
+        :rtype: Element
+        """
+        lines = [line.encode('utf-8') for line in data.splitlines(True)]
+
+        # Records written after parsing with `strict=False` may contain lines kept as they were, like invalid
+        # tags, so they're parsed leniently again, without touching the recovery of the parse which wrote them
+        recovery, problems = self.__recovery, self.__problems
+        self.__recovery = gedcom.recovery.Recovery()
+        try:
+            return next(iter(self.__iter_records(lines, False)))
+        finally:
+            self.__recovery, self.__problems = recovery, problems
+
     @staticmethod
-    def __parse_line(line_number, line, last_element, strict=True):
+    def __get_source(gedcom_stream):
+        """Returns a description of the regular file the given stream reads from, formatted as a tuple:
+        (`str` path, `int` size, `int` modification time)
+
+        Returns `None` for any other stream, like lists of lines or decompressing streams.
+
+        :type gedcom_stream: a file stream, or str array of lines with new line at the end
+        :rtype: tuple
+        """
+        if not isinstance(gedcom_stream, (io.BufferedReader, io.FileIO)) \
+                or not isinstance(getattr(gedcom_stream, 'name', None), str):
+            return None
+
+        try:
+            status = os.fstat(gedcom_stream.fileno())
+        except (OSError, ValueError):
+            return None
+
+        if not stat.S_ISREG(status.st_mode):
+            return None
+
+        return os.path.abspath(gedcom_stream.name), status.st_size, status.st_mtime_ns
+
+    @staticmethod
+    def __is_source_unchanged(source, open_file):
+        """Checks if the source file still is the same as when it was parsed and isn't the file written to
+        :type source: tuple
+        :type open_file: file
+        :rtype: bool
+        """
+        try:
+            status = os.stat(source[0])
+        except OSError:
+            return False
+
+        if (status.st_size, status.st_mtime_ns) != source[1:]:
+            return False
+
+        try:
+            return not os.path.samestat(status, os.fstat(open_file.fileno()))
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return True
+
+    def __parse_line(self, line_number, line, last_element, strict=True, places=None):
         """Parse a line from a GEDCOM 5.5 formatted document
 
         Each line should have the following (bracketed items optional):
@@ -170,64 +911,30 @@ class Parser(object):
         :type line: str
         :type last_element: Element
         :type strict: bool
+        :type places: dict of str
 
         :rtype: Element
         """
+        line_parts = self.__tokenize_line(line_number, line, last_element, strict)
+        if line_parts is None:
+            return last_element
 
-        # Level must start with non-negative int, no leading zeros.
-        level_regex = '^(0|[1-9]+[0-9]*) '
-
-        # Pointer optional, if it exists it must be flanked by `@`
-        pointer_regex = '(@[^@]+@ |)'
+        return self.__link_element(self.__create_element(*line_parts, places=places), last_element)
 
-        # Tag must be an alphanumeric string
-        tag_regex = '([A-Za-z0-9_]+)'
+    def __tokenize_line(self, line_number, line, last_element, strict=True):
+        """Splits a line into level, pointer, tag, value and end of line
 
-        # Value optional, consists of anything after a space to end of line
-        value_regex = '( [^\n\r]*|)'
+        Returns `None` if the line should be left out, see `gedcom.recovery`.
 
-        # End of line defined by `\n` or `\r`
-        end_of_line_regex = '([\r\n]{1,2})'
-
-        # Complete regex
-        gedcom_line_regex = level_regex + pointer_regex + tag_regex + value_regex + end_of_line_regex
-        regex_match = regex.match(gedcom_line_regex, line)
+        :type line_number: int
+        :type line: str
+        :type last_element: Element
+        :type strict: bool
+        :rtype: tuple
+        """
+        regex_match = _LINE_REGEX.match(line)
 
-        if regex_match is None:
-            if strict:
-                error_message = ("Line <%d:%s> of document violates GEDCOM format 5.5" % (line_number, line)
-                                 + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
-                raise GedcomFormatViolationError(error_message)
-            else:
-                # Quirk check - see if this is a line without a CRLF (which could be the last line)
-                last_line_regex = level_regex + pointer_regex + tag_regex + value_regex
-                regex_match = regex.match(last_line_regex, line)
-                if regex_match is not None:
-                    line_parts = regex_match.groups()
-
-                    level = int(line_parts[0])
-                    pointer = line_parts[1].rstrip(' ')
-                    tag = line_parts[2]
-                    value = line_parts[3][1:]
-                    crlf = '\n'
-                else:
-                    # Quirk check - Sometimes a gedcom has a text field with a CR.
-                    # This creates a line without the standard level and pointer.
-                    # If this is detected then turn it into a CONC or CONT.
-                    line_regex = '([^\n\r]*|)'
-                    cont_line_regex = line_regex + end_of_line_regex
-                    regex_match = regex.match(cont_line_regex, line)
-                    line_parts = regex_match.groups()
-                    level = last_element.get_level()
-                    tag = last_element.get_tag()
-                    pointer = None
-                    value = line_parts[0][1:]
-                    crlf = line_parts[1]
-                    if tag != gedcom.tags.GEDCOM_TAG_CONTINUED and tag != gedcom.tags.GEDCOM_TAG_CONCATENATION:
-                        # Increment level and change this line to a CONC
-                        level += 1
-                        tag = gedcom.tags.GEDCOM_TAG_CONCATENATION
-        else:
+        if regex_match is not None:
             line_parts = regex_match.groups()
 
             level = int(line_parts[0])
@@ -235,37 +942,137 @@ class Parser(object):
             tag = line_parts[2]
             value = line_parts[3][1:]
             crlf = line_parts[4]
+        elif strict:
+            self.__raise_format_violation(line_number, line)
+        else:
+            line_parts = self.__recover_line(line_number, line, last_element)
+            if line_parts is None:
+                return None
+            level, pointer, tag, value, crlf = line_parts
 
         # Check level: should never be more than one higher than previous line.
         if level > last_element.get_level() + 1:
-            error_message = ("Line %d of document violates GEDCOM format 5.5" % line_number
-                             + "\nLines must be no more than one level higher than previous line."
-                             + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
-            raise GedcomFormatViolationError(error_message)
+            fix = gedcom.recovery.FIX_RAISE
+            if not strict:
+                fix = self.__report_problem(line_number, gedcom.recovery.CODE_LEVEL_JUMP, line)
+
+            if fix == gedcom.recovery.FIX_RAISE:
+                error_message = ("Line %d of document violates GEDCOM format 5.5" % line_number
+                                 + "\nLines must be no more than one level higher than previous line."
+                                 + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
+                raise GedcomFormatViolationError(error_message)
+            elif fix == gedcom.recovery.FIX_SKIP:
+                return None
+
+            level = last_element.get_level() + 1
+
+        return level, pointer, tag, value, crlf
+
+    def __create_element(self, level, pointer, tag, value, crlf, places=None):
+        """Creates the element of a line, of the class matching its tag
+
+        Places are shared through the given `places` instead of those of the parser, if there are any.
+
+        :type level: int
+        :type pointer: str
+        :type tag: str
+        :type value: str
+        :type crlf: str
+        :type places: dict of str
+        :rtype: Element
+        """
+        # Share a single string between all equal places
+        if tag == gedcom.tags.GEDCOM_TAG_PLACE:
+            value = (self.__places if places is None else places).setdefault(value, value)
 
-        # Create element. Store in list and dict, create children and parents.
         if tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL:
-            element = IndividualElement(level, pointer, tag, value, crlf, multi_line=False)
+            return IndividualElement(level, pointer, tag, value, crlf, multi_line=False)
         elif tag == gedcom.tags.GEDCOM_TAG_FAMILY:
-            element = FamilyElement(level, pointer, tag, value, crlf, multi_line=False)
+            return FamilyElement(level, pointer, tag, value, crlf, multi_line=False)
         elif tag == gedcom.tags.GEDCOM_TAG_FILE:
-            element = FileElement(level, pointer, tag, value, crlf, multi_line=False)
+            return FileElement(level, pointer, tag, value, crlf, multi_line=False)
         elif tag == gedcom.tags.GEDCOM_TAG_OBJECT:
-            element = ObjectElement(level, pointer, tag, value, crlf, multi_line=False)
-        else:
-            element = Element(level, pointer, tag, value, crlf, multi_line=False)
+            return ObjectElement(level, pointer, tag, value, crlf, multi_line=False)
+        return Element(level, pointer, tag, value, crlf, multi_line=False)
 
+    @staticmethod
+    def __link_element(element, last_element):
+        """Adds an element to its parent, which is the last element or one of its ancestors
+        :type element: Element
+        :type last_element: Element
+        :rtype: Element
+        """
         # Start with last element as parent, back up if necessary.
         parent_element = last_element
+        level = element.get_level()
 
         while parent_element.get_level() > level - 1:
             parent_element = parent_element.get_parent_element()
 
-        # Add child to parent & parent to child.
-        parent_element.add_child_element(element)
+        # Add child to parent & parent to child, without marking the record as modified.
+        parent_element.get_child_elements().append(element)
+        element.set_parent_element(parent_element)
 
         return element
 
+    def __recover_line(self, line_number, line, last_element):
+        """Classifies a malformed line and applies the fix configured for its problem
+
+        Returns the parts of the fixed line, or `None` if the line should be left out.
+
+        :type line_number: int
+        :type line: str
+        :type last_element: Element
+        :rtype: tuple
+        """
+        regex_match = _LENIENT_LINE_REGEX.match(line)
+
+        if regex_match is not None:
+            line_parts = regex_match.groups()
+            if _TAG_REGEX.match(line_parts[2]) is None:
+                code = gedcom.recovery.CODE_INVALID_TAG
+            else:
+                code = gedcom.recovery.CODE_MISSING_NEWLINE
+
+            fix = self.__report_problem(line_number, code, line)
+            if fix == gedcom.recovery.FIX_RAISE:
+                self.__raise_format_violation(line_number, line)
+            elif fix == gedcom.recovery.FIX_SKIP:
+                return None
+
+            return int(line_parts[0]), line_parts[1].rstrip(' '), line_parts[2], line_parts[3][1:], \
+                line_parts[4] or '\n'
+
+        # Sometimes a gedcom has a text field with a CR. This creates a line without
+        # the standard level and pointer, which gets turned into a CONC or CONT.
+        fix = self.__report_problem(line_number, gedcom.recovery.CODE_CONTINUATION_WITHOUT_TAG, line)
+        if fix == gedcom.recovery.FIX_RAISE:
+            self.__raise_format_violation(line_number, line)
+        elif fix == gedcom.recovery.FIX_SKIP:
+            return None
+
+        value, crlf = _CONTINUATION_REGEX.match(line).groups()
+        level = last_element.get_level()
+        tag = last_element.get_tag()
+        if tag != gedcom.tags.GEDCOM_TAG_CONTINUED and tag != gedcom.tags.GEDCOM_TAG_CONCATENATION:
+            level += 1
+            if fix == gedcom.recovery.FIX_CONTINUE:
+                tag = gedcom.tags.GEDCOM_TAG_CONTINUED
+            else:
+                tag = gedcom.tags.GEDCOM_TAG_CONCATENATION
+
+        return level, '', tag, value, crlf or '\n'
+
+    @staticmethod
+    def __raise_format_violation(line_number, line):
+        """Raises an error for a line which doesn't match the GEDCOM format
+        :type line_number: int
+        :type line: str
+        """
+        error_message = ("Line <%d:%s> of document violates GEDCOM format 5.5" % (line_number, line)
+                         + "\nSee: https://chronoplexsoftware.com/gedcomvalidator/gedcom/gedcom-5.5.pdf")
+        raise GedcomFormatViolationError(error_message)
+
     def __build_list(self, element, element_list):
         """Recursively add elements to a list containing elements
         :type element: Element
@@ -514,6 +1321,336 @@ class Parser(object):
 
         return family_members
 
+    def find_duplicate_candidates(self, minimum_score=0.8, weights=None, workers=None):
+        """Returns pairs of individuals which are likely to be duplicates, ranked by their score
+
+        See `gedcom.duplicates.find_duplicate_candidates()` for details.
+
+        :type minimum_score: float
+        :type weights: dict
+        :type workers: int
+        :rtype: list of DuplicateCandidate
+        """
+        from gedcom.duplicates import find_duplicate_candidates
+        return find_duplicate_candidates(self.get_root_child_elements(), minimum_score, weights, workers)
+
+    def extract(self, individuals, include=EXTRACT_BOTH, generations=None):
+        """Returns the records needed for a standalone file of the given individuals and their relatives
+
+        `include` selects which relatives are part of the extract:
+
+        "EXTRACT_ANCESTORS": The ancestors of the individuals, together with the families linking them
+        "EXTRACT_DESCENDANTS": The descendants of the individuals, together with their families and spouses
+        "EXTRACT_BOTH": Default, both ancestors and descendants
+
+        The values are compared case-insensitively, so `"ancestors"` works as well. Any other value
+        raises a `ValueError`.
+
+        `generations` limits the number of generations, `None` includes all of them. Sources, notes,
+        multimedia objects, repositories and submitters referenced by any of these records are part of
+        the extract as well, as are the header and the trailer of the file.
+
+        Only records reachable from the given individuals are visited, so the cost depends on the size of the
+        extract rather than the size of the file. The records aren't copied, pass them to
+        `gedcom.parser.Parser.write_gedcom()` to write the extract to a file:
+
+        ```python
+        records = gedcom_parser.extract([individual], EXTRACT_ANCESTORS, generations=4)
+        with open('ancestors.ged', 'wb') as gedcom_file:
+            gedcom_parser.write_gedcom(gedcom_file, records=records)
+        ```
+
+        :type individuals: list of IndividualElement
+        :type include: str
+        :type generations: int
+        :rtype: list of Element
+        """
+        for individual in individuals:
+            if not isinstance(individual, IndividualElement):
+                raise NotAnActualIndividualError(
+                    "Operation only valid for elements with %s tag" % gedcom.tags.GEDCOM_TAG_INDIVIDUAL
+                )
+
+        include = str(include).upper()
+        if include not in (EXTRACT_ANCESTORS, EXTRACT_DESCENDANTS, EXTRACT_BOTH):
+            raise ValueError("Unknown value %r of include, expected one of %s, %s or %s"
+                             % (include, EXTRACT_ANCESTORS, EXTRACT_DESCENDANTS, EXTRACT_BOTH))
+
+        element_dictionary = self.get_element_dictionary()
+        included = {}
+
+        def include_record(record):
+            if record.get_pointer() in included:
+                return False
+            included[record.get_pointer()] = record
+            return True
+
+        # Walk ancestors and descendants generation by generation
+        directions = []
+        if include in (EXTRACT_ANCESTORS, EXTRACT_BOTH):
+            directions.append((gedcom.tags.GEDCOM_TAG_FAMILY_CHILD, FAMILY_MEMBERS_TYPE_PARENTS))
+        if include in (EXTRACT_DESCENDANTS, EXTRACT_BOTH):
+            directions.append((gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE, FAMILY_MEMBERS_TYPE_CHILDREN))
+
+        for individual in individuals:
+            include_record(individual)
+
+        for family_type, members_type in directions:
+            generation = list(individuals)
+            visited = set(individual.get_pointer() for individual in individuals)
+            generation_number = 0
+
+            while generation and (generations is None or generation_number < generations):
+                next_generation = []
+                for individual in generation:
+                    for family in self.get_families(individual, family_type):
+                        include_record(family)
+                        if members_type == FAMILY_MEMBERS_TYPE_CHILDREN:
+                            # Spouses of descendants, without their own relatives
+                            for spouse in self.get_family_members(family, FAMILY_MEMBERS_TYPE_PARENTS):
+                                include_record(spouse)
+                        for member in self.get_family_members(family, members_type):
+                            include_record(member)
+                            if member.get_pointer() not in visited:
+                                visited.add(member.get_pointer())
+                                next_generation.append(member)
+                generation = next_generation
+                generation_number += 1
+
+        # Add the header and everything referenced by the records included so far, except other relatives
+        records = list(included.values())
+        root_child_elements = self.get_root_child_elements()
+        header = root_child_elements[0] if len(root_child_elements) > 0 else None
+        trailer = root_child_elements[-1] if len(root_child_elements) > 0 else None
+        if header is not None and header.get_tag() == gedcom.tags.GEDCOM_TAG_HEADER:
+            records.insert(0, header)
+
+        index = 0
+        while index < len(records):
+            stack = [records[index]]
+            index += 1
+            while stack:
+                element = stack.pop()
+                value = element.get_value()
+                if is_pointer(value) and value in element_dictionary:
+                    record = element_dictionary[value]
+                    if record.get_tag() not in (gedcom.tags.GEDCOM_TAG_INDIVIDUAL, gedcom.tags.GEDCOM_TAG_FAMILY) \
+                            and include_record(record):
+                        records.append(record)
+                stack.extend(element.get_child_elements())
+
+        if trailer is not None and trailer.get_tag() == gedcom.tags.GEDCOM_TAG_TRAILER:
+            records.append(trailer)
+
+        return records
+
+    def memory_report(self, verify=False):
+        """Estimates the memory used by the parsed records and the caches built over them
+
+        Returns the total bytes, the bytes by kind of object and the number of elements and their bytes by
+        tag and by type of record, see `gedcom.memory.get_memory_report()`. Records kept in a store aren't
+        included. Records loaded by `gedcom.parser.Parser.load_shared()` are reported by the size of their
+        shared buffer and its tables instead, see `gedcom.shared.SharedTree.get_memory_report()`.
+
+        With `verify=True`, the records are written to a buffer and parsed again while tracing memory
+        allocations with `tracemalloc`. The estimated and the measured bytes of that second parse are
+        added to the report as `verification`, which helps catching changes of the memory used by elements.
+        Shared records can't be verified, since they aren't held by elements, so this raises a `ValueError`.
+
+        :type verify: bool
+        :rtype: dict
+        """
+        if self.__shared_tree is not None:
+            if verify:
+                raise ValueError("Shared records can't be verified, since they aren't held by elements")
+            return self.__shared_tree.get_memory_report()
+
+        from gedcom.memory import get_memory_report, measure_parse
+        report = get_memory_report(self.__root_element.get_child_elements(), self.__element_list,
+                                   self.__element_dictionary, self.__places)
+
+        if verify:
+            buffer = io.BytesIO()
+            self.write_gedcom(buffer, records=self.__root_element.get_child_elements())
+            buffer.seek(0)
+            report["verification"] = measure_parse(buffer)
+
+        return report
+
+    # Methods for removing and renumbering records
+
+    def remove_record(self, pointer, cascade=True):
+        """Removes the record identified by the given pointer, returning the elements removed along with it
+
+        With `cascade=True`, all elements of other records pointing to the removed record are removed as
+        well, like the `gedcom.tags.GEDCOM_TAG_CHILD` of a family when removing an individual. Otherwise,
+        a `gedcom.parser.ReferencedRecordError` is raised if there are any of them.
+
+        The elements pointing to the record are looked up by `gedcom.parser.Parser.get_reference_index()`,
+        so removing a record takes time proportional to its size and the number of its references,
+        apart from removing it from the list of records. The element list and all other indexes get
+        rebuilt on their next use.
+
+        :type pointer: str
+        :type cascade: bool
+        :rtype: list of Element
+        """
+        self.__check_not_frozen()
+        if self.__store is not None:
+            raise ValueError("Records kept in a store can't be removed")
+
+        record = self.get_element_dictionary().get(pointer)
+        if record is None:
+            raise KeyError(pointer)
+
+        reference_index = self.get_reference_index()
+        references = [element for element in reference_index.get_references(pointer)
+                      if element.get_record() is not record]
+        if references and not cascade:
+            raise ReferencedRecordError("Record %s is referenced by %d elements" % (pointer, len(references)))
+
+        for element in references:
+            reference_index.remove(element)
+            element.get_parent_element().remove_child_element(element)
+        reference_index.remove(record)
+        self.get_root_element().remove_child_element(record)
+
+        self.__element_dictionary.pop(pointer, None)
+        self.__element_list = []
+        self.__drop_indexes(keep_references=True)
+        return references
+
+    def renumber_pointers(self, scheme=None):
+        """Changes the pointers of all records and of all elements pointing to them, returning a dictionary
+        of the old pointers mapped to the new ones
+
+        The `scheme` is either a dictionary mapping old pointers to new ones, leaving out pointers which
+        shouldn't be changed, or a function called with each record and its number among the records
+        with the same tag, starting with 1, returning the new pointer. By default, records are numbered
+        by their tag in the order of the file, like `@I1@`, `@F1@` and `@S1@`, see `POINTER_PREFIXES`.
+
+        New pointers have to be unique, otherwise a `ValueError` is raised before anything is changed.
+        All records are walked once to compute the new pointers, and only the elements pointing to
+        them are changed, looked up by `gedcom.parser.Parser.get_reference_index()`. All other indexes
+        get rebuilt on their next use, since they refer to records by their pointers.
+
+        :type scheme: dict or callable
+        :rtype: dict of str
+        """
+        self.__check_not_frozen()
+        if self.__store is not None:
+            raise ValueError("Records kept in a store can't be renumbered")
+
+        if scheme is None:
+            scheme = _number_by_tag
+
+        pointers = {}
+        new_pointers = set()
+        numbers = {}
+        for record in self.get_root_child_elements():
+            pointer = record.get_pointer()
+            if not pointer:
+                continue
+
+            number = numbers.get(record.get_tag(), 0) + 1
+            numbers[record.get_tag()] = number
+            new_pointer = scheme(record, number) if callable(scheme) else scheme.get(pointer, pointer)
+
+            if not is_pointer(new_pointer) or new_pointer in new_pointers:
+                raise ValueError("Pointer %s is invalid or not unique" % new_pointer)
+            new_pointers.add(new_pointer)
+            if new_pointer != pointer:
+                pointers[pointer] = new_pointer
+
+        reference_index = self.get_reference_index()
+        element_dictionary = self.get_element_dictionary()
+        renamed_records = [(element_dictionary[pointer], new_pointer) for pointer, new_pointer in pointers.items()]
+        self.__element_dictionary = {
+            pointers.get(pointer, pointer): record for pointer, record in element_dictionary.items()
+        }
+
+        for record, new_pointer in renamed_records:
+            record.set_pointer(new_pointer)
+        for pointer, new_pointer in pointers.items():
+            for element in reference_index.get_references(pointer):
+                element.set_value(new_pointer)
+        reference_index.rename(pointers)
+        self.__drop_indexes(keep_references=True)
+        return pointers
+
+    @contextmanager
+    def batch(self):
+        """Returns a context manager applying the changes made within it at once, or none of them on an exception
+
+        ```python
+        with gedcom_parser.batch():
+            for individual in individuals:
+                individual.new_child_element(gedcom.tags.GEDCOM_TAG_OCCUPATION, value="Farmer")
+        ```
+
+        All changes of elements made within the current thread are noted down. Records added to or
+        removed from the root element and changed pointers of records are applied to the element
+        dictionary right away, so `gedcom.parser.Parser.get_element_dictionary()` stays up to date
+        without calling `gedcom.parser.Parser.invalidate_cache()`. The element list and all indexes
+        are dropped once at the end, to be rebuilt on their next use.
+
+        If an exception is raised, all changes get undone, see `gedcom.element.journal`, and all
+        caches are dropped. Nested batches of the same parser are part of the outermost one.
+        """
+        self.__check_not_frozen()
+        if self.__journal is not None:
+            yield
+            return
+
+        journal = Journal(self.__update_element_dictionary)
+        journal.start()
+        self.__journal = journal
+        self.__reference_index_changes = 0
+        try:
+            yield
+        except BaseException:
+            journal.rollback()
+            self.__journal = None
+            self.invalidate_cache()
+            raise
+
+        journal.stop()
+        self.__journal = None
+        if len(journal) > 0:
+            self.__element_list = []
+            self.__drop_indexes()
+
+    def __drop_indexes(self, keep_references=False):
+        """Drops the indexes, to be rebuilt on their next use, optionally apart from the reference index
+
+        Keeping the reference index means it has been kept up to date with all changes made so far.
+
+        :type keep_references: bool
+        """
+        self.__timeline_index = None
+        self.__place_index = None
+        self.__name_index = None
+        if not keep_references:
+            self.__reference_index = None
+        elif self.__journal is not None:
+            self.__reference_index_changes = len(self.__journal)
+
+    def __update_element_dictionary(self, parent, record, old_pointer, new_pointer):
+        """Applies a record added to or removed from the root element, or its changed pointer, to the element
+        dictionary while within `gedcom.parser.Parser.batch()`
+
+        :type parent: Element
+        :type record: Element
+        :type old_pointer: str
+        :type new_pointer: str
+        """
+        if parent is not self.__root_element or not self.__element_dictionary:
+            return
+        if old_pointer and self.__element_dictionary.get(old_pointer) is record:
+            del self.__element_dictionary[old_pointer]
+        if new_pointer:
+            self.__element_dictionary[new_pointer] = record
+
     # Other methods
 
     def print_gedcom(self):
@@ -521,11 +1658,331 @@ class Parser(object):
         from sys import stdout
         self.save_gedcom(stdout)
 
+    def save_file(self, file_path, compression=None, compression_level=None, encoding="utf-8"):
+        """Save GEDCOM data to a file at the given file path, optionally compressed
+
+        The compression format is either given by `compression` or implied by the file extension,
+        see `gedcom.compression.open_file()`.
+
+        :type file_path: str
+        :type compression: str
+        :type compression_level: int
+        :type encoding: str
+        """
+        with gedcom.compression.open_file(file_path, 'wb', compression, compression_level) as open_file:
+            self.write_gedcom(open_file, encoding=encoding)
+
     def save_gedcom(self, open_file):
         """Save GEDCOM data to a file
+
+        See `gedcom.parser.Parser.write_gedcom()` for details.
+
         :type open_file: file
         """
-        if version_info[0] >= 3:
-            open_file.write(self.get_root_element().to_gedcom_string(True))
+        self.write_gedcom(open_file)
+
+    async def save_gedcom_async(self, writer, buffer_size=DEFAULT_BUFFER_SIZE, encoding="utf-8", records=None,
+                                executor=None):
+        """Save GEDCOM data to an `asyncio.StreamWriter`, or any writer with a `write()` coroutine accepting bytes
+
+        The data is written by `gedcom.parser.Parser.write_gedcom()` within the given
+        `concurrent.futures.ThreadPoolExecutor`, or the default executor of the event loop,
+        while each buffer is written and drained within the event loop.
+
+        :type writer: asyncio.StreamWriter
+        :type buffer_size: int
+        :type encoding: str
+        :type records: list of Element
+        :type executor: concurrent.futures.ThreadPoolExecutor
+        """
+        import asyncio
+        from gedcom.aio import AsyncWriterFile
+
+        loop = asyncio.get_running_loop()
+        open_file = AsyncWriterFile(writer, loop)
+        await loop.run_in_executor(executor, self.write_gedcom, open_file, buffer_size, encoding, records)
+
+    def write_gedcom(self, open_file, buffer_size=DEFAULT_BUFFER_SIZE, encoding="utf-8", records=None):
+        """Write GEDCOM data to a file, one buffer of lines at a time
+
+        The tree is walked iteratively and the lines are written in batches of about `buffer_size`
+        characters, so only a single batch is held in memory at once. Files opened in binary mode get
+        the lines encoded with `encoding`, files opened in text mode use their own encoding.
+
+        When writing to a file opened in binary mode, records which weren't modified since they
+        were parsed by `gedcom.parser.Parser.parse_file()` get copied verbatim from the source file,
+        as long as the source file didn't change in the meantime. The output is byte for byte the
+        same as the source file then, apart from the modified records.
+
+        Optionally only the given `records` are written, like the ones returned by
+        `gedcom.parser.Parser.extract()`. Elements pointing to records not among them are left out then.
+
+        :type open_file: file
+        :type buffer_size: int
+        :type encoding: str
+        :type records: list of Element
+        """
+        binary = is_binary_file(open_file)
+
+        pointers = None
+        if records is None:
+            records = self.get_root_child_elements()
         else:
-            open_file.write(self.get_root_element().to_gedcom_string(True).encode('utf-8-sig'))
+            pointers = set(record.get_pointer() for record in records if record.get_pointer())
+
+        source = self.__source if binary else None
+        if source is not None and not self.__is_source_unchanged(source, open_file):
+            source = None
+
+        lines = []
+        size = 0
+        copy_range = None
+
+        with (open(source[0], 'rb') if source is not None else nullcontext()) as source_file:
+            for record in records:
+                span = record.get_source_span()
+
+                if source is not None and span is not None and span[0] is source and not record.is_modified() \
+                        and (pointers is None or not self.__has_dangling_pointers(record, pointers)):
+                    if copy_range is not None and copy_range[1] == span[1]:
+                        copy_range = (copy_range[0], span[2])
+                        continue
+
+                    if copy_range is not None:
+                        self.__copy_range(source_file, open_file, copy_range[0], copy_range[1])
+                    elif lines:
+                        self.__write_lines(open_file, lines, binary, encoding)
+                        lines = []
+                        size = 0
+
+                    copy_range = (span[1], span[2])
+                    continue
+
+                if copy_range is not None:
+                    self.__copy_range(source_file, open_file, copy_range[0], copy_range[1])
+                    copy_range = None
+
+                stack = [record]
+                while stack:
+                    element = stack.pop()
+                    if pointers is not None and is_pointer(element.get_value()) \
+                            and element.get_value() not in pointers:
+                        continue
+
+                    line = element.to_gedcom_string()
+                    lines.append(line)
+                    size += len(line)
+                    stack.extend(reversed(element.get_child_elements()))
+
+                    if size >= buffer_size:
+                        self.__write_lines(open_file, lines, binary, encoding)
+                        lines = []
+                        size = 0
+
+            if copy_range is not None:
+                self.__copy_range(source_file, open_file, copy_range[0], copy_range[1])
+            if lines:
+                self.__write_lines(open_file, lines, binary, encoding)
+
+    @staticmethod
+    def __has_dangling_pointers(record, pointers):
+        """Checks if any element of the record points to a record not among the given pointers
+        :type record: Element
+        :type pointers: set of str
+        :rtype: bool
+        """
+        stack = [record]
+        while stack:
+            element = stack.pop()
+            if is_pointer(element.get_value()) and element.get_value() not in pointers:
+                return True
+            stack.extend(element.get_child_elements())
+        return False
+
+    @staticmethod
+    def __write_lines(open_file, lines, binary, encoding):
+        """:type open_file: file
+        :type lines: list of str
+        :type binary: bool
+        :type encoding: str
+        """
+        if binary:
+            open_file.write(''.join(lines).encode(encoding))
+        else:
+            open_file.writelines(lines)
+
+    @staticmethod
+    def __copy_range(source_file, open_file, start, end):
+        """Copies the bytes from `start` to `end` of the source file to the given file
+
+        Regular files get the bytes copied by the operating system via `os.sendfile()` where available.
+
+        :type source_file: file
+        :type open_file: file
+        :type start: int
+        :type end: int
+        """
+        # Compressing files like `gzip.GzipFile` expose the descriptor of the underlying file as well
+        use_sendfile = hasattr(os, 'sendfile') and isinstance(open_file, (io.BufferedWriter, io.BufferedRandom))
+        if use_sendfile:
+            try:
+                output_descriptor = open_file.fileno()
+                use_sendfile = stat.S_ISREG(os.fstat(output_descriptor).st_mode)
+            except (OSError, ValueError, io.UnsupportedOperation):
+                use_sendfile = False
+
+        if use_sendfile:
+            open_file.flush()
+            while start < end:
+                sent = os.sendfile(output_descriptor, source_file.fileno(), start, end - start)
+                if sent == 0:
+                    raise IOError("Source file %s got truncated while saving" % source_file.name)
+                start += sent
+            # Let the file object pick up the position the operating system advanced to
+            open_file.seek(0, os.SEEK_CUR)
+            return
+
+        source_file.seek(start)
+        while start < end:
+            chunk = source_file.read(min(end - start, DEFAULT_BUFFER_SIZE))
+            if not chunk:
+                raise IOError("Source file %s got truncated while saving" % source_file.name)
+            open_file.write(chunk)
+            start += len(chunk)
+
+
+class IncrementalParser(object):
+    """Push parser created by `gedcom.parser.Parser.incremental()`
+
+    ```python
+    incremental_parser = Parser.incremental()
+    for chunk in chunks:
+        for record in incremental_parser.feed(chunk):
+            ...
+    incremental_parser.close()
+    gedcom_parser = incremental_parser.get_parser()
+    ```
+
+    :type parser: Parser
+    :type parse_line: callable
+    :type strict: bool
+    :type on_record: callable
+    :type keep: bool
+    """
+
+    def __init__(self, parser, parse_line, strict, on_record, keep):
+        self.__parser = parser
+        self.__parse_line = parse_line
+        self.__strict = strict
+        self.__on_record = on_record
+        self.__keep = keep
+        self.__line_buffer = LineBuffer()
+        self.__line_number = 1
+        self.__last_element = parser.get_root_element()
+        self.__record = None
+        self.__closed = False
+
+    def feed(self, chunk):
+        """Parses the lines completed by the given chunk of bytes, returning the records completed by them
+        :type chunk: bytes
+        :rtype: list of Element
+        """
+        if self.__closed:
+            raise ValueError("Incremental parser has already been closed")
+        return self.__parse_lines(self.__line_buffer.feed(chunk))
+
+    def close(self):
+        """Parses the last line, even without a new line at its end, returning the records completed by it
+
+        The records kept by the parser are available through `get_parser()` afterwards.
+
+        :rtype: list of Element
+        """
+        if self.__closed:
+            return []
+        records = self.__parse_lines(self.__line_buffer.close())
+        if self.__record is not None:
+            records.append(self.__complete_record(self.__record))
+            self.__record = None
+        self.__closed = True
+        self.__parser.invalidate_cache()
+        return records
+
+    def get_parser(self):
+        """Returns the parser holding the records parsed so far
+        :rtype: Parser
+        """
+        return self.__parser
+
+    def __parse_lines(self, lines):
+        """:type lines: list of bytes
+        :rtype: list of Element
+        """
+        records = []
+        for line in lines:
+            self.__last_element = self.__parse_line(self.__line_number, line.decode('utf-8-sig'),
+                                                    self.__last_element, self.__strict)
+            self.__line_number += 1
+
+            if self.__last_element.get_level() == 0 and self.__last_element is not self.__record:
+                if self.__record is not None:
+                    records.append(self.__complete_record(self.__record))
+                self.__record = self.__last_element
+        return records
+
+    def __complete_record(self, record):
+        """:type record: Element
+        :rtype: Element
+        """
+        if not self.__keep:
+            self.__parser.get_root_element().get_child_elements().remove(record)
+            record.set_parent_element(None)
+        if self.__on_record is not None:
+            self.__on_record(record)
+        return record
+
+
+class _PlaceCache(OrderedDict):
+    """Places shared between records, forgetting the least recently used ones beyond a maximum size
+
+    :type maximum_size: int
+    """
+
+    def __init__(self, maximum_size):
+        super(_PlaceCache, self).__init__()
+        self.__maximum_size = maximum_size
+
+    def setdefault(self, key, default=None):
+        """Returns the place equal to `key`, remembering `default` if there is none
+        :type key: str
+        :type default: str
+        :rtype: str
+        """
+        if key in self:
+            self.move_to_end(key)
+            return self[key]
+        self[key] = default
+        if len(self) > self.__maximum_size:
+            self.popitem(last=False)
+        return default
+
+
+def _number_by_tag(record, number):
+    """Returns the pointer of a record numbered by its tag, see `gedcom.parser.Parser.renumber_pointers()`
+    :type record: Element
+    :type number: int
+    :rtype: str
+    """
+    return "@%s%d@" % (POINTER_PREFIXES.get(record.get_tag(), "X"), number)
+
+
+def _parse_lines(lines, strict, recovery):
+    """Parses the given lines by a new parser, returning it, see `gedcom.parser.Parser.parse_async()`
+    :type lines: list of bytes
+    :type strict: bool
+    :type recovery: gedcom.recovery.Recovery
+    :rtype: Parser
+    """
+    parser = Parser()
+    parser.parse(lines, strict, recovery)
+    return parser
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Normalization and phonetic encoding of names, used to match spelling variants like `Meyer`, `Meier` and `Mayr`.
+"""
+
+import re as regex
+import unicodedata
+
+# Letters which aren't decomposed into a base letter and a combining character
+_SPECIAL_LETTERS = {
+    "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d", "ð": "d", "þ": "th", "ı": "i"
+}
+
+_NON_LETTERS_REGEX = regex.compile(r'[^a-z0-9]+')
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6")):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+
+def fold_accents(name):
+    """Returns the name in lower case with all accents and other diacritics removed
+
+    For example `Müller` results in `muller` and `Strauß` in `strauss`.
+
+    :type name: str
+    :rtype: str
+    """
+    name = name.casefold()
+    name = "".join(_SPECIAL_LETTERS.get(character, character) for character in name)
+    return "".join(character for character in unicodedata.normalize("NFKD", name)
+                   if not unicodedata.combining(character))
+
+
+def normalize(name):
+    """Returns the accent-folded name with everything but letters and digits collapsed into single spaces
+    :type name: str
+    :rtype: str
+    """
+    return _NON_LETTERS_REGEX.sub(" ", fold_accents(name)).strip()
+
+
+def soundex(name):
+    """Returns the American Soundex code of a name like `M600` for `Meyer`
+
+    An empty string is returned for names without any letters.
+
+    :type name: str
+    :rtype: str
+    """
+    letters = [character for character in normalize(name) if "a" <= character <= "z"]
+    if not letters:
+        return ""
+
+    code = letters[0].upper()
+    last_code = _SOUNDEX_CODES.get(letters[0], "")
+
+    for letter in letters[1:]:
+        letter_code = _SOUNDEX_CODES.get(letter, "")
+        if letter_code and letter_code != last_code:
+            code += letter_code
+            if len(code) == 4:
+                break
+        # `h` and `w` don't separate letters with equal codes, vowels do
+        if letter not in "hw":
+            last_code = letter_code
+
+    return code.ljust(4, "0")
+
+
+def cologne_phonetics(name):
+    """Returns the Cologne phonetics ("Kölner Phonetik") code of a name like `67` for `Meyer`
+
+    The Cologne phonetics fit German names better than `soundex()` does.
+    An empty string is returned for names without any letters.
+
+    :type name: str
+    :rtype: str
+    """
+    letters = [character for character in normalize(name) if "a" <= character <= "z"]
+    codes = []
+
+    for index, letter in enumerate(letters):
+        previous_letter = letters[index - 1] if index > 0 else ""
+        next_letter = letters[index + 1] if index + 1 < len(letters) else ""
+
+        if letter in "aeijouy":
+            code = "0"
+        elif letter == "h":
+            code = ""
+        elif letter == "b":
+            code = "1"
+        elif letter == "p":
+            code = "3" if next_letter == "h" else "1"
+        elif letter in "dt":
+            code = "8" if next_letter in ("c", "s", "z") else "2"
+        elif letter in "fvw":
+            code = "3"
+        elif letter in "gkq":
+            code = "4"
+        elif letter == "c":
+            if index == 0:
+                code = "4" if next_letter in ("a", "h", "k", "l", "o", "q", "r", "u", "x") else "8"
+            elif previous_letter in ("s", "z"):
+                code = "8"
+            else:
+                code = "4" if next_letter in ("a", "h", "k", "o", "q", "u", "x") else "8"
+        elif letter == "x":
+            code = "8" if previous_letter in ("c", "k", "q") else "48"
+        elif letter == "l":
+            code = "5"
+        elif letter in "mn":
+            code = "6"
+        elif letter == "r":
+            code = "7"
+        else:
+            code = "8"
+
+        codes.append(code)
+
+    result = ""
+    for code in "".join(codes):
+        if not result or result[-1] != code:
+            result += code
+
+    return result[:1] + result[1:].replace("0", "")
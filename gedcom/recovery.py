@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Recovery from malformed lines while parsing with `strict=False`.
+
+Each malformed line is classified once into one of the problems below, which are then fixed as
+configured instead of raising a `gedcom.parser.GedcomFormatViolationError`. The problems are reported
+as `gedcom.validate.Diagnostic` to the `Recovery` used for parsing, which keeps a bounded number of them.
+
+```python
+from gedcom.parser import Parser
+from gedcom.recovery import CODE_LEVEL_JUMP, FIX_SKIP, Recovery
+
+recovery = Recovery(fixes={CODE_LEVEL_JUMP: FIX_SKIP})
+gedcom_parser = Parser()
+gedcom_parser.parse_file('vendor.ged', strict=False, recovery=recovery)
+
+for diagnostic in recovery.get_diagnostics():
+    print("%d: %s" % (diagnostic.line_number, diagnostic.message))
+```
+"""
+
+from gedcom.validate import Diagnostic, SEVERITY_WARNING
+
+CODE_CONTINUATION_WITHOUT_TAG = "CONTINUATION_WITHOUT_TAG"
+"""A line without level and tag, usually text continued after a line break within a value"""
+
+CODE_INVALID_TAG = "INVALID_TAG"
+"""A line with a tag containing characters other than letters, digits and underscores"""
+
+CODE_LEVEL_JUMP = "LEVEL_JUMP"
+"""A line more than one level higher than the previous line"""
+
+CODE_MISSING_NEWLINE = "MISSING_NEWLINE"
+"""A line without line break, usually the last line of a file"""
+
+FIX_ACCEPT = "ACCEPT"
+"""Keep the line as it is"""
+
+FIX_CLAMP = "CLAMP"
+"""Lower the level of the line to one higher than the previous line"""
+
+FIX_CONCATENATE = "CONC"
+"""Append the line to the value of the previous line, using a `CONC` element"""
+
+FIX_CONTINUE = "CONT"
+"""Append the line to the value of the previous line, using a `CONT` element"""
+
+FIX_RAISE = "RAISE"
+"""Raise a `gedcom.parser.GedcomFormatViolationError`, just like with `strict=True`"""
+
+FIX_SKIP = "SKIP"
+"""Leave out the line"""
+
+DEFAULT_FIXES = {
+    CODE_CONTINUATION_WITHOUT_TAG: FIX_CONCATENATE,
+    CODE_INVALID_TAG: FIX_ACCEPT,
+    CODE_LEVEL_JUMP: FIX_CLAMP,
+    CODE_MISSING_NEWLINE: FIX_ACCEPT,
+}
+"""Fixes applied to each problem, unless configured otherwise"""
+
+FIXES = {
+    CODE_CONTINUATION_WITHOUT_TAG: (FIX_CONCATENATE, FIX_CONTINUE, FIX_SKIP, FIX_RAISE),
+    CODE_INVALID_TAG: (FIX_ACCEPT, FIX_SKIP, FIX_RAISE),
+    CODE_LEVEL_JUMP: (FIX_CLAMP, FIX_SKIP, FIX_RAISE),
+    CODE_MISSING_NEWLINE: (FIX_ACCEPT, FIX_SKIP, FIX_RAISE),
+}
+"""Fixes available for each problem"""
+
+DEFAULT_MAXIMUM_DIAGNOSTICS = 1000
+
+
+class Recovery(object):
+    """Fixes applied to malformed lines while parsing, and the problems found
+
+    Only the first `maximum_diagnostics` problems are kept as diagnostics, while all of them are counted.
+
+    :type fixes: dict of str
+    :type maximum_diagnostics: int
+    """
+
+    def __init__(self, fixes=None, maximum_diagnostics=DEFAULT_MAXIMUM_DIAGNOSTICS):
+        self.__fixes = dict(DEFAULT_FIXES)
+        for code, fix in (fixes or {}).items():
+            if fix not in FIXES.get(code, ()):
+                raise ValueError("Fix %s isn't available for %s" % (fix, code))
+            self.__fixes[code] = fix
+        self.__maximum_diagnostics = maximum_diagnostics
+        self.__diagnostics = []
+        self.__counts = {}
+
+    def get_fix(self, code):
+        """Returns the fix applied to the given problem
+        :type code: str
+        :rtype: str
+        """
+        return self.__fixes[code]
+
+    def report(self, line_number, code, line):
+        """Reports a malformed line, returning the fix to apply
+        :type line_number: int
+        :type code: str
+        :type line: str
+        :rtype: str
+        """
+        fix = self.__fixes[code]
+        self.__counts[code] = self.__counts.get(code, 0) + 1
+        if len(self.__diagnostics) < self.__maximum_diagnostics:
+            message = "%s (%s): %r" % (code, fix, line[:80])
+            self.__diagnostics.append(Diagnostic(line_number, SEVERITY_WARNING, code, message))
+        return fix
+
+    def get_diagnostics(self):
+        """Returns the first problems found, in the order of their lines
+        :rtype: list of Diagnostic
+        """
+        return self.__diagnostics
+
+    def get_counts(self):
+        """Returns the number of problems found, by their code
+        :rtype: dict of int
+        """
+        return self.__counts
+
+    def get_count(self):
+        """Returns the total number of problems found
+        :rtype: int
+        """
+        return sum(self.__counts.values())
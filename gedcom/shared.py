@@ -0,0 +1,583 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Sharing parsed records between processes through a flat, read-only buffer.
+
+The records are written once into a buffer holding a table of all elements, a table of records,
+a sorted table of pointers and a table of unique strings. The buffer contains no addresses, only
+positions within itself, so it may live in `multiprocessing.shared_memory` or in a file mapped into
+memory by any number of processes. Each of them pays for the memory only once.
+
+Attached processes read the buffer through views, which are created on access and behave like
+frozen elements, including `gedcom.element.individual.IndividualElement` and
+`gedcom.element.family.FamilyElement`. A `gedcom.parser.Parser` may use them by
+`gedcom.parser.Parser.load_shared()`:
+
+```python
+# In the process parsing the file
+shared_memory = gedcom.shared.create_shared_memory(gedcom_parser.get_root_child_elements(), name='family')
+
+# In each worker
+gedcom_parser = Parser()
+gedcom_parser.load_shared(gedcom.shared.attach_shared_memory('family'))
+```
+
+The creating process should `close()` and `unlink()` the shared memory when it isn't needed anymore.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from gedcom.element.element import Element, FrozenElementError
+from gedcom.element.family import FamilyElement
+from gedcom.element.file import FileElement
+from gedcom.element.individual import IndividualElement
+from gedcom.element.object import ObjectElement
+import gedcom.tags
+
+MAGIC = b'GEDSHM01'
+"""First bytes of each buffer, including the version of the format"""
+
+# magic, element count, record count, pointer count, tag count, and the offsets of the
+# element, record, pointer, tag and string tables
+_HEADER = struct.Struct('<8sQQQQQQQQQ')
+
+# level, parent, end of descendants, tag, pointer, value, line break
+_ELEMENT = struct.Struct('<iiIIQQB')
+
+_RECORD = struct.Struct('<I')
+
+# pointer, element
+_POINTER = struct.Struct('<QI')
+
+_TAG = struct.Struct('<Q')
+
+_LENGTH = struct.Struct('<I')
+
+_CRLFS = ("\n", "\r\n", "\r", "\n\r")
+
+
+def _serialize(records):
+    """Returns the parts of the buffer holding the given records, as a list of bytes-like objects
+    :type records: list of Element
+    :rtype: list
+    """
+    levels = array('i')
+    parents = array('i')
+    ends = array('I')
+    tags = array('I')
+    pointers = array('Q')
+    values = array('Q')
+    crlfs = array('B')
+
+    strings = bytearray(_LENGTH.pack(0))
+    string_offsets = {"": 0}
+    tag_numbers = {}
+    record_indexes = array('I')
+    pointer_entries = []
+
+    def add_string(string):
+        offset = string_offsets.get(string)
+        if offset is None:
+            offset = len(strings)
+            data = string.encode('utf-8')
+            strings.extend(_LENGTH.pack(len(data)))
+            strings.extend(data)
+            string_offsets[string] = offset
+        return offset
+
+    open_elements = [-1]
+    for record in records:
+        stack = [(record, -1)]
+        while stack:
+            element, parent = stack.pop()
+            index = len(levels)
+
+            # Close the elements which aren't ancestors of this element
+            while open_elements[-1] != parent:
+                ends[open_elements.pop()] = index
+            open_elements.append(index)
+
+            tag = element.get_tag()
+            if tag not in tag_numbers:
+                tag_numbers[tag] = len(tag_numbers)
+            crlf = element.get_crlf()
+
+            levels.append(element.get_level())
+            parents.append(parent)
+            ends.append(0)
+            tags.append(tag_numbers[tag])
+            pointers.append(add_string(element.get_pointer() or ""))
+            values.append(add_string(element.get_value() or ""))
+            crlfs.append(_CRLFS.index(crlf) if crlf in _CRLFS else 0)
+
+            if parent == -1:
+                record_indexes.append(index)
+                if element.get_pointer():
+                    pointer_entries.append((element.get_pointer().encode('utf-8'), pointers[index], index))
+
+            stack.extend((child, index) for child in reversed(element.get_child_elements()))
+
+    while len(open_elements) > 1:
+        ends[open_elements.pop()] = len(levels)
+
+    element_table = bytearray(_ELEMENT.size * len(levels))
+    for index in range(len(levels)):
+        _ELEMENT.pack_into(element_table, index * _ELEMENT.size, levels[index], parents[index], ends[index],
+                           tags[index], pointers[index], values[index], crlfs[index])
+
+    pointer_entries.sort()
+    pointer_table = bytearray(_POINTER.size * len(pointer_entries))
+    for number, (_, offset, index) in enumerate(pointer_entries):
+        _POINTER.pack_into(pointer_table, number * _POINTER.size, offset, index)
+
+    tag_table = bytearray(_TAG.size * len(tag_numbers))
+    for tag, number in tag_numbers.items():
+        _TAG.pack_into(tag_table, number * _TAG.size, add_string(tag))
+
+    if sys.byteorder != 'little':  # pragma: no cover
+        record_indexes.byteswap()
+
+    elements_offset = _HEADER.size
+    records_offset = elements_offset + len(element_table)
+    pointers_offset = records_offset + _RECORD.size * len(record_indexes)
+    tags_offset = pointers_offset + len(pointer_table)
+    strings_offset = tags_offset + len(tag_table)
+
+    header = _HEADER.pack(MAGIC, len(levels), len(record_indexes), len(pointer_entries), len(tag_numbers),
+                          elements_offset, records_offset, pointers_offset, tags_offset, strings_offset)
+    return [header, element_table, record_indexes.tobytes(), pointer_table, tag_table, strings]
+
+
+def _copy_parts(parts, buffer):
+    """Copies the parts of a buffer into the given writable buffer"""
+    offset = 0
+    for part in parts:
+        buffer[offset:offset + len(part)] = part
+        offset += len(part)
+
+
+def get_size(parts):
+    """Returns the total size of the given parts in bytes"""
+    return sum(len(part) for part in parts)
+
+
+def create_shared_memory(records, name=None):
+    """Writes the records into a new block of shared memory, returning it
+
+    Other processes attach to it by its name, see `attach_shared_memory()`.
+
+    :type records: list of Element
+    :type name: str
+    :rtype: multiprocessing.shared_memory.SharedMemory
+    """
+    from multiprocessing.shared_memory import SharedMemory
+    parts = _serialize(records)
+    shared_memory = SharedMemory(name=name, create=True, size=max(1, get_size(parts)))
+    _copy_parts(parts, shared_memory.buf)
+    return shared_memory
+
+
+def attach_shared_memory(name):
+    """Attaches to a block of shared memory written by `create_shared_memory()`, returning its records
+    :type name: str
+    :rtype: SharedTree
+    """
+    from multiprocessing.shared_memory import SharedMemory
+    if sys.version_info >= (3, 13):
+        shared_memory = SharedMemory(name=name, track=False)
+    else:
+        shared_memory = SharedMemory(name=name)
+        # Otherwise the shared memory would be removed as soon as this process exits
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(getattr(shared_memory, '_name', '/' + name), "shared_memory")
+    return SharedTree(shared_memory.buf, shared_memory)
+
+
+def write_file(records, file_path):
+    """Writes the records into a file, which may be mapped into memory by `open_file()`
+    :type records: list of Element
+    :type file_path: str
+    """
+    with open(file_path, 'wb') as shared_file:
+        for part in _serialize(records):
+            shared_file.write(part)
+
+
+def open_file(file_path):
+    """Maps a file written by `write_file()` into memory, returning its records
+    :type file_path: str
+    :rtype: SharedTree
+    """
+    with open(file_path, 'rb') as shared_file:
+        mapped_file = mmap.mmap(shared_file.fileno(), 0, access=mmap.ACCESS_READ)
+    return SharedTree(memoryview(mapped_file), mapped_file)
+
+
+class SharedTree(object):
+    """Read-only records within a buffer written by `create_shared_memory()` or `write_file()`
+
+    :type buffer: memoryview
+    :type owner: object
+    """
+
+    def __init__(self, buffer, owner=None):
+        header = _HEADER.unpack_from(buffer, 0)
+        if header[0] != MAGIC:
+            raise ValueError("Buffer doesn't contain records written by gedcom.shared")
+
+        self.__buffer = buffer
+        self.__owner = owner
+        (_, self.__element_count, self.__record_count, self.__pointer_count, tag_count, self.__elements_offset,
+         self.__records_offset, self.__pointers_offset, self.__tags_offset, self.__strings_offset) = header
+        tags_offset = self.__tags_offset
+        self.__tags = [self.get_string(_TAG.unpack_from(buffer, tags_offset + number * _TAG.size)[0])
+                       for number in range(tag_count)]
+        self.__root_element = SharedRootElement(self)
+
+    def close(self):
+        """Releases the buffer, after which no element may be read anymore"""
+        self.__buffer.release()
+        if self.__owner is not None:
+            self.__owner.close()
+
+    def get_memory_report(self):
+        """Returns the size of the buffer and of each of its tables in bytes, and the number of elements and records
+
+        The buffer is shared by all processes attached to it, so its memory is paid only once.
+
+        :rtype: dict
+        """
+        return {
+            "total_bytes": len(self.__buffer),
+            "table_bytes": {
+                "header": self.__elements_offset,
+                "elements": self.__records_offset - self.__elements_offset,
+                "records": self.__pointers_offset - self.__records_offset,
+                "pointers": self.__tags_offset - self.__pointers_offset,
+                "tags": self.__strings_offset - self.__tags_offset,
+                "strings": len(self.__buffer) - self.__strings_offset,
+            },
+            "element_count": self.__element_count,
+            "record_count": self.__record_count,
+        }
+
+    def get_string(self, offset):
+        """Returns the string at the given offset of the string table
+        :type offset: int
+        :rtype: str
+        """
+        start = self.__strings_offset + offset + _LENGTH.size
+        length = _LENGTH.unpack_from(self.__buffer, start - _LENGTH.size)[0]
+        return str(self.__buffer[start:start + length], 'utf-8')
+
+    def get_entry(self, index):
+        """Returns the entry of an element: (level, parent, end, tag, pointer, value, line break)
+        :type index: int
+        :rtype: tuple
+        """
+        level, parent, end, tag, pointer, value, crlf = _ELEMENT.unpack_from(
+            self.__buffer, self.__elements_offset + index * _ELEMENT.size
+        )
+        return level, parent, end, self.__tags[tag], pointer, value, _CRLFS[crlf]
+
+    def get_element(self, index):
+        """Returns a view of the element at the given position
+        :type index: int
+        :rtype: SharedElement
+        """
+        if index < 0:
+            return self.__root_element
+        entry = self.get_entry(index)
+        return _ELEMENT_CLASSES.get(entry[3], SharedElement)(self, index, entry)
+
+    def get_root_element(self):
+        """Returns a view of the virtual root element, containing all records
+        :rtype: SharedRootElement
+        """
+        return self.__root_element
+
+    def get_element_count(self):
+        """Returns the number of elements
+        :rtype: int
+        """
+        return self.__element_count
+
+    def get_record_count(self):
+        """Returns the number of records
+        :rtype: int
+        """
+        return self.__record_count
+
+    def get_record_index(self, number):
+        """Returns the position of the element of the record with the given number
+        :type number: int
+        :rtype: int
+        """
+        return _RECORD.unpack_from(self.__buffer, self.__records_offset + number * _RECORD.size)[0]
+
+    def get_pointer_count(self):
+        """Returns the number of records identified by a pointer
+        :rtype: int
+        """
+        return self.__pointer_count
+
+    def get_pointer_entry(self, number):
+        """Returns the pointer with the given number, in sorted order, and the position of its element
+        :type number: int
+        :rtype: tuple
+        """
+        offset, index = _POINTER.unpack_from(self.__buffer, self.__pointers_offset + number * _POINTER.size)
+        return self.get_string(offset), index
+
+    def get_pointer_bytes(self, number):
+        """Returns the encoded pointer with the given number, used for searching the sorted pointers
+        :type number: int
+        :rtype: bytes
+        """
+        offset = _POINTER.unpack_from(self.__buffer, self.__pointers_offset + number * _POINTER.size)[0]
+        start = self.__strings_offset + offset + _LENGTH.size
+        return bytes(self.__buffer[start:start + _LENGTH.unpack_from(self.__buffer, start - _LENGTH.size)[0]])
+
+    def get_records(self):
+        """Returns a sequence of views of all records
+        :rtype: SharedRecordList
+        """
+        return SharedRecordList(self)
+
+    def get_elements(self):
+        """Returns a sequence of views of all elements, in the order of the file
+        :rtype: SharedElementList
+        """
+        return SharedElementList(self)
+
+    def get_pointer_dictionary(self):
+        """Returns a mapping of the pointers of all records to views of them
+        :rtype: SharedPointerDictionary
+        """
+        return SharedPointerDictionary(self)
+
+
+class SharedRecordList(Sequence):
+    """Read-only sequence of views of all records of a `SharedTree`"""
+
+    def __init__(self, tree):
+        self.__tree = tree
+
+    def __len__(self):
+        return self.__tree.get_record_count()
+
+    def __getitem__(self, number):
+        if isinstance(number, slice):
+            return [self[item] for item in range(*number.indices(len(self)))]
+        if number < 0:
+            number += len(self)
+        if not 0 <= number < len(self):
+            raise IndexError(number)
+        return self.__tree.get_element(self.__tree.get_record_index(number))
+
+
+class SharedElementList(Sequence):
+    """Read-only sequence of views of all elements of a `SharedTree`, in the order of the file"""
+
+    def __init__(self, tree):
+        self.__tree = tree
+
+    def __len__(self):
+        return self.__tree.get_element_count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.__tree.get_element(index)
+
+
+class SharedPointerDictionary(Mapping):
+    """Read-only mapping of pointers to views of the records of a `SharedTree`
+
+    The pointers are searched within the sorted pointer table of the buffer, so no dictionary is built.
+    """
+
+    def __init__(self, tree):
+        self.__tree = tree
+
+    def __getitem__(self, pointer):
+        if not isinstance(pointer, str):
+            raise KeyError(pointer)
+        key = pointer.encode('utf-8')
+        count = self.__tree.get_pointer_count()
+        number = bisect_left(_PointerKeys(self.__tree), key, 0, count)
+        if number < count and self.__tree.get_pointer_bytes(number) == key:
+            return self.__tree.get_element(self.__tree.get_pointer_entry(number)[1])
+        raise KeyError(pointer)
+
+    def __iter__(self):
+        for number in range(self.__tree.get_pointer_count()):
+            yield self.__tree.get_pointer_entry(number)[0]
+
+    def __len__(self):
+        return self.__tree.get_pointer_count()
+
+
+class _PointerKeys(object):
+    """Sorted encoded pointers of a `SharedTree`, indexable for `bisect`"""
+
+    def __init__(self, tree):
+        self.__tree = tree
+
+    def __getitem__(self, number):
+        return self.__tree.get_pointer_bytes(number)
+
+    def __len__(self):
+        return self.__tree.get_pointer_count()
+
+
+class SharedElement(Element):
+    """Read-only view of an element within a `SharedTree`
+
+    Views are created on access, so the same element may be represented by several views,
+    which are equal to each other. Changing a view raises a
+    `gedcom.element.element.FrozenElementError`.
+    """
+
+    def __init__(self, tree, index, entry):
+        self.__tree = tree
+        self.__index = index
+        self.__entry = entry
+
+    def __eq__(self, other):
+        return isinstance(other, SharedElement) and self.__tree is other.__tree and self.__index == other.__index
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.__tree), self.__index))
+
+    def get_level(self):
+        return self.__entry[0]
+
+    def get_pointer(self):
+        return self.__tree.get_string(self.__entry[4])
+
+    def get_tag(self):
+        return self.__entry[3]
+
+    def get_value(self):
+        return self.__tree.get_string(self.__entry[5])
+
+    def get_crlf(self):
+        return self.__entry[6]
+
+    def get_child_elements(self):
+        children = []
+        index = self.__index + 1
+        while index < self.__entry[2]:
+            child = self.__tree.get_element(index)
+            children.append(child)
+            index = child.__entry[2]
+        return tuple(children)
+
+    def get_parent_element(self):
+        return self.__tree.get_element(self.__entry[1])
+
+    def is_modified(self):
+        return False
+
+    def get_source_span(self):
+        return None
+
+    def is_frozen(self):
+        return True
+
+    def freeze(self):
+        pass
+
+    def __raise_frozen(self, *arguments, **keyword_arguments):
+        raise FrozenElementError("Element %s is shared and can't be changed" % self.get_tag())
+
+    set_pointer = __raise_frozen
+    set_value = __raise_frozen
+    set_multi_line_value = __raise_frozen
+    new_child_element = __raise_frozen
+    add_child_element = __raise_frozen
+    remove_child_element = __raise_frozen
+    set_parent_element = __raise_frozen
+    mark_modified = __raise_frozen
+    set_source_span = __raise_frozen
+
+
+class SharedRootElement(SharedElement):
+    """Read-only view of the virtual root element of a `SharedTree`, containing all records"""
+
+    def __init__(self, tree):
+        super(SharedRootElement, self).__init__(tree, -1, (-1, -1, tree.get_element_count(), "ROOT", 0, 0, "\n"))
+        self.__tree = tree
+
+    def get_pointer(self):
+        return ""
+
+    def get_value(self):
+        return ""
+
+    def get_child_elements(self):
+        return self.__tree.get_records()
+
+    def get_parent_element(self):
+        return None
+
+
+class SharedIndividualElement(SharedElement, IndividualElement):
+    pass
+
+
+class SharedFamilyElement(SharedElement, FamilyElement):
+    pass
+
+
+class SharedFileElement(SharedElement, FileElement):
+    pass
+
+
+class SharedObjectElement(SharedElement, ObjectElement):
+    pass
+
+
+_ELEMENT_CLASSES = {
+    gedcom.tags.GEDCOM_TAG_INDIVIDUAL: SharedIndividualElement,
+    gedcom.tags.GEDCOM_TAG_FAMILY: SharedFamilyElement,
+    gedcom.tags.GEDCOM_TAG_FILE: SharedFileElement,
+    gedcom.tags.GEDCOM_TAG_OBJECT: SharedObjectElement,
+}
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Statistics about a single parse of GEDCOM data, collected when parsing with `stats=True`.
+
+```python
+gedcom_parser.parse_file('family.ged', stats=True)
+stats = gedcom_parser.get_stats()
+print(stats.get_lines_per_second(), stats.get_phase_seconds())
+```
+"""
+
+PHASE_DECODE = "decode"
+"""Decoding the bytes of each line"""
+
+PHASE_TOKENIZE = "tokenize"
+"""Splitting each line into level, pointer, tag and value, including recovery from malformed lines"""
+
+PHASE_CONSTRUCT = "construct"
+"""Creating the element of each line"""
+
+PHASE_LINK = "link"
+"""Adding each element to its parent and keeping track of records"""
+
+PHASES = (PHASE_DECODE, PHASE_TOKENIZE, PHASE_CONSTRUCT, PHASE_LINK)
+
+
+class ParseStats(object):
+    """Statistics about a single parse, see `gedcom.parser.Parser.get_stats()`
+
+    :type lines: int
+    :type byte_count: int
+    :type seconds: float
+    :type phase_seconds: dict of float
+    :type tag_counts: dict of int
+    :type maximum_depth: int
+    :type records: int
+    :type cancelled: bool
+    """
+
+    def __init__(self, lines, byte_count, seconds, phase_seconds, tag_counts, maximum_depth, records,
+                 cancelled=False):
+        self.__lines = lines
+        self.__byte_count = byte_count
+        self.__seconds = seconds
+        self.__phase_seconds = phase_seconds
+        self.__tag_counts = tag_counts
+        self.__maximum_depth = maximum_depth
+        self.__records = records
+        self.__cancelled = cancelled
+
+    def get_lines(self):
+        """Returns the number of lines read
+        :rtype: int
+        """
+        return self.__lines
+
+    def get_byte_count(self):
+        """Returns the number of bytes read
+        :rtype: int
+        """
+        return self.__byte_count
+
+    def get_seconds(self):
+        """Returns the time spent parsing, in seconds
+        :rtype: float
+        """
+        return self.__seconds
+
+    def get_lines_per_second(self):
+        """Returns the number of lines parsed per second
+        :rtype: float
+        """
+        if self.__seconds == 0:
+            return 0.0
+        return self.__lines / self.__seconds
+
+    def get_phase_seconds(self):
+        """Returns the time spent within each of the `PHASES`, in seconds
+        :rtype: dict of float
+        """
+        return self.__phase_seconds
+
+    def get_tag_counts(self):
+        """Returns the number of elements by their tag
+        :rtype: dict of int
+        """
+        return self.__tag_counts
+
+    def get_maximum_depth(self):
+        """Returns the highest level of all elements
+        :rtype: int
+        """
+        return self.__maximum_depth
+
+    def get_records(self):
+        """Returns the number of records parsed
+        :rtype: int
+        """
+        return self.__records
+
+    def is_cancelled(self):
+        """Checks if parsing was cancelled by a hook before the end of the data
+        :rtype: bool
+        """
+        return self.__cancelled
+
+    def to_dict(self):
+        """Returns all statistics as a dictionary of plain values, ready to be serialized
+        :rtype: dict
+        """
+        return {
+            "lines": self.__lines,
+            "bytes": self.__byte_count,
+            "seconds": self.__seconds,
+            "lines_per_second": self.get_lines_per_second(),
+            "phase_seconds": dict(self.__phase_seconds),
+            "tag_counts": dict(self.__tag_counts),
+            "maximum_depth": self.__maximum_depth,
+            "records": self.__records,
+            "cancelled": self.__cancelled,
+        }
+
+
+def merge_stats(parse_stats):
+    """Returns the statistics of parsing all parts of the data, like the chunks of a file parsed in parallel
+
+    Counts and seconds are added up, so the seconds of parts parsed in parallel exceed the time
+    actually passed.
+
+    :type parse_stats: collections.Iterable[ParseStats]
+    :rtype: ParseStats
+    """
+    lines = 0
+    byte_count = 0
+    seconds = 0.0
+    phase_seconds = dict.fromkeys(PHASES, 0.0)
+    tag_counts = {}
+    maximum_depth = 0
+    records = 0
+    cancelled = False
+
+    for stats in parse_stats:
+        lines += stats.get_lines()
+        byte_count += stats.get_byte_count()
+        seconds += stats.get_seconds()
+        for phase, seconds_of_phase in stats.get_phase_seconds().items():
+            phase_seconds[phase] = phase_seconds.get(phase, 0.0) + seconds_of_phase
+        for tag, count in stats.get_tag_counts().items():
+            tag_counts[tag] = tag_counts.get(tag, 0) + count
+        maximum_depth = max(maximum_depth, stats.get_maximum_depth())
+        records += stats.get_records()
+        cancelled = cancelled or stats.is_cancelled()
+
+    return ParseStats(lines, byte_count, seconds, phase_seconds, tag_counts, maximum_depth, records, cancelled)
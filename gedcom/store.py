@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Out-of-core storage of records within an SQLite database.
+
+Files too large to be held in memory may be parsed into a store instead of a tree of elements.
+Records are loaded from the store on demand and only a bounded number of them is cached:
+
+```python
+from gedcom.parser import Parser
+
+gedcom_parser = Parser()
+gedcom_parser.parse_file('huge.ged', store='huge.sqlite')
+
+# Loads only the individual and the families it belongs to
+individual = gedcom_parser.get_element_dictionary()['@I1@']
+parents = gedcom_parser.get_parents(individual)
+```
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from functools import partial
+import sqlite3
+import weakref
+from gedcom.parser import DEFAULT_CACHE_SIZE
+
+DEFAULT_BATCH_SIZE = 10000
+"""Number of records inserted at once while filling a `SqliteStore`"""
+
+
+class SqliteStore(object):
+    """Records stored within an SQLite database, loaded on demand
+
+    Each record is stored as GEDCOM formatted text, together with its position, pointer and tag.
+    Loaded records are kept within a least recently used cache of `cache_size` records.
+    Records evicted from the cache remain available as long as they are referenced elsewhere.
+    Modified records get written back when they are evicted from the cache or when `flush()` is called.
+    Records modified after being evicted are kept in memory until `flush()` is called.
+    """
+
+    def __init__(self, database_path, parse_record, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        :type database_path: str
+        :type parse_record: callable
+        :type cache_size: int
+        """
+        self.__connection = sqlite3.connect(database_path)
+        self.__parse_record = parse_record
+        self.__cache_size = cache_size
+        self.__cache = OrderedDict()
+        self.__loaded = weakref.WeakValueDictionary()
+        self.__modified = {}
+        self.__size = None
+        self.__element_starts = None
+
+    def fill(self, records, batch_size=DEFAULT_BATCH_SIZE):
+        """Replaces all stored records with the given ones, inserting them in batches of `batch_size` records
+        :type records: collections.Iterable[Element]
+        :type batch_size: int
+        """
+        self.__cache.clear()
+        self.__loaded.clear()
+        self.__modified.clear()
+        self.__size = None
+        self.__element_starts = None
+
+        with self.__connection:
+            self.__connection.execute("DROP TABLE IF EXISTS records")
+            self.__connection.execute("CREATE TABLE records (position INTEGER PRIMARY KEY, pointer TEXT,"
+                                      " tag TEXT NOT NULL, data TEXT NOT NULL, elements INTEGER NOT NULL)")
+
+            rows = []
+            for position, record in enumerate(records):
+                rows.append((position, record.get_pointer() or None, record.get_tag(), record.to_gedcom_string(True),
+                             count_elements(record)))
+                if len(rows) >= batch_size:
+                    self.__connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?)", rows)
+                    rows = []
+            self.__connection.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?)", rows)
+
+            self.__connection.execute("CREATE INDEX records_pointer ON records (pointer)")
+
+    def __len__(self):
+        if self.__size is None:
+            self.__size = self.__connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        return self.__size
+
+    def __cache_record(self, position, record):
+        self.__cache[position] = record
+        while len(self.__cache) > self.__cache_size:
+            evicted_position, evicted_record = self.__cache.popitem(last=False)
+            if evicted_record.is_modified():
+                self.__write(evicted_position, evicted_record)
+                evicted_record.mark_modified(False)
+
+    def __mark_modified(self, position, record):
+        """Keeps a modified record until it's written back, since it may be evicted in the meantime
+        :type position: int
+        :type record: Element
+        """
+        self.__modified[position] = record
+
+    def __write(self, position, record):
+        self.__modified.pop(position, None)
+        self.__element_starts = None
+        with self.__connection:
+            self.__connection.execute("UPDATE records SET pointer = ?, tag = ?, data = ?, elements = ?"
+                                      " WHERE position = ?",
+                                      (record.get_pointer() or None, record.get_tag(),
+                                       record.to_gedcom_string(True), count_elements(record), position))
+
+    def flush(self):
+        """Writes all modified records back into the database"""
+        modified = self.__modified
+        self.__modified = {}
+        for position, record in modified.items():
+            if record.is_modified():
+                self.__write(position, record)
+                record.mark_modified(False)
+
+    def close(self):
+        """Writes all modified records back and closes the database"""
+        self.flush()
+        self.__cache.clear()
+        self.__loaded.clear()
+        self.__modified.clear()
+        self.__connection.close()
+
+    def get_record(self, position):
+        """Returns the record at the given position
+        :type position: int
+        :rtype: Element
+        """
+        record = self.__cache.get(position)
+        if record is not None:
+            self.__cache.move_to_end(position)
+            return record
+
+        record = self.__loaded.get(position)
+        if record is None:
+            row = self.__connection.execute("SELECT data FROM records WHERE position = ?", (position,)).fetchone()
+            if row is None:
+                raise IndexError("Record index out of range")
+            record = self.__parse_record(row[0])
+            record.set_modified_callback(partial(self.__mark_modified, position))
+            self.__loaded[position] = record
+
+        self.__cache_record(position, record)
+        return record
+
+    def __get_element_starts(self):
+        """Returns the number of elements before each record, followed by the number of all elements
+
+        Modified records get written back first, so their elements are counted as they are now.
+
+        :rtype: list of int
+        """
+        if self.__modified:
+            self.flush()
+        if self.__element_starts is None:
+            element_starts = [0]
+            for row in self.__connection.execute("SELECT elements FROM records ORDER BY position"):
+                element_starts.append(element_starts[-1] + row[0])
+            self.__element_starts = element_starts
+        return self.__element_starts
+
+    def count_elements(self):
+        """Returns the number of elements of all records
+        :rtype: int
+        """
+        return self.__get_element_starts()[-1]
+
+    def find_element(self, index):
+        """Returns the position of the record containing the element at the given index among all elements,
+        and the index of the element within the record, formatted as a tuple: (`int` position, `int` index)
+        :type index: int
+        :rtype: tuple
+        """
+        element_starts = self.__get_element_starts()
+        position = bisect_right(element_starts, index) - 1
+        return position, index - element_starts[position]
+
+    def get_position(self, pointer):
+        """Returns the position of the record identified by the given pointer, or `None`
+        :type pointer: str
+        :rtype: int
+        """
+        row = self.__connection.execute("SELECT position FROM records WHERE pointer = ? ORDER BY position LIMIT 1",
+                                        (pointer,)).fetchone()
+        return None if row is None else row[0]
+
+    def get_pointers(self):
+        """Returns each distinct pointer of the records, in the same order as they first appeared in the file
+        :rtype: collections.Iterable[str]
+        """
+        for row in self.__connection.execute("SELECT pointer FROM records WHERE pointer IS NOT NULL"
+                                             " GROUP BY pointer ORDER BY MIN(position)"):
+            yield row[0]
+
+    def count_pointers(self):
+        """Returns the number of distinct pointers of the records, see `SqliteStore.get_pointers()`
+        :rtype: int
+        """
+        return self.__connection.execute("SELECT COUNT(DISTINCT pointer) FROM records").fetchone()[0]
+
+
+def count_elements(record):
+    """Returns the number of elements of a record, including the record itself
+    :type record: Element
+    :rtype: int
+    """
+    count = 0
+    stack = [record]
+    while stack:
+        count += 1
+        stack.extend(stack.pop().get_child_elements())
+    return count
+
+
+def iter_elements(record):
+    """Yields the elements of a record, including the record itself, in the order of the file
+    :type record: Element
+    :rtype: collections.Iterable[Element]
+    """
+    stack = [record]
+    while stack:
+        element = stack.pop()
+        yield element
+        stack.extend(reversed(element.get_child_elements()))
+
+
+class StoredRecordList(Sequence):
+    """Read-only list of all records within a `SqliteStore`"""
+
+    def __init__(self, store):
+        """:type store: SqliteStore"""
+        self.__store = store
+
+    def __len__(self):
+        return len(self.__store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Record index out of range")
+        return self.__store.get_record(index)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.__store.get_record(position)
+
+
+class StoredElementList(Sequence):
+    """Read-only list of all elements of all records within a `SqliteStore`, in the order of the file
+
+    Only the records containing the accessed elements get loaded.
+    """
+
+    def __init__(self, store):
+        """:type store: SqliteStore"""
+        self.__store = store
+
+    def __len__(self):
+        return self.__store.count_elements()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Element index out of range")
+        position, element_index = self.__store.find_element(index)
+        for element in iter_elements(self.__store.get_record(position)):
+            if element_index == 0:
+                return element
+            element_index -= 1
+
+    def __iter__(self):
+        for record in StoredRecordList(self.__store):
+            for element in iter_elements(record):
+                yield element
+
+
+class StoredRecordDictionary(Mapping):
+    """Read-only dictionary of all records having a pointer within a `SqliteStore`, keyed by their pointer
+
+    Of records sharing a pointer, only the first one is part of the dictionary.
+    """
+
+    def __init__(self, store):
+        """:type store: SqliteStore"""
+        self.__store = store
+
+    def __getitem__(self, pointer):
+        position = self.__store.get_position(pointer)
+        if position is None:
+            raise KeyError(pointer)
+        return self.__store.get_record(position)
+
+    def __contains__(self, pointer):
+        return self.__store.get_position(pointer) is not None
+
+    def __iter__(self):
+        return self.__store.get_pointers()
+
+    def __len__(self):
+        return self.__store.count_pointers()
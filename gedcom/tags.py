@@ -39,6 +39,16 @@ GEDCOM_PROGRAM_DEFINED_TAG_FREL = "_FREL"
 
 Relationship to a father."""
 
+GEDCOM_TAG_AUTHOR = "AUTH"
+"""Value: `AUTH`
+
+The name of the individual who created or compiled information."""
+
+GEDCOM_TAG_BAPTISM = "BAPM"
+"""Value: `BAPM`
+
+The event of baptism (not LDS), performed in infancy or later."""
+
 GEDCOM_TAG_BIRTH = "BIRT"
 """Value: `BIRT`
 
@@ -65,6 +75,11 @@ GEDCOM_TAG_CHILD = "CHIL"
 
 The natural, adopted, or sealed (LDS) child of a father and a mother."""
 
+GEDCOM_TAG_CHRISTENING = "CHR"
+"""Value: `CHR`
+
+The religious event (not LDS) of baptizing and/or naming a child."""
+
 GEDCOM_TAG_CONCATENATION = "CONC"
 """Value: `CONC`
 
@@ -84,6 +99,11 @@ Leading spaces could be important to the formatting of the resultant text. When
 the reader should assume only one delimiter character following the `CONT` tag. Assume that the rest of the leading
 spaces are to be a part of the value."""
 
+GEDCOM_TAG_CREMATION = "CREM"
+"""Value: `CREM`
+
+Disposal of the remains of a person's body by fire."""
+
 GEDCOM_TAG_DATE = "DATE"
 """Value: `DATE`
 
@@ -120,6 +140,11 @@ GEDCOM_TAG_GIVEN_NAME = "GIVN"
 
 A given or earned name used for official identification of a person."""
 
+GEDCOM_TAG_HEADER = "HEAD"
+"""Value: `HEAD`
+
+Identifies information pertaining to an entire GEDCOM transmission."""
+
 GEDCOM_TAG_HUSBAND = "HUSB"
 """Value: `HUSB`
 
@@ -141,6 +166,11 @@ GEDCOM_TAG_NAME = "NAME"
 A word or combination of words used to help identify an individual, title, or other item.
 More than one NAME line should be used for people who were known by multiple names."""
 
+GEDCOM_TAG_NOTE = "NOTE"
+"""Value: `NOTE`
+
+Additional information provided by the submitter for understanding the enclosing data."""
+
 GEDCOM_TAG_OBJECT = "OBJE"
 """Value: `OBJE`
 
@@ -162,6 +192,11 @@ GEDCOM_TAG_PRIVATE = "PRIV"
 
 Flag for private address or event."""
 
+GEDCOM_TAG_REPOSITORY = "REPO"
+"""Value: `REPO`
+
+An institution or person that has the specified item as part of their collection(s)."""
+
 GEDCOM_TAG_SEX = "SEX"
 """Value: `SEX`
 
@@ -172,11 +207,27 @@ GEDCOM_TAG_SOURCE = "SOUR"
 
 The initial or original material from which information was obtained."""
 
+GEDCOM_TAG_SUBMITTER = "SUBM"
+"""Value: `SUBM`
+
+An individual or organization who contributes genealogical data to a file or transfers it to someone else."""
+
 GEDCOM_TAG_SURNAME = "SURN"
 """Value: `SURN`
 
 A family name passed on or used by members of a family."""
 
+GEDCOM_TAG_TITLE = "TITL"
+"""Value: `TITL`
+
+A description of a specific writing or other work, such as the title of a book when used in a source context,
+or a formal designation used by an individual in connection with positions of royalty or other social status."""
+
+GEDCOM_TAG_TRAILER = "TRLR"
+"""Value: `TRLR`
+
+At level 0, specifies the end of a GEDCOM transmission."""
+
 GEDCOM_TAG_WIFE = "WIFE"
 """Value: `WIFE`
 
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+
+# Python GEDCOM Parser
+#
+# Copyright (C) 2018 Damon Brodie (damon.brodie at gmail.com)
+# Copyright (C) 2018-2019 Nicklas Reincke (contact at reynke.com)
+# Copyright (C) 2016 Andreas Oberritter
+# Copyright (C) 2012 Madeleine Price Ball
+# Copyright (C) 2005 Daniel Zappala (zappala at cs.byu.edu)
+# Copyright (C) 2005 Brigham Young University
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+# Further information about the license: http://www.gnu.org/licenses/gpl-2.0.html
+
+"""
+Validation of GEDCOM 5.5 data, collecting all problems instead of stopping at the first one.
+
+The records are walked once. While walking, the child tags of each record are checked against
+the tags allowed for its record type, and all pointers and links between individuals and families
+are noted down. Those get compared to each other at the end, reporting pointers to records which
+don't exist and links which aren't mirrored by the linked record.
+
+```python
+from gedcom.validate import validate_file
+
+for diagnostic in validate_file('family.ged', workers=4):
+    print("%d: %s %s" % (diagnostic.line_number, diagnostic.code, diagnostic.message))
+```
+"""
+
+from collections import namedtuple
+import gedcom.compression
+import gedcom.tags
+from gedcom.helpers import get_record_ranges, is_pointer, iter_file_lines
+
+Diagnostic = namedtuple("Diagnostic", ["line_number", "severity", "code", "message"])
+"""A problem found within GEDCOM data, at the given line number (starting with 1)"""
+
+SEVERITY_ERROR = "ERROR"
+SEVERITY_WARNING = "WARNING"
+
+CODE_DANGLING_POINTER = "DANGLING_POINTER"
+"""A pointer to a record which doesn't exist"""
+
+CODE_DUPLICATE_POINTER = "DUPLICATE_POINTER"
+"""A record with the same pointer as a previous record"""
+
+CODE_MISSING_BACK_REFERENCE = "MISSING_BACK_REFERENCE"
+"""A link between an individual and a family which isn't mirrored by the other record"""
+
+CODE_MISSING_HEADER = "MISSING_HEADER"
+CODE_MISSING_TRAILER = "MISSING_TRAILER"
+
+CODE_MISSING_TAG = "MISSING_TAG"
+"""A record without a required sub-element"""
+
+CODE_TOO_MANY = "TOO_MANY"
+"""A record with more sub-elements of a tag than allowed"""
+
+CODE_UNEXPECTED_TAG = "UNEXPECTED_TAG"
+"""A tag which isn't allowed at this position"""
+
+CODE_WRONG_RECORD_TYPE = "WRONG_RECORD_TYPE"
+"""A pointer to a record of another type than expected, like a `FAMS` pointing to an individual"""
+
+_INDIVIDUAL_EVENTS = (
+    "ADOP", "BAPM", "BARM", "BASM", "BIRT", "BLES", "BURI", "CENS", "CHR", "CHRA", "CONF", "CREM", "DEAT",
+    "EMIG", "EVEN", "FCOM", "GRAD", "IMMI", "NATU", "ORDN", "PROB", "RETI", "WILL"
+)
+_INDIVIDUAL_ATTRIBUTES = (
+    "CAST", "DSCR", "EDUC", "FACT", "IDNO", "NATI", "NCHI", "NMR", "OCCU", "PROP", "RELI", "RESI", "SSN", "TITL"
+)
+_FAMILY_EVENTS = ("ANUL", "CENS", "DIV", "DIVF", "ENGA", "EVEN", "MARB", "MARC", "MARL", "MARR", "MARS", "RESI")
+_COMMON = {"NOTE": (0, None), "REFN": (0, None), "RIN": (0, 1), "CHAN": (0, 1)}
+
+
+def _rules(*parts, **cardinalities):
+    """Allows any number of the tags within `parts` next to the common tags, and the given cardinalities"""
+    rules = dict(_COMMON)
+    for tags in parts:
+        for tag in tags:
+            rules[tag] = (0, None)
+    rules.update(cardinalities)
+    return rules
+
+
+RECORD_RULES = {
+    "HEAD": {
+        "SOUR": (1, 1), "DEST": (0, 1), "DATE": (0, 1), "SUBM": (1, 1), "SUBN": (0, 1), "FILE": (0, 1),
+        "COPR": (0, 1), "GEDC": (1, 1), "CHAR": (1, 1), "LANG": (0, 1), "PLAC": (0, 1), "NOTE": (0, 1)
+    },
+    "INDI": _rules(
+        _INDIVIDUAL_EVENTS, _INDIVIDUAL_ATTRIBUTES,
+        ("NAME", "BAPL", "CONL", "ENDL", "SLGC", "FAMC", "FAMS", "SUBM", "ASSO", "ALIA", "ANCI", "DESI",
+         "SOUR", "OBJE"),
+        RESN=(0, 1), SEX=(0, 1), RFN=(0, 1), AFN=(0, 1)
+    ),
+    "FAM": _rules(
+        _FAMILY_EVENTS, ("CHIL", "SUBM", "SLGS", "SOUR", "OBJE"),
+        RESN=(0, 1), HUSB=(0, 1), WIFE=(0, 1), NCHI=(0, 1)
+    ),
+    "SOUR": _rules(
+        ("REPO", "OBJE"),
+        DATA=(0, 1), AUTH=(0, 1), TITL=(0, 1), ABBR=(0, 1), PUBL=(0, 1), TEXT=(0, 1)
+    ),
+    "REPO": _rules(("EMAIL", "FAX", "WWW"), NAME=(0, 1), ADDR=(0, 1), PHON=(0, 3)),
+    "NOTE": _rules(("CONC", "CONT", "SOUR")),
+    "OBJE": _rules(
+        ("FILE",),
+        FORM=(0, 1), TITL=(0, 1), BLOB=(0, 1), OBJE=(0, 1)
+    ),
+    "SUBM": _rules(
+        ("OBJE", "EMAIL", "FAX", "WWW"),
+        NAME=(1, 1), ADDR=(0, 1), PHON=(0, 3), LANG=(0, 3), RFN=(0, 1)
+    ),
+    "SUBN": _rules(
+        (),
+        SUBM=(0, 1), FAMF=(0, 1), TEMP=(0, 1), ANCE=(0, 1), DESC=(0, 1), ORDI=(0, 1)
+    ),
+    "TRLR": {}
+}
+"""Tags allowed directly below each type of record, with their minimum and maximum count (`None` for any)
+
+Tags starting with an underscore are user defined and always allowed.
+"""
+
+RECORD_POINTER_TAGS = {
+    "FAMC": "FAM",
+    "FAMS": "FAM",
+    "HUSB": "INDI",
+    "WIFE": "INDI",
+    "CHIL": "INDI",
+    "ALIA": "INDI",
+    "ASSO": "INDI",
+    "REPO": "REPO",
+    "SUBM": "SUBM",
+}
+"""Type of the record a pointer is expected to point to, by the tag of the pointing element"""
+
+# Links between individuals and families: (tag within the individual, tag within the family)
+_SPOUSE_LINK = (gedcom.tags.GEDCOM_TAG_FAMILY_SPOUSE, "HUSB/WIFE")
+_CHILD_LINK = (gedcom.tags.GEDCOM_TAG_FAMILY_CHILD, gedcom.tags.GEDCOM_TAG_CHILD)
+
+_Facts = namedtuple("_Facts", [
+    "diagnostics", "line_count", "records", "references", "individual_links", "family_links", "first_tag",
+    "last_tag"
+])
+
+
+def _check_records(records):
+    """Walks the given records once, checking each of them on its own and noting down pointers and links
+
+    Line numbers within the returned facts start with 1 at the first given record.
+
+    :type records: collections.Iterable[Element]
+    :rtype: _Facts
+    """
+    diagnostics = []
+    defined = {}
+    references = []
+    individual_links = {}
+    family_links = {}
+    first_tag = None
+    last_tag = None
+    line_number = 0
+
+    for record in records:
+        line_number += 1
+        record_line_number = line_number
+        tag = record.get_tag()
+        pointer = record.get_pointer()
+
+        if first_tag is None:
+            first_tag = tag
+        last_tag = tag
+
+        rules = RECORD_RULES.get(tag)
+        if rules is None and not tag.startswith('_'):
+            diagnostics.append(Diagnostic(line_number, SEVERITY_WARNING, CODE_UNEXPECTED_TAG,
+                                          "Unknown record type %s" % tag))
+        if pointer:
+            if pointer in defined:
+                diagnostics.append(Diagnostic(line_number, SEVERITY_ERROR, CODE_DUPLICATE_POINTER,
+                                              "Pointer %s already used at line %d" % (pointer, defined[pointer][1])))
+            else:
+                defined[pointer] = (tag, line_number)
+
+        counts = {}
+        # Walk the sub-elements in file order, which keeps the line numbers in step
+        stack = list(reversed(record.get_child_elements()))
+        while stack:
+            element = stack.pop()
+            line_number += 1
+            child_tag = element.get_tag()
+            value = element.get_value()
+
+            if element.get_level() == 1:
+                counts[child_tag] = counts.get(child_tag, 0) + 1
+                if rules is not None and child_tag not in rules and not child_tag.startswith('_'):
+                    diagnostics.append(Diagnostic(line_number, SEVERITY_WARNING, CODE_UNEXPECTED_TAG,
+                                                  "Tag %s not allowed within %s" % (child_tag, tag)))
+                if rules is not None and child_tag in rules and rules[child_tag][1] is not None \
+                        and counts[child_tag] == rules[child_tag][1] + 1:
+                    diagnostics.append(Diagnostic(line_number, SEVERITY_ERROR, CODE_TOO_MANY,
+                                                  "At most %d %s allowed within %s"
+                                                  % (rules[child_tag][1], child_tag, tag)))
+
+                if tag == gedcom.tags.GEDCOM_TAG_INDIVIDUAL and pointer:
+                    if child_tag == _SPOUSE_LINK[0]:
+                        individual_links.setdefault((pointer, value, _SPOUSE_LINK), line_number)
+                    elif child_tag == _CHILD_LINK[0]:
+                        individual_links.setdefault((pointer, value, _CHILD_LINK), line_number)
+                elif tag == gedcom.tags.GEDCOM_TAG_FAMILY and pointer:
+                    if child_tag == gedcom.tags.GEDCOM_TAG_HUSBAND or child_tag == gedcom.tags.GEDCOM_TAG_WIFE:
+                        family_links.setdefault((value, pointer, _SPOUSE_LINK), line_number)
+                    elif child_tag == gedcom.tags.GEDCOM_TAG_CHILD:
+                        family_links.setdefault((value, pointer, _CHILD_LINK), line_number)
+
+            if is_pointer(value):
+                references.append((line_number, child_tag, value))
+
+            stack.extend(reversed(element.get_child_elements()))
+
+        if rules is not None:
+            for child_tag, (minimum, maximum) in rules.items():
+                if minimum > 0 and counts.get(child_tag, 0) < minimum:
+                    diagnostics.append(Diagnostic(record_line_number, SEVERITY_ERROR, CODE_MISSING_TAG,
+                                                  "%s requires %s" % (tag, child_tag)))
+
+    return _Facts(diagnostics, line_number, defined, references, individual_links, family_links, first_tag,
+                  last_tag)
+
+
+def _check_references(facts):
+    """Combines the facts of consecutive chunks of records, checking pointers and links between them
+    :type facts: list of _Facts
+    :rtype: list of Diagnostic
+    """
+    diagnostics = []
+    defined = {}
+    references = []
+    individual_links = {}
+    family_links = {}
+
+    offset = 0
+    for chunk in facts:
+        diagnostics.extend(diagnostic._replace(line_number=diagnostic.line_number + offset)
+                           for diagnostic in chunk.diagnostics)
+        for pointer, (tag, line_number) in chunk.records.items():
+            if pointer in defined:
+                diagnostics.append(Diagnostic(line_number + offset, SEVERITY_ERROR, CODE_DUPLICATE_POINTER,
+                                              "Pointer %s already used at line %d" % (pointer, defined[pointer][1])))
+            else:
+                defined[pointer] = (tag, line_number + offset)
+        references.extend((line_number + offset, tag, value) for line_number, tag, value in chunk.references)
+        for links, chunk_links in ((individual_links, chunk.individual_links), (family_links, chunk.family_links)):
+            for key, line_number in chunk_links.items():
+                links.setdefault(key, line_number + offset)
+        offset += chunk.line_count
+
+    records = [chunk for chunk in facts if chunk.first_tag is not None]
+    if records and records[0].first_tag != gedcom.tags.GEDCOM_TAG_HEADER:
+        diagnostics.append(Diagnostic(1, SEVERITY_ERROR, CODE_MISSING_HEADER, "File doesn't start with HEAD"))
+    if records and records[-1].last_tag != gedcom.tags.GEDCOM_TAG_TRAILER:
+        diagnostics.append(Diagnostic(offset, SEVERITY_ERROR, CODE_MISSING_TRAILER, "File doesn't end with TRLR"))
+
+    for line_number, tag, value in references:
+        if value not in defined:
+            diagnostics.append(Diagnostic(line_number, SEVERITY_ERROR, CODE_DANGLING_POINTER,
+                                          "%s points to %s, which doesn't exist" % (tag, value)))
+        elif tag in RECORD_POINTER_TAGS and defined[value][0] != RECORD_POINTER_TAGS[tag]:
+            diagnostics.append(Diagnostic(line_number, SEVERITY_ERROR, CODE_WRONG_RECORD_TYPE,
+                                          "%s points to %s, which is a %s record instead of %s"
+                                          % (tag, value, defined[value][0], RECORD_POINTER_TAGS[tag])))
+
+    for links, other_links, message in (
+        (individual_links, family_links, "Family %s doesn't list individual %s as %s"),
+        (family_links, individual_links, "Individual %s doesn't list family %s with %s"),
+    ):
+        for key, line_number in links.items():
+            individual, family, (individual_tag, family_tag) = key
+            if key in other_links or defined.get(individual, ("",))[0] != gedcom.tags.GEDCOM_TAG_INDIVIDUAL \
+                    or defined.get(family, ("",))[0] != gedcom.tags.GEDCOM_TAG_FAMILY:
+                continue
+            if links is individual_links:
+                arguments = (family, individual, family_tag)
+            else:
+                arguments = (individual, family, individual_tag)
+            diagnostics.append(Diagnostic(line_number, SEVERITY_ERROR, CODE_MISSING_BACK_REFERENCE,
+                                          message % arguments))
+
+    diagnostics.sort()
+    return diagnostics
+
+
+def validate(parser):
+    """Validates the records of a parser, returning a list of diagnostics ordered by line number
+
+    The line numbers match the lines the records were parsed from, and the lines written by
+    `gedcom.parser.Parser.save_gedcom()` otherwise.
+
+    :type parser: gedcom.parser.Parser
+    :rtype: list of Diagnostic
+    """
+    return _check_references([_check_records(parser.get_root_child_elements())])
+
+
+def _check_chunk(arguments):
+    """Checks the records within a byte range of a file, see `gedcom.helpers.get_record_ranges()`
+    :type arguments: tuple
+    :rtype: _Facts
+    """
+    file_path, start, end, strict = arguments
+    return _check_stream(iter_file_lines(file_path, start, end), strict)
+
+
+def _check_stream(gedcom_stream, strict):
+    """Parses and checks the records of a stream, adding the problems found with `strict=False`
+    :type gedcom_stream: a file stream, or str array of lines with new line at the end
+    :type strict: bool
+    :rtype: _Facts
+    """
+    from gedcom.parser import Parser
+    parser = Parser()
+    facts = _check_records(parser.iter_records(gedcom_stream, strict))
+    if parser.get_recovery() is not None:
+        facts = facts._replace(diagnostics=facts.diagnostics + parser.get_recovery().get_diagnostics())
+    return facts
+
+
+def validate_file(file_path, workers=None, strict=True):
+    """Validates a file without keeping its records, returning a list of diagnostics ordered by line number
+
+    The file is parsed one record at a time. Optionally, the file is split into chunks of records
+    which are parsed and checked by `workers` processes in parallel. Only the pointers and links
+    found within each chunk are sent back and compared to each other at the end.
+
+    Lines violating the GEDCOM format raise a `gedcom.parser.GedcomFormatViolationError`,
+    just like while parsing. With `strict=False` they are fixed and reported as well, see
+    `gedcom.recovery`. The line numbers of other problems count the parsed lines then, so
+    they are off by the lines left out by a fix before them.
+
+    :type file_path: str
+    :type workers: int
+    :type strict: bool
+    :rtype: list of Diagnostic
+    """
+    with open(file_path, 'rb') as gedcom_file:
+        compression = gedcom.compression.detect_compression(gedcom_file.read(6))
+
+    if workers is None or workers < 2 or compression is not None:
+        with gedcom.compression.open_file(file_path) as gedcom_stream:
+            return _check_references([_check_stream(gedcom_stream, strict)])
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = [(file_path, start, end, strict) for start, end in get_record_ranges(file_path, workers * 4)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _check_references(list(executor.map(_check_chunk, chunks)))
@@ -0,0 +1,35 @@
+import io
+
+from gedcom.bench.generator import generate, generate_file
+from gedcom.parser import Parser
+from gedcom.validate import validate_file
+
+
+def test_generate():
+    first_file = io.StringIO()
+    lines = generate(first_file, individuals=500, generations=5, seed=1)
+    second_file = io.StringIO()
+    generate(second_file, individuals=500, generations=5, seed=1)
+    assert first_file.getvalue() == second_file.getvalue()
+    assert len(first_file.getvalue().splitlines()) == lines
+
+    third_file = io.StringIO()
+    generate(third_file, individuals=500, generations=5, seed=2)
+    assert first_file.getvalue() != third_file.getvalue()
+
+
+def test_generate_file(tmp_path):
+    file_path = str(tmp_path / 'synthetic.ged')
+    generate_file(file_path, individuals=300, generations=4, families=20, note_rate=1, pedigree_collapse=1)
+    assert validate_file(file_path) == []
+
+    parser = Parser()
+    parser.parse_file(file_path)
+    records = parser.get_root_child_elements()
+    assert len([record for record in records if record.get_tag() == 'INDI']) == 300
+    assert len([record for record in records if record.get_tag() == 'FAM']) == 60
+
+    individual = parser.get_element_dictionary()['@I300@']
+    assert len(parser.get_ancestors(individual)) == 2 + 4 + 8
+    note = [child for child in individual.get_child_elements() if child.get_tag() == 'NOTE'][0]
+    assert set(child.get_tag() for child in note.get_child_elements()) == {'CONC', 'CONT'}
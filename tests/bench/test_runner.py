@@ -0,0 +1,18 @@
+import json
+
+from gedcom.bench.runner import BENCHMARKS, main, run
+
+
+def test_run():
+    results = run(sizes=[100, 200], repeat=1, generations=3)
+    assert [result["individuals"] for result in results["results"]] == [100, 200]
+    for result in results["results"]:
+        assert sorted(result["benchmarks"]) == sorted(name for name, _ in BENCHMARKS)
+        assert result["benchmarks"]["parse"]["seconds"] > 0
+        assert result["benchmarks"]["parse"]["peak_bytes"] > 0
+
+
+def test_main(tmp_path):
+    output_path = tmp_path / 'results.json'
+    main(["--sizes", "50", "--repeat", "1", "--output", str(output_path)])
+    assert json.loads(output_path.read_text())["results"][0]["individuals"] == 50
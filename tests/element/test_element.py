@@ -4,3 +4,46 @@ from gedcom.element.element import Element
 def test_initialization():
     element = Element(level=-1, pointer="", tag="", value="")
     assert isinstance(element, Element)
+
+
+def test_to_gedcom_string():
+    element = Element(level=0, pointer="@I1@", tag="INDI", value="")
+    birth = element.new_child_element(tag="BIRT")
+    birth.new_child_element(tag="DATE", value="1 JAN 1900")
+    element.new_child_element(tag="SEX", value="M")
+
+    assert element.to_gedcom_string() == "0 @I1@ INDI\n"
+    assert element.to_gedcom_string(True) == "0 @I1@ INDI\n1 BIRT\n2 DATE 1 JAN 1900\n1 SEX M\n"
+
+
+def test_mark_modified():
+    element = Element(level=0, pointer="@I1@", tag="INDI", value="", multi_line=False)
+    birth = Element(level=1, pointer="", tag="BIRT", value="", multi_line=False)
+    element.get_child_elements().append(birth)
+    birth.set_parent_element(element)
+    element.set_source_span(None, 0, 10)
+
+    assert birth.get_record() is element
+    assert not element.is_modified()
+
+    birth.new_child_element(tag="DATE", value="1 JAN 1900")
+    assert element.is_modified()
+    assert birth.is_modified()
+    assert element.get_source_span() == (None, 0, 10)
+
+
+def test_remove_child_element():
+    element = Element(level=0, pointer="@I1@", tag="INDI", value="")
+    birth = element.new_child_element(tag="BIRT")
+    sex = element.new_child_element(tag="SEX", value="M")
+    element.set_source_span(None, 0, 10)
+
+    element.remove_child_element(birth)
+    assert element.get_child_elements() == [sex]
+    assert birth.get_parent_element() is None
+    assert element.is_modified()
+
+    element.set_source_span(None, 0, 10)
+    element.set_pointer("@I2@")
+    assert element.to_gedcom_string() == "0 @I2@ INDI\n"
+    assert element.is_modified()
@@ -0,0 +1,54 @@
+import io
+import json
+
+from gedcom.export.json import element_to_dict, write_json, write_ndjson
+from gedcom.parser import Parser
+
+GEDCOM = """0 @I1@ INDI
+1 NAME Max /Mustermann/
+1 NOTE First line
+2 CONT Second
+2 CONC  line
+0 TRLR
+"""
+
+
+def get_lines():
+    return [(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()]
+
+
+def test_iter_records():
+    records = list(Parser().iter_records(get_lines()))
+
+    assert [record.get_tag() for record in records] == ['INDI', 'TRLR']
+    assert records[0].get_parent_element() is None
+    assert len(records[0].get_child_elements()) == 2
+
+
+def test_element_to_dict():
+    record = next(iter(Parser().iter_records(get_lines())))
+
+    assert element_to_dict(record)["children"][0] == {
+        "level": 1, "pointer": None, "tag": "NAME", "value": "Max /Mustermann/", "children": []
+    }
+    note = element_to_dict(record, fold_multi_line=True)["children"][1]
+    assert note["value"] == "First line\nSecond line"
+    assert note["children"] == []
+
+
+def test_write_ndjson():
+    ndjson_file = io.StringIO()
+    assert write_ndjson(Parser().iter_records(get_lines()), ndjson_file, buffer_size=1) == 2
+
+    lines = ndjson_file.getvalue().splitlines()
+    assert [json.loads(line)["tag"] for line in lines] == ['INDI', 'TRLR']
+    assert json.loads(lines[0])["pointer"] == '@I1@'
+
+
+def test_write_json():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    json_file = io.BytesIO()
+    assert write_json(parser.get_root_child_elements(), json_file) == 34
+    assert len(json.loads(json_file.getvalue().decode('utf-8'))) == 34
@@ -0,0 +1,82 @@
+import io
+import sqlite3
+
+from gedcom.date import get_day
+from gedcom.export.sqlite import write_sqlite
+from gedcom.parser import Parser
+
+
+def test_write_sqlite(tmp_path):
+    database_path = str(tmp_path / 'family.sqlite')
+    assert write_sqlite(Parser().iter_file_records('tests/files/Musterstammbaum.ged'), database_path,
+                        batch_size=10) == 34
+
+    connection = sqlite3.connect(database_path)
+    assert connection.execute("SELECT COUNT(*) FROM individuals").fetchone() == (20,)
+    assert connection.execute("SELECT COUNT(*) FROM families").fetchone() == (11,)
+    assert connection.execute("SELECT COUNT(*) FROM elements").fetchone() == (396,)
+
+    assert connection.execute(
+        "SELECT given_name, surname, sex, birth_date, places.name FROM individuals"
+        " JOIN places ON places.id = individuals.birth_place_id WHERE pointer = '@1@'"
+    ).fetchone() == ('Max', 'Mustermann', 'M', '1 JAN 1980', 'Musterstadt')
+
+    assert connection.execute(
+        "SELECT individual, role FROM family_members WHERE family = '@F10@' ORDER BY individual"
+    ).fetchall() == [('@1@', 'HUSB'), ('@2@', 'WIFE')]
+
+    assert connection.execute(
+        "SELECT record FROM events WHERE tag = 'BIRT' AND first_day = ?", (get_day(1980, 1, 1),)
+    ).fetchall() == [('@1@',)]
+    connection.close()
+
+
+def test_write_sqlite_with_duplicate_and_missing_pointers():
+    gedcom_string = (
+        "0 HEAD\n"
+        "0 @I1@ INDI\n1 NAME John /Doe/\n1 BIRT\n2 DATE 1900\n"
+        "0 @I1@ INDI\n1 NAME Jane /Doe/\n1 BIRT\n2 DATE 1902\n"
+        "0 INDI\n1 NAME Nobody /Doe/\n1 DEAT\n2 PLAC Berlin\n"
+        "0 @F1@ FAM\n1 HUSB @I1@\n1 MARR\n2 DATE 1920\n"
+        "0 @F1@ FAM\n1 WIFE @I1@\n1 CHIL @I2@\n1 MARR\n2 DATE 1930\n"
+        "0 @S1@ SOUR\n1 TITL First\n"
+        "0 @S1@ SOUR\n1 TITL Second\n"
+        "0 TRLR\n"
+    )
+    connection = sqlite3.connect(':memory:')
+    assert write_sqlite(Parser().iter_records(io.BytesIO(gedcom_string.encode('utf-8'))), connection) == 9
+
+    assert connection.execute("SELECT id, pointer, tag FROM records WHERE tag != 'SOUR' ORDER BY id").fetchall() == [
+        (1, None, 'HEAD'), (2, '@I1@', 'INDI'), (3, '@I1@', 'INDI'), (4, None, 'INDI'),
+        (5, '@F1@', 'FAM'), (6, '@F1@', 'FAM'), (9, None, 'TRLR')]
+    assert connection.execute(
+        "SELECT id, pointer, given_name FROM individuals ORDER BY id"
+    ).fetchall() == [(2, '@I1@', 'John'), (3, '@I1@', 'Jane'), (4, None, 'Nobody')]
+    assert connection.execute(
+        "SELECT id, pointer, husband, wife FROM families ORDER BY id"
+    ).fetchall() == [(5, '@F1@', '@I1@', None), (6, '@F1@', None, '@I1@')]
+    assert connection.execute("SELECT id, pointer, title FROM sources ORDER BY id").fetchall() == [
+        (7, '@S1@', 'First'), (8, '@S1@', 'Second')]
+
+    assert connection.execute(
+        "SELECT record_id, record, tag, date, places.name FROM events"
+        " LEFT JOIN places ON places.id = events.place_id ORDER BY events.id"
+    ).fetchall() == [(2, '@I1@', 'BIRT', '1900', None), (3, '@I1@', 'BIRT', '1902', None),
+                     (4, None, 'DEAT', None, 'Berlin'), (5, '@F1@', 'MARR', '1920', None),
+                     (6, '@F1@', 'MARR', '1930', None)]
+    assert connection.execute(
+        "SELECT family_id, individual_id, individual, role FROM family_members ORDER BY family_id, role"
+    ).fetchall() == [(5, 2, '@I1@', 'HUSB'), (6, None, '@I2@', 'CHIL'), (6, 2, '@I1@', 'WIFE')]
+    assert connection.execute(
+        "SELECT individuals.given_name, events.date FROM family_members"
+        " JOIN events ON events.record_id = family_members.family_id AND events.tag = 'MARR'"
+        " JOIN individuals ON individuals.id = family_members.individual_id ORDER BY events.date"
+    ).fetchall() == [('John', '1920'), ('John', '1930')]
+
+    assert connection.execute(
+        "SELECT record_id, COUNT(*) FROM elements WHERE record_id BETWEEN 2 AND 4 GROUP BY record_id"
+    ).fetchall() == [(2, 4), (3, 4), (4, 4)]
+    assert connection.execute(
+        "SELECT COUNT(*) FROM elements WHERE record IS NULL AND level = 0"
+    ).fetchone() == (3,)
+    connection.close()
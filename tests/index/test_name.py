@@ -0,0 +1,38 @@
+from gedcom.index.name import NameIndex
+from gedcom.parser import Parser
+from gedcom.phonetics import cologne_phonetics
+
+GEDCOM = """0 @I1@ INDI
+1 NAME Anna Maria /Meyer/
+0 @I2@ INDI
+1 NAME Hans /Meier/
+1 NAME Johann /Mayr/
+0 @I3@ INDI
+1 NAME
+2 GIVN Jürgen
+2 SURN Müller
+0 TRLR
+"""
+
+
+def test_find_individuals():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()])
+
+    assert isinstance(parser.get_name_index(), NameIndex)
+    assert [individual.get_pointer() for individual in parser.find_individuals(surname="meyer")] == ['@I1@']
+    assert [individual.get_pointer() for individual in parser.find_individuals(surname="Meyer", fuzzy=True)] == \
+        ['@I1@', '@I2@']
+    assert [individual.get_pointer() for individual in parser.find_individuals(surname="Mayr", given_name="Johann")] \
+        == ['@I2@']
+    assert [individual.get_pointer() for individual in parser.find_individuals(given_name="Maria")] == ['@I1@']
+    assert [individual.get_pointer() for individual in parser.find_individuals(surname="MULLER")] == ['@I3@']
+    assert parser.find_individuals(surname="Schmidt", fuzzy=True) == []
+
+
+def test_phonetic_algorithm():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()])
+
+    name_index = NameIndex(parser.get_root_child_elements(), phonetic_algorithm=cologne_phonetics)
+    assert [individual.get_pointer() for individual in name_index.find(surname="Möller", fuzzy=True)] == ['@I3@']
@@ -0,0 +1,41 @@
+from gedcom.index.place import PlaceIndex, get_jurisdictions
+from gedcom.parser import Parser
+
+GEDCOM = """0 @I1@ INDI
+1 BIRT
+2 DATE 1 JAN 1900
+2 PLAC Munich, Bavaria, Germany
+1 DEAT
+2 PLAC Nuremberg, Bavaria, Germany
+0 @I2@ INDI
+1 BIRT
+2 PLAC Munich, Bavaria, Germany
+1 RESI
+2 PLAC Berlin, Germany
+0 TRLR
+"""
+
+
+def test_get_jurisdictions():
+    assert get_jurisdictions("Munich, Bavaria,Germany") == ["germany", "bavaria", "munich"]
+
+
+def test_find_events():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()])
+
+    assert isinstance(parser.get_place_index(), PlaceIndex)
+    assert len(parser.find_events()) == 4
+    assert len(parser.find_events(place_prefix="Bavaria, Germany")) == 3
+    assert len(parser.find_events(place_prefix="bavaria, germany", tags=["BIRT"])) == 2
+    assert [event.get_tag() for event in parser.find_events(place_prefix="Germany")] == ["BIRT", "DEAT", "BIRT", "RESI"]
+    assert parser.find_events(place_prefix="Austria") == []
+
+
+def test_places_are_interned():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()])
+
+    first_place, second_place = [event.get_child_elements()[-1].get_value()
+                                 for event in parser.find_events(place_prefix="Munich, Bavaria, Germany")]
+    assert first_place is second_place
@@ -0,0 +1,131 @@
+import pytest
+from gedcom.index.reference import ReferenceIndex
+from gedcom.parser import Parser, ReferencedRecordError
+
+GEDCOM = """0 HEAD
+0 @I7@ INDI
+1 NAME Max /Mustermann/
+1 FAMS @F3@
+0 @I9@ INDI
+1 NAME Erika /Musterfrau/
+1 FAMS @F3@
+0 @I12@ INDI
+1 NAME Moritz /Mustermann/
+1 FAMC @F3@
+1 SOUR @S1@
+0 @F3@ FAM
+1 HUSB @I7@
+1 WIFE @I9@
+1 CHIL @I12@
+0 @S1@ SOUR
+1 TITL Church book
+0 TRLR
+"""
+
+
+def _parse():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()])
+    return parser
+
+
+def test_reference_index():
+    parser = _parse()
+    reference_index = parser.get_reference_index()
+
+    assert isinstance(reference_index, ReferenceIndex)
+    assert len(reference_index) == 7
+    assert [element.get_tag() for element in reference_index.get_references('@F3@')] == ['FAMS', 'FAMS', 'FAMC']
+    assert reference_index.get_references('@unknown@') == []
+
+    individual = parser.get_element_dictionary()['@I12@']
+    reference_index.remove(individual)
+    assert len(reference_index) == 5
+    assert sorted(reference_index.get_pointers()) == ['@F3@', '@I12@', '@I7@', '@I9@']
+
+    reference_index.add(individual)
+    reference_index.rename({'@F3@': '@F1@'})
+    assert len(reference_index.get_references('@F1@')) == 3
+
+
+def test_remove_record():
+    parser = _parse()
+    assert len(parser.find_individuals(surname='Mustermann')) == 2
+
+    removed = parser.remove_record('@I12@')
+    assert [element.get_tag() for element in removed] == ['CHIL']
+    assert '@I12@' not in parser.get_element_dictionary()
+    assert len(parser.get_root_child_elements()) == 6
+    assert len(parser.get_element_list()) == 13
+    assert len(parser.find_individuals(surname='Mustermann')) == 1
+    assert parser.get_reference_index().get_references('@S1@') == []
+    assert parser.get_element_dictionary()['@F3@'].is_modified()
+
+    with pytest.raises(ReferencedRecordError):
+        parser.remove_record('@F3@', cascade=False)
+    with pytest.raises(KeyError):
+        parser.remove_record('@I12@')
+
+    parser.remove_record('@F3@')
+    assert parser.get_root_element().to_gedcom_string(True) == (
+        "0 HEAD\n0 @I7@ INDI\n1 NAME Max /Mustermann/\n0 @I9@ INDI\n1 NAME Erika /Musterfrau/\n"
+        "0 @S1@ SOUR\n1 TITL Church book\n0 TRLR\n"
+    )
+    parser.remove_record('@S1@', cascade=False)
+    assert len(parser.get_reference_index()) == 0
+
+
+def test_renumber_pointers():
+    parser = _parse()
+    assert parser.renumber_pointers() == {'@I7@': '@I1@', '@I9@': '@I2@', '@I12@': '@I3@', '@F3@': '@F1@'}
+
+    family = parser.get_element_dictionary()['@F1@']
+    assert [child.get_value() for child in family.get_child_elements()] == ['@I1@', '@I2@', '@I3@']
+    assert [parent.get_pointer() for parent in parser.get_parents(parser.get_element_dictionary()['@I3@'])] == [
+        '@I1@', '@I2@'
+    ]
+    assert len(parser.get_reference_index().get_references('@F1@')) == 3
+    assert parser.get_reference_index().get_references('@F3@') == []
+
+    assert parser.renumber_pointers({'@I1@': '@I2@', '@I2@': '@I1@'}) == {'@I1@': '@I2@', '@I2@': '@I1@'}
+    assert parser.get_element_dictionary()['@I2@'].get_name() == ('Max', 'Mustermann')
+    assert [child.get_value() for child in family.get_child_elements()] == ['@I2@', '@I1@', '@I3@']
+
+    with pytest.raises(ValueError):
+        parser.renumber_pointers({'@I1@': '@I3@'})
+    with pytest.raises(ValueError):
+        parser.renumber_pointers(lambda record, number: 'I%d' % number)
+    assert parser.get_element_dictionary()['@I1@'].get_name() == ('Erika', 'Musterfrau')
+
+
+def test_timeline_after_renumbering_and_removing():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    events = parser.get_timeline_index().get_events_in_years(1000, 3000)
+    pointers = set(event.pointer for event in events)
+    assert '@1@' in pointers
+
+    renumbered = parser.renumber_pointers()
+    events = parser.get_timeline_index().get_events_in_years(1000, 3000)
+    assert set(event.pointer for event in events) == set(renumbered.get(pointer, pointer) for pointer in pointers)
+    assert len(parser.find_individuals(surname='Mustermann')) > 0
+
+    parser.remove_record(renumbered['@1@'])
+    events = parser.get_timeline_index().get_events_in_years(1000, 3000)
+    assert renumbered['@1@'] not in set(event.pointer for event in events)
+
+
+def test_remove_record_within_batch():
+    parser = _parse()
+    assert len(parser.get_reference_index()) == 7
+    individual = parser.get_element_dictionary()['@I7@']
+
+    with parser.batch():
+        individual.new_child_element('NOTE', value='@S1@')
+        assert len(parser.remove_record('@S1@')) == 2
+        individual.new_child_element('ASSO', value='@I9@')
+        assert parser.renumber_pointers({'@I9@': '@I2@'}) == {'@I9@': '@I2@'}
+
+    assert [child.get_tag() for child in individual.get_child_elements()] == ['NAME', 'FAMS', 'ASSO']
+    assert individual.get_child_elements()[-1].get_value() == '@I2@'
+    assert len(parser.get_reference_index().get_references('@I2@')) == 2
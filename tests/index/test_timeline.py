@@ -0,0 +1,32 @@
+from gedcom.index.timeline import IntervalTree, TimelineIndex
+from gedcom.parser import Parser
+import gedcom.tags
+
+
+def test_interval_tree():
+    tree = IntervalTree([(1, 5, "a"), (5, 9, "b"), (10, 20, "c")])
+    assert sorted(tree.find_overlapping(5, 5)) == ["a", "b"]
+    assert tree.find_overlapping(21, 30) == []
+    assert sorted(tree.find_overlapping(0, 100)) == ["a", "b", "c"]
+
+
+def test_get_events_in_years():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    timeline_index = parser.get_timeline_index()
+
+    assert isinstance(timeline_index, TimelineIndex)
+
+    events = timeline_index.get_events_in_years(1950, 1960)
+    assert [event.pointer for event in events] == ['@3@', '@9@', '@4@', '@15@', '@16@', '@F6@', '@10@', '@6@']
+
+    marriages = timeline_index.get_events_in_years(1950, 1960, [gedcom.tags.GEDCOM_TAG_MARRIAGE])
+    assert [event.pointer for event in marriages] == ['@F6@']
+
+
+def test_get_alive_individuals_in_years():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    individuals = parser.get_timeline_index().get_alive_individuals_in_years(1900, 1900)
+    assert [individual.get_pointer() for individual in individuals] == ['@13@', '@14@', '@15@', '@16@', '@17@', '@18@']
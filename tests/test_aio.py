@@ -0,0 +1,98 @@
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from gedcom.aio import iter_lines
+from gedcom.parser import Parser
+
+
+class _ChunkReader(object):
+
+    def __init__(self, data, chunk_size):
+        self.__chunks = [data[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.__chunks:
+            raise StopAsyncIteration
+        return self.__chunks.pop(0)
+
+
+class _Writer(object):
+
+    def __init__(self):
+        self.data = io.BytesIO()
+
+    async def write(self, data):
+        self.data.write(data)
+
+
+def _read_file():
+    with open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_file:
+        return gedcom_file.read()
+
+
+def _parse_async(data, chunk_size, **arguments):
+    parser = Parser()
+    asyncio.run(parser.parse_async(_ChunkReader(data, chunk_size), **arguments))
+    return parser
+
+
+async def _collect_lines(reader):
+    return [line async for line in iter_lines(reader)]
+
+
+def test_iter_lines():
+    data = '0 HEAD\n1 NOTE Müller\r\n0 TRLR'.encode('utf-8')
+    for chunk_size in range(1, len(data) + 1):
+        assert asyncio.run(_collect_lines(_ChunkReader(data, chunk_size))) == [
+            b'0 HEAD\n', '1 NOTE Müller\r\n'.encode('utf-8'), b'0 TRLR'
+        ]
+
+
+def test_parse_async():
+    data = _read_file()
+    parser = Parser()
+    parser.parse(io.BytesIO(data))
+    expected = parser.get_root_element().to_gedcom_string(True)
+
+    assert _parse_async(data, 7).get_root_element().to_gedcom_string(True) == expected
+
+    stream_reader_parser = Parser()
+
+    async def parse_stream():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        await stream_reader_parser.parse_async(reader)
+
+    asyncio.run(parse_stream())
+    assert stream_reader_parser.get_root_element().to_gedcom_string(True) == expected
+
+    with ProcessPoolExecutor(1) as executor:
+        executor_parser = _parse_async(data, 1000, executor=executor)
+    assert executor_parser.get_root_element().to_gedcom_string(True) == expected
+    assert executor_parser.get_element_dictionary()['@1@'].get_parent_element() is executor_parser.get_root_element()
+
+
+def test_parse_async_lenient():
+    parser = _parse_async(b'0 HEAD\nbroken\n0 TRLR\n', 5, strict=False)
+    assert len(parser.get_root_child_elements()) == 2
+    assert parser.get_recovery().get_diagnostics()
+
+
+def test_save_gedcom_async():
+    data = _read_file()
+    parser = Parser()
+    parser.parse(io.BytesIO(data))
+
+    writer = _Writer()
+    asyncio.run(parser.save_gedcom_async(writer, buffer_size=100))
+    assert writer.data.getvalue() == parser.get_root_element().to_gedcom_string(True).encode('utf-8')
+
+    file_parser = Parser()
+    file_parser.parse_file('tests/files/Musterstammbaum.ged')
+    writer = _Writer()
+    asyncio.run(file_parser.save_gedcom_async(writer))
+    assert writer.data.getvalue() == data
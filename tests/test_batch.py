@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from gedcom.batch import count_records, parse_many
+from gedcom.parser import GedcomFormatViolationError
+from gedcom.validate import validate
+
+
+def _count_individuals(parser):
+    return count_records(parser).get('INDI', 0)
+
+
+def _write_files(tmp_path):
+    paths = []
+    for number in range(5):
+        path = tmp_path / ('%d.ged' % number)
+        path.write_text('0 HEAD\n' + '0 @I%d@ INDI\n' * number + '0 TRLR\n')
+        paths.append(str(path))
+    broken_path = tmp_path / 'broken.ged'
+    broken_path.write_text('0 HEAD\nbroken\n0 TRLR\n')
+    paths.append(str(broken_path))
+    return paths
+
+
+def test_parse_many(tmp_path):
+    paths = _write_files(tmp_path)
+    results = list(parse_many(paths, func=_count_individuals, chunk_size=2))
+
+    assert [result.path for result in results] == paths
+    assert [result.value for result in results] == [0, 1, 2, 3, 4, None]
+    assert all(result.error is None for result in results[:-1])
+    assert isinstance(results[-1].error, GedcomFormatViolationError)
+
+    results = list(parse_many(paths, func=_count_individuals, chunk_size=2, strict=False))
+    assert results[-1].value == 0
+
+
+def test_parse_many_in_parallel(tmp_path):
+    paths = _write_files(tmp_path)
+    results = {result.path: result for result in parse_many(iter(paths), workers=2, chunk_size=1)}
+
+    assert sorted(results) == sorted(paths)
+    assert results[paths[3]].value == {'HEAD': 1, 'INDI': 3, 'TRLR': 1}
+    assert isinstance(results[paths[-1]].error, GedcomFormatViolationError)
+
+    with ThreadPoolExecutor(2) as executor:
+        results = list(parse_many(['tests/files/Musterstammbaum.ged'] * 3, func=validate, executor=executor))
+        assert [result.value for result in results] == [results[0].value] * 3
+
+
+def _exit_on_broken_file(parser):
+    if len(parser.get_root_child_elements()) == 3:
+        os._exit(1)
+    return _count_individuals(parser)
+
+
+def test_parse_many_with_dying_worker(tmp_path):
+    paths = _write_files(tmp_path)[:-1] * 2
+    results = list(parse_many(paths, workers=2, func=_exit_on_broken_file, chunk_size=2))
+
+    assert sorted(result.path for result in results) == sorted(paths)
+    errors = [result for result in results if result.error is not None]
+    assert [result.path for result in errors] == [paths[1]] * 2
+    assert all(isinstance(result.error, BrokenProcessPool) for result in errors)
+    assert sorted(result.value for result in results if result.error is None) == [0, 0, 2, 2, 3, 3, 4, 4]
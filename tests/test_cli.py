@@ -0,0 +1,110 @@
+import io
+import json
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from gedcom.cli import main
+from gedcom.parser import Parser
+
+FILE_PATH = 'tests/files/Musterstammbaum.ged'
+
+
+def run(*arguments):
+    output = io.StringIO()
+    with pytest.raises(SystemExit) as exit_info:
+        main(list(arguments), output)
+    return exit_info.value.code, output.getvalue()
+
+
+def test_stats():
+    status, output = run('stats', FILE_PATH)
+    stats = json.loads(output)
+    assert status == 0
+    assert stats['elements'] == 396
+    assert stats['records']['INDI'] == 20
+    assert run('stats', FILE_PATH, '--workers', '2') == (status, output)
+
+
+def test_find():
+    status, output = run('find', FILE_PATH, 'surname=Mustermann:birth_range=1900-2000', '--workers', '2')
+    assert status == 0
+    assert output.splitlines()[0] == '@1@\tMax Mustermann'
+    assert run('find', FILE_PATH, 'surname=Nobody')[0] == 1
+
+
+def test_convert(tmp_path):
+    run('convert', FILE_PATH, str(tmp_path / 'output.ndjson'))
+    assert len((tmp_path / 'output.ndjson').read_text().splitlines()) == 34
+
+    run('convert', FILE_PATH, str(tmp_path / 'output.sqlite'))
+    connection = sqlite3.connect(str(tmp_path / 'output.sqlite'))
+    assert connection.execute('SELECT COUNT(*) FROM individuals').fetchone()[0] == 20
+    connection.close()
+
+    run('convert', FILE_PATH, str(tmp_path / 'output.ged.gz'))
+    parser = Parser()
+    parser.parse_file(str(tmp_path / 'output.ged.gz'))
+    assert len(parser.get_element_list()) == 396
+
+
+def test_validate(tmp_path):
+    assert run('validate', FILE_PATH, '--workers', '2') == (0, '')
+
+    file_path = tmp_path / 'invalid.ged'
+    file_path.write_bytes(b'0 HEAD\n0 @I1@ INDI\n1 FAMS @F1@\n0 TRLR\n')
+    status, output = run('validate', str(file_path))
+    assert status == 1
+    assert '3: ERROR DANGLING_POINTER' in output
+
+
+def test_extract(tmp_path):
+    output_path = tmp_path / 'extract.ged'
+    assert run('extract', FILE_PATH, str(output_path), '@3@', '--include', 'ancestors', '--generations', '1')[0] == 0
+    parser = Parser()
+    parser.parse_file(str(output_path))
+    assert sorted(parser.get_element_dictionary()) == ['@3@', '@5@', '@6@', '@F1@', '@SUBM@']
+
+    assert run('extract', FILE_PATH, str(output_path), '@X@')[0] == 2
+
+
+def test_lazy_imports():
+    modules = subprocess.check_output([
+        sys.executable, '-c', 'import sys, gedcom.cli; print(" ".join(sorted(sys.modules)))'
+    ]).decode().split()
+    assert 'gedcom.parser' not in modules
+    assert 'sqlite3' not in modules
+
+    modules = subprocess.check_output([
+        sys.executable, '-c', 'import sys, gedcom.parser; print(" ".join(sorted(sys.modules)))'
+    ]).decode().split()
+    for module in ('sqlite3', 'difflib', 'tracemalloc', 'gedcom.store', 'gedcom.duplicates', 'gedcom.memory'):
+        assert module not in modules
+
+
+@pytest.mark.parametrize('arguments', [
+    ['stats'],
+    ['stats', '--workers', '2'],
+    ['find', 'surname=Mustermann', '--workers', '2'],
+    ['convert', 'OUTPUT.ndjson'],
+    ['convert', 'OUTPUT.ged'],
+    ['extract', 'OUTPUT.ged', '@3@'],
+])
+def test_profile(tmp_path, capsys, arguments):
+    arguments = [arguments[0], FILE_PATH] + [argument.replace('OUTPUT', str(tmp_path / 'output'))
+                                             for argument in arguments[1:]] + ['--profile']
+    assert run(*arguments)[0] == 0
+
+    profile = json.loads(capsys.readouterr().err)
+    assert profile['command'] == arguments[0]
+    assert profile['parse']['records'] == 34
+    assert profile['parse']['lines'] == 396
+    assert profile['parse']['tag_counts']['INDI'] == 20
+    assert set(profile['parse']['phase_seconds']) == {'decode', 'tokenize', 'construct', 'link'}
+
+
+def test_profile_without_parse_statistics(capsys):
+    assert run('validate', FILE_PATH, '--profile')[0] == 0
+    assert sorted(json.loads(capsys.readouterr().err)) == ['command', 'seconds']
@@ -0,0 +1,30 @@
+import pytest
+
+from gedcom.compression import (COMPRESSION_BZIP2, COMPRESSION_GZIP, COMPRESSION_XZ, detect_compression,
+                                get_compression_from_path, open_file)
+from gedcom.parser import Parser
+
+
+def test_get_compression_from_path():
+    assert get_compression_from_path("family.ged.gz") == COMPRESSION_GZIP
+    assert get_compression_from_path("family.GED.XZ") == COMPRESSION_XZ
+    assert get_compression_from_path("family.ged") is None
+
+
+@pytest.mark.parametrize("compression", [COMPRESSION_GZIP, COMPRESSION_BZIP2, COMPRESSION_XZ])
+def test_save_and_parse_compressed_file(tmp_path, compression):
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    file_path = str(tmp_path / 'family.ged')
+    parser.save_file(file_path, compression=compression, compression_level=1)
+
+    with open(file_path, 'rb') as compressed_file:
+        assert detect_compression(compressed_file.read(8)) == compression
+
+    with open_file(file_path) as decompressed_file, open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_file:
+        assert decompressed_file.read() == gedcom_file.read()
+
+    compressed_parser = Parser()
+    compressed_parser.parse_file(file_path)
+    assert len(compressed_parser.get_element_list()) == 396
@@ -0,0 +1,21 @@
+import datetime
+
+from gedcom.date import MAXIMUM_DAY, MINIMUM_DAY, get_date_range, get_day, get_year_range
+
+
+def test_get_day():
+    for date in (datetime.date(1, 1, 1), datetime.date(1582, 10, 15), datetime.date(1900, 3, 1),
+                 datetime.date(2000, 2, 29)):
+        assert get_day(date.year, date.month, date.day) == date.toordinal()
+
+
+def test_get_date_range():
+    assert get_date_range("1 JAN 1900") == (get_day(1900, 1, 1), get_day(1900, 1, 1))
+    assert get_date_range("FEB 1900") == (get_day(1900, 2, 1), get_day(1900, 2, 28))
+    assert get_date_range("ABT 1900") == get_year_range(1900)
+    assert get_date_range("BEF 1900") == (MINIMUM_DAY, get_day(1900, 1, 1) - 1)
+    assert get_date_range("AFT 1900") == (get_day(1901, 1, 1), MAXIMUM_DAY)
+    assert get_date_range("BET 1900 AND 1910") == get_year_range(1900, 1910)
+    assert get_date_range("@#DJULIAN@ 4 OCT 1582")[0] == get_day(1582, 10, 15) - 1
+    assert get_date_range("31 FEB 1900") is None
+    assert get_date_range("(unknown)") is None
@@ -0,0 +1,65 @@
+from gedcom.diff import CHANGE_ADDED, CHANGE_MODIFIED, CHANGE_REMOVED, diff, get_record_hashes
+from gedcom.parser import Parser
+
+OLD_GEDCOM = """0 HEAD
+0 @I1@ INDI
+1 NAME Max /Mustermann/
+1 BIRT
+2 DATE 1 JAN 1980
+1 CHAN
+2 DATE 1 JAN 2020
+0 @I2@ INDI
+1 NAME Erika /Mustermann/
+0 @I3@ INDI
+1 NAME Hans /Muster/
+0 TRLR
+"""
+
+NEW_GEDCOM = """0 HEAD
+0 @I2@ INDI
+1 NAME Erika /Mustermann/
+0 @I1@ INDI
+1 NAME Max /Mustermann/
+1 BIRT
+2 DATE 2 JAN 1980
+1 OCCU Baker
+1 CHAN
+2 DATE 1 FEB 2020
+0 @I4@ INDI
+1 NAME Anna /Muster/
+0 TRLR
+"""
+
+
+def parse(gedcom):
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in gedcom.splitlines()])
+    return parser
+
+
+def test_get_record_hashes():
+    hashes = get_record_hashes(parse(OLD_GEDCOM).get_root_child_elements())
+    assert list(hashes) == ["HEAD[0]", "@I1@", "@I2@", "@I3@", "TRLR[0]"]
+    assert hashes["@I2@"] == get_record_hashes(parse(NEW_GEDCOM).get_root_child_elements())["@I2@"]
+
+
+def test_diff():
+    result = diff(parse(OLD_GEDCOM), parse(NEW_GEDCOM))
+
+    assert [record.get_pointer() for record in result.added] == ["@I4@"]
+    assert [record.get_pointer() for record in result.removed] == ["@I3@"]
+    assert [record_change.key for record_change in result.modified] == ["@I1@"]
+    assert [(change.kind, change.path) for change in result.modified[0].changes] == [
+        (CHANGE_MODIFIED, "@I1@/BIRT[0]/DATE[0]"),
+        (CHANGE_ADDED, "@I1@/OCCU[0]"),
+        (CHANGE_MODIFIED, "@I1@/CHAN[0]/DATE[0]"),
+    ]
+
+
+def test_diff_ignoring_changes():
+    result = diff(parse(NEW_GEDCOM), parse(OLD_GEDCOM), ignore_changes=True)
+
+    assert [(change.kind, change.path) for change in result.modified[0].changes] == [
+        (CHANGE_MODIFIED, "@I1@/BIRT[0]/DATE[0]"),
+        (CHANGE_REMOVED, "@I1@/OCCU[0]"),
+    ]
@@ -0,0 +1,53 @@
+from gedcom.duplicates import DuplicateCandidate, get_blocking_key
+from gedcom.parser import Parser
+
+GEDCOM = """0 @I1@ INDI
+1 NAME Johann /Meyer/
+1 SEX M
+1 BIRT
+2 DATE 3 MAR 1851
+2 PLAC Musterstadt
+0 @I2@ INDI
+1 NAME Johan /Meier/
+1 SEX M
+1 BIRT
+2 DATE 1852
+2 PLAC Musterstadt
+0 @I3@ INDI
+1 NAME Johanna /Meyer/
+1 SEX F
+1 BIRT
+2 DATE 1851
+0 @I4@ INDI
+1 NAME Karl /Schmidt/
+1 SEX M
+1 BIRT
+2 DATE 1851
+0 TRLR
+"""
+
+
+def parse():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8-sig') for line in GEDCOM.splitlines()])
+    return parser
+
+
+def test_get_blocking_key():
+    individual = parse().get_element_dictionary()['@I1@']
+    assert get_blocking_key(individual) == ('M600', 185, 'M')
+
+
+def test_find_duplicate_candidates():
+    candidates = parse().find_duplicate_candidates()
+
+    assert len(candidates) == 1
+    assert isinstance(candidates[0], DuplicateCandidate)
+    assert candidates[0].first.get_pointer() == '@I1@'
+    assert candidates[0].second.get_pointer() == '@I2@'
+    assert 0.8 <= candidates[0].score < 1
+
+
+def test_find_duplicate_candidates_in_parallel():
+    parser = parse()
+    assert parser.find_duplicate_candidates(workers=2) == parser.find_duplicate_candidates()
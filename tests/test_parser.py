@@ -1,6 +1,15 @@
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import gedcom.parser
+from gedcom.element.element import FrozenElementError
 from gedcom.element.individual import IndividualElement
 from gedcom.element.root import RootElement
-from gedcom.parser import Parser
+from gedcom.parser import EXTRACT_ANCESTORS, EXTRACT_DESCENDANTS, FrozenParserError, Parser
 
 
 def test_initialization():
@@ -101,3 +110,275 @@ def test_parse_from_string():
 def test___parse_line():
     # @TODO Add appropriate testing cases
     pass
+
+
+def test_write_gedcom():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    with open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_file:
+        expected = gedcom_file.read().decode('utf-8-sig')
+
+    text_file = io.StringIO()
+    parser.save_gedcom(text_file)
+    assert text_file.getvalue() == expected
+
+    binary_file = io.BytesIO()
+    parser.write_gedcom(binary_file, buffer_size=64)
+    assert binary_file.getvalue().decode('utf-8-sig') == expected
+
+
+def test_write_gedcom_copies_unmodified_records(tmp_path):
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    with open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_file:
+        expected = gedcom_file.read()
+
+    output_path = tmp_path / 'output.ged'
+    with open(output_path, 'wb') as output_file:
+        parser.write_gedcom(output_file)
+    assert output_path.read_bytes() == expected
+
+    individual = parser.get_element_dictionary()['@1@']
+    assert not individual.is_modified()
+    individual.get_child_elements()[1].set_value('Moritz /Mustermann/')
+    assert individual.is_modified()
+
+    binary_file = io.BytesIO()
+    parser.write_gedcom(binary_file)
+    assert binary_file.getvalue() == expected.replace(b'1 NAME Max /', b'1 NAME Moritz /')
+
+
+def test_extract():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    individual = parser.get_element_dictionary()['@3@']
+
+    records = parser.extract([individual], EXTRACT_ANCESTORS, generations=1)
+    assert [record.get_tag() for record in (records[0], records[-1])] == ['HEAD', 'TRLR']
+    assert [record.get_pointer() for record in records[1:-1]] == ['@3@', '@F1@', '@5@', '@6@', '@SUBM@']
+
+    records = parser.extract([individual], EXTRACT_DESCENDANTS)
+    assert [record.get_pointer() for record in records[1:-1]] == [
+        '@3@', '@F8@', '@4@', '@1@', '@F10@', '@2@', '@SUBM@'
+    ]
+
+    records = parser.extract([individual])
+    assert len(records) == 2 + 1 + 9 + 5 + 1
+    assert parser.extract([individual], 'both') == records
+    assert parser.extract([individual], 'ancestors', generations=1) == \
+        parser.extract([individual], EXTRACT_ANCESTORS, generations=1)
+    with pytest.raises(ValueError):
+        parser.extract([individual], 'parents')
+
+    binary_file = io.BytesIO()
+    parser.write_gedcom(binary_file, records=parser.extract([individual], EXTRACT_ANCESTORS, generations=1))
+    binary_file.seek(0)
+
+    extract_parser = Parser()
+    extract_parser.parse(binary_file)
+    grandfather = extract_parser.get_element_dictionary()['@5@']
+    assert [child.get_value() for child in grandfather.get_child_elements() if child.get_tag() == 'FAMS'] == ['@F1@']
+    assert '@F8@' not in binary_file.getvalue().decode('utf-8-sig')
+
+
+def test_parse_stats():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    assert parser.get_stats() is None
+
+    parser.parse_file('tests/files/Musterstammbaum.ged', stats=True)
+    stats = parser.get_stats().to_dict()
+    assert stats['lines'] == 396
+    assert stats['bytes'] == os.path.getsize('tests/files/Musterstammbaum.ged')
+    assert stats['records'] == 34
+    assert stats['maximum_depth'] == 3
+    assert stats['tag_counts']['INDI'] == 20
+    assert sorted(stats['phase_seconds']) == ['construct', 'decode', 'link', 'tokenize']
+    assert not stats['cancelled']
+    assert len(parser.get_element_list()) == 396
+
+    records = parser.iter_file_records('tests/files/Musterstammbaum.ged', stats=True)
+    assert sum(1 for _ in records) == 34
+    timings = ('seconds', 'lines_per_second', 'phase_seconds')
+    assert {key: value for key, value in parser.get_stats().to_dict().items() if key not in timings} == {
+        key: value for key, value in stats.items() if key not in timings}
+    assert sum(1 for _ in parser.iter_file_records('tests/files/Musterstammbaum.ged')) == 34
+    assert parser.get_stats() is None
+
+
+def test_parse_hooks():
+    records = []
+    progress = []
+
+    def on_record(record):
+        records.append(record.get_pointer())
+        return len(records) < 3
+
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged', stats=True, on_record=on_record,
+                      on_progress=lambda lines, byte_count: progress.append(lines))
+    assert records == ['', '@1@', '@2@']
+    assert [record.get_pointer() for record in parser.get_root_child_elements()] == records
+    assert parser.get_stats().is_cancelled()
+    assert progress == []
+
+    parser.parse_file('tests/files/Musterstammbaum.ged', on_progress=lambda lines, byte_count: progress.append(lines))
+    assert progress == [396]
+    assert parser.get_stats() is None
+
+
+def test_memory_report():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    report = parser.memory_report()
+    assert sum(totals['count'] for totals in report['by_tag'].values()) == 396
+    assert sum(totals['count'] for totals in report['by_record_type'].values()) == 396
+    assert report['by_tag']['INDI']['count'] == 20
+    assert sum(totals['bytes'] for totals in report['by_tag'].values()) == \
+        report['element_bytes'] + report['string_bytes'] + report['children_bytes']
+    empty_dictionary_bytes = report['cache_bytes']['element_dictionary']
+
+    parser.get_element_dictionary()
+    report = parser.memory_report(verify=True)
+    assert report['cache_bytes']['element_dictionary'] > empty_dictionary_bytes
+    verification = report['verification']
+    assert abs(verification['estimated_bytes'] - verification['measured_bytes']) < verification['measured_bytes'] * 0.1
+
+
+def test_freeze():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    parser.freeze()
+    assert parser.is_frozen()
+
+    individual = parser.get_element_dictionary()['@1@']
+    assert individual.is_frozen()
+    assert isinstance(individual.get_child_elements(), tuple)
+    assert isinstance(parser.get_element_list(), tuple)
+    with pytest.raises(FrozenElementError):
+        individual.set_value('Changed')
+    with pytest.raises(FrozenElementError):
+        individual.new_child_element('NOTE', value='Changed')
+    with pytest.raises(TypeError):
+        parser.get_element_dictionary()['@X@'] = individual
+    with pytest.raises(FrozenParserError):
+        parser.invalidate_cache()
+    with pytest.raises(FrozenParserError):
+        parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    def read():
+        for _ in range(20):
+            for element in parser.get_element_list():
+                if isinstance(element, IndividualElement):
+                    parser.get_parents(element)
+            parser.find_individuals(surname='Mustermann')
+        return len(parser.get_ancestors(individual))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(lambda _: read(), range(8))) == [read()] * 8
+
+
+def test_incremental():
+    with open('tests/files/Musterstammbaum.ged', 'rb') as gedcom_file:
+        data = gedcom_file.read()
+    parser = Parser()
+    parser.parse(io.BytesIO(data))
+
+    completed = []
+    incremental_parser = Parser.incremental(on_record=completed.append)
+    records = []
+    for start in range(0, len(data), 5):
+        records.extend(incremental_parser.feed(data[start:start + 5]))
+        assert len(records) == len(completed)
+    assert len(records) == 33
+    records.extend(incremental_parser.close())
+
+    assert records == completed
+    assert records == incremental_parser.get_parser().get_root_child_elements()
+    assert ''.join(record.to_gedcom_string(True) for record in records) == \
+        parser.get_root_element().to_gedcom_string(True)
+    assert incremental_parser.get_parser().get_element_dictionary()['@1@'].get_name() == ('Max', 'Mustermann')
+
+    with pytest.raises(ValueError):
+        incremental_parser.feed(b'0 TRLR\n')
+
+
+def test_incremental_without_keeping_records():
+    data = '0 HEAD\n0 @I1@ INDI\n1 NAME Jörg /Müller/\r\n0 TRLR\n'.encode('utf-8')
+    incremental_parser = Parser.incremental(keep=False)
+
+    records = []
+    for byte in range(len(data)):
+        records.extend(incremental_parser.feed(data[byte:byte + 1]))
+        assert len(incremental_parser.get_parser().get_root_child_elements()) <= 1
+    records.extend(incremental_parser.close())
+
+    assert [record.get_tag() for record in records] == ['HEAD', 'INDI', 'TRLR']
+    assert records[1].get_name() == ('Jörg', 'Müller')
+    assert records[1].get_parent_element() is None
+    assert incremental_parser.get_parser().get_root_child_elements() == []
+
+
+def test_iter_records_shares_recent_places(monkeypatch):
+    monkeypatch.setattr(gedcom.parser, 'PLACE_CACHE_SIZE', 2)
+    lines = [b'0 HEAD\n']
+    for number, place in enumerate(['Berlin', 'Hamburg', 'Berlin', 'Munich', 'Hamburg']):
+        lines.extend([b'0 @I%d@ INDI\n' % number, b'1 BIRT\n', b'2 PLAC ' + place.encode('utf-8') + b'\n'])
+    lines.append(b'0 TRLR\n')
+
+    parser = Parser()
+    places = [record.get_child_elements()[0].get_child_elements()[0].get_value()
+              for record in parser.iter_records(lines) if record.get_tag() == 'INDI']
+    assert places == ['Berlin', 'Hamburg', 'Berlin', 'Munich', 'Hamburg']
+    assert places[2] is places[0]
+    assert places[4] is not places[1]
+    assert parser.memory_report()['cache_bytes']['places'] == sys.getsizeof({})
+
+
+def test_batch():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    original = parser.get_root_element().to_gedcom_string(True)
+    individual = parser.get_element_dictionary()['@1@']
+    element_count = len(parser.get_element_list())
+    assert not individual.is_modified()
+
+    with parser.batch():
+        individual.new_child_element('OCCU', value='Baker')
+        record = parser.get_root_element().new_child_element('INDI', pointer='@new@')
+        record.new_child_element('NAME', value='New /Person/')
+        assert parser.get_element_dictionary()['@new@'] is record
+        parser.renumber_pointers({'@1@': '@one@'})
+        assert parser.get_element_dictionary()['@one@'] is individual
+        with parser.batch():
+            parser.get_root_element().remove_child_element(record)
+        assert '@new@' not in parser.get_element_dictionary()
+
+    assert len(parser.get_element_list()) == element_count + 1
+    assert individual.is_modified()
+    assert parser.get_reference_index().get_references('@1@') == []
+
+    with pytest.raises(KeyError):
+        with parser.batch():
+            individual.set_multi_line_value('x' * 300)
+            parser.remove_record('@2@')
+            parser.get_root_element().new_child_element('INDI', pointer='@other@')
+            parser.get_element_dictionary()['@other@'].set_pointer('@3@')
+            raise KeyError('@unknown@')
+
+    assert parser.get_element_dictionary()['@2@'].get_pointer() == '@2@'
+    assert '@other@' not in parser.get_element_dictionary()
+    assert individual.get_value() == ''
+    assert len(parser.get_element_list()) == element_count + 1
+
+    with pytest.raises(ValueError):
+        with parser.batch():
+            parser.renumber_pointers({'@one@': '@1@'})
+            individual.get_child_elements()[-1].set_value('Butcher')
+            raise ValueError()
+
+    individual.get_child_elements().pop()
+    assert parser.get_root_element().to_gedcom_string(True) == original.replace('@1@', '@one@')
+    assert not parser.get_element_dictionary()['@2@'].is_modified()
@@ -0,0 +1,25 @@
+from gedcom.phonetics import cologne_phonetics, fold_accents, normalize, soundex
+
+
+def test_fold_accents():
+    assert fold_accents("Müller") == "muller"
+    assert fold_accents("Strauß") == "strauss"
+    assert fold_accents("Ørsted") == "orsted"
+
+
+def test_normalize():
+    assert normalize(" Müller-Lüdenscheidt ") == "muller ludenscheidt"
+
+
+def test_soundex():
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Tymczak") == "T522"
+    assert soundex("Meyer") == soundex("Meier") == soundex("Mayr")
+    assert soundex("") == ""
+
+
+def test_cologne_phonetics():
+    assert cologne_phonetics("Wikipedia") == "3412"
+    assert cologne_phonetics("Müller-Lüdenscheidt") == "65752682"
+    assert cologne_phonetics("Meyer") == cologne_phonetics("Meier") == cologne_phonetics("Mayr") == "67"
@@ -0,0 +1,91 @@
+import pytest
+
+from gedcom.parser import GedcomFormatViolationError, Parser
+from gedcom.recovery import CODE_CONTINUATION_WITHOUT_TAG, CODE_INVALID_TAG, CODE_LEVEL_JUMP, \
+    CODE_MISSING_NEWLINE, FIX_CONTINUE, FIX_RAISE, FIX_SKIP, Recovery
+from gedcom.validate import validate_file
+
+LINES = [
+    b'0 HEAD\n',
+    b'0 @I1@ INDI\n',
+    b'1 NAME Max /Mustermann/\n',
+    b'1 NOTE First line\n',
+    b'second line\n',
+    b'1 BIRTH-PLACE Berlin\n',
+    b'3 DATE 1 JAN 1900\n',
+    b'0 TRLR',
+]
+
+
+def test_parse_with_default_fixes():
+    parser = Parser()
+    with pytest.raises(GedcomFormatViolationError):
+        parser.parse(LINES)
+
+    parser.parse(LINES, strict=False)
+    individual = parser.get_element_dictionary()['@I1@']
+    assert [(child.get_level(), child.get_tag(), child.get_value()) for child in parser.get_element_list()[3:]] == [
+        (1, 'NOTE', 'First line'),
+        (2, 'CONC', 'second line'),
+        (1, 'BIRTH-PLACE', 'Berlin'),
+        (2, 'DATE', '1 JAN 1900'),
+        (0, 'TRLR', ''),
+    ]
+    assert individual.get_child_elements()[1].get_multi_line_value() == 'First linesecond line'
+    assert parser.get_element_list()[4].get_pointer() == ''
+
+    recovery = parser.get_recovery()
+    assert [(diagnostic.line_number, diagnostic.code) for diagnostic in recovery.get_diagnostics()] == [
+        (5, CODE_CONTINUATION_WITHOUT_TAG),
+        (6, CODE_INVALID_TAG),
+        (7, CODE_LEVEL_JUMP),
+        (8, CODE_MISSING_NEWLINE),
+    ]
+
+
+def test_parse_with_configured_fixes():
+    recovery = Recovery(fixes={
+        CODE_CONTINUATION_WITHOUT_TAG: FIX_CONTINUE,
+        CODE_INVALID_TAG: FIX_SKIP,
+        CODE_LEVEL_JUMP: FIX_SKIP,
+    }, maximum_diagnostics=2)
+    parser = Parser()
+    parser.parse(LINES, strict=False, recovery=recovery)
+    assert [element.get_tag() for element in parser.get_element_list()[3:]] == ['NOTE', 'CONT', 'DATE', 'TRLR']
+    assert len(recovery.get_diagnostics()) == 2
+    assert recovery.get_counts() == {
+        CODE_CONTINUATION_WITHOUT_TAG: 1, CODE_INVALID_TAG: 1, CODE_MISSING_NEWLINE: 1
+    }
+
+    with pytest.raises(GedcomFormatViolationError):
+        parser.parse(LINES, strict=False, recovery=Recovery(fixes={CODE_LEVEL_JUMP: FIX_RAISE}))
+    with pytest.raises(ValueError):
+        Recovery(fixes={CODE_LEVEL_JUMP: FIX_CONTINUE})
+
+
+def test_validate_file(tmp_path):
+    file_path = tmp_path / 'dirty.ged'
+    file_path.write_bytes(b''.join(LINES))
+    diagnostics = validate_file(str(file_path), strict=False)
+    assert [(diagnostic.line_number, diagnostic.code) for diagnostic in diagnostics if diagnostic.line_number > 4] == [
+        (5, CODE_CONTINUATION_WITHOUT_TAG),
+        (6, CODE_INVALID_TAG),
+        (6, 'UNEXPECTED_TAG'),
+        (7, CODE_LEVEL_JUMP),
+        (8, CODE_MISSING_NEWLINE),
+    ]
+
+
+@pytest.mark.parametrize('stats', [False, True])
+def test_write_gedcom_after_skipped_lines(tmp_path, stats):
+    file_path = tmp_path / 'family.ged'
+    file_path.write_bytes(b'0 HEAD\n1 CHAR UTF-8\n0 @N1@ NOTE x\n3 JUNK x\n0 TRLR\n')
+
+    parser = Parser()
+    with open(str(file_path), 'rb') as gedcom_file:
+        parser.parse(gedcom_file, strict=False, recovery=Recovery({CODE_LEVEL_JUMP: FIX_SKIP}), stats=stats)
+    assert parser.get_recovery().get_count() == 1
+
+    output_path = tmp_path / 'output.ged'
+    parser.save_file(str(output_path))
+    assert output_path.read_bytes() == b'0 HEAD\n1 CHAR UTF-8\n0 @N1@ NOTE x\n0 TRLR\n'
@@ -0,0 +1,112 @@
+import io
+import os
+from multiprocessing import get_context
+import pytest
+from gedcom.element.element import FrozenElementError
+from gedcom.element.individual import IndividualElement
+from gedcom.parser import FrozenParserError, Parser
+import gedcom.shared
+
+
+def _count_ancestors(name):
+    tree = gedcom.shared.attach_shared_memory(name)
+    try:
+        parser = Parser()
+        parser.load_shared(tree)
+        individual = parser.get_element_dictionary()['@1@']
+        return len(parser.get_ancestors(individual))
+    finally:
+        tree.close()
+
+
+def _parse():
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged')
+    return parser
+
+
+def test_open_file(tmp_path):
+    parser = _parse()
+    file_path = str(tmp_path / 'family.shared')
+    gedcom.shared.write_file(parser.get_root_child_elements(), file_path)
+
+    shared_parser = Parser()
+    tree = gedcom.shared.open_file(file_path)
+    shared_parser.load_shared(tree)
+
+    assert len(shared_parser.get_root_child_elements()) == 34
+    assert len(shared_parser.get_element_dictionary()) == 32
+    assert len(shared_parser.get_element_list()) == 396
+    assert [element.to_gedcom_string() for element in shared_parser.get_element_list()] == [
+        element.to_gedcom_string() for element in parser.get_element_list()
+    ]
+    assert shared_parser.get_root_element().to_gedcom_string(True) == parser.get_root_element().to_gedcom_string(True)
+
+    individual = shared_parser.get_element_dictionary()['@1@']
+    assert isinstance(individual, IndividualElement)
+    assert individual == shared_parser.get_element_dictionary()['@1@']
+    assert individual.get_child_elements()[0].get_parent_element() == individual
+    assert individual.get_parent_element() == shared_parser.get_root_element()
+    assert [parent.get_name() for parent in shared_parser.get_parents(individual)] == [
+        ('Gudwin', 'Mustermann'), ('Gisela', 'Musterfrau')
+    ]
+    assert '@unknown@' not in shared_parser.get_element_dictionary()
+    assert sorted(shared_parser.get_element_dictionary()) == sorted(parser.get_element_dictionary())
+
+    output = io.StringIO()
+    shared_parser.save_gedcom(output)
+    assert output.getvalue() == parser.get_root_element().to_gedcom_string(True)
+
+    tree.close()
+
+
+def test_shared_elements_are_read_only(tmp_path):
+    file_path = str(tmp_path / 'family.shared')
+    gedcom.shared.write_file(_parse().get_root_child_elements(), file_path)
+
+    parser = Parser()
+    tree = gedcom.shared.open_file(file_path)
+    parser.load_shared(tree)
+    individual = parser.get_element_dictionary()['@1@']
+
+    assert parser.is_frozen()
+    assert individual.is_frozen()
+    with pytest.raises(FrozenElementError):
+        individual.set_value('changed')
+    with pytest.raises(FrozenElementError):
+        individual.new_child_element('OCCU', value='Baker')
+    with pytest.raises(FrozenParserError):
+        parser.parse_file('tests/files/Musterstammbaum.ged')
+
+    tree.close()
+
+
+def test_share_with_other_processes():
+    parser = _parse()
+    shared_memory = parser.share()
+    try:
+        with get_context('spawn').Pool(1) as pool:
+            count = pool.apply(_count_ancestors, (shared_memory.name,))
+        assert count == len(parser.get_ancestors(parser.get_element_dictionary()['@1@']))
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def test_memory_report(tmp_path):
+    file_path = str(tmp_path / 'family.shared')
+    gedcom.shared.write_file(_parse().get_root_child_elements(), file_path)
+
+    parser = Parser()
+    tree = gedcom.shared.open_file(file_path)
+    parser.load_shared(tree)
+
+    report = parser.memory_report()
+    assert report["total_bytes"] == os.path.getsize(file_path)
+    assert sum(report["table_bytes"].values()) == report["total_bytes"]
+    assert report["element_count"] == 396
+    assert report["record_count"] == 34
+    with pytest.raises(ValueError):
+        parser.memory_report(verify=True)
+
+    tree.close()
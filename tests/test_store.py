@@ -0,0 +1,99 @@
+import gc
+import pytest
+from gedcom.element.individual import IndividualElement
+from gedcom.parser import Parser
+
+
+def test_parse_file_into_store(tmp_path):
+    store_path = str(tmp_path / 'family.sqlite')
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged', store=store_path, cache_size=2)
+
+    assert len(parser.get_root_child_elements()) == 34
+    assert len(parser.get_element_dictionary()) == 32
+    assert len(list(parser.get_element_list())) == 396
+    assert len(parser.get_element_list()) == 396
+    assert [element.to_gedcom_string() for element in parser.get_element_list()[-3:]] == [
+        element.to_gedcom_string() for element in list(parser.get_element_list())[-3:]
+    ]
+    assert parser.get_element_list()[-1].get_tag() == 'TRLR'
+    assert parser.get_element_list()[1].get_parent_element().get_tag() == 'HEAD'
+    assert len(parser.get_root_element().get_child_elements()) == 0
+
+    individual = parser.get_element_dictionary()['@1@']
+    assert isinstance(individual, IndividualElement)
+    assert [parent.get_name() for parent in parser.get_parents(individual)] == [
+        ('Gudwin', 'Mustermann'), ('Gisela', 'Musterfrau')
+    ]
+    assert '@1@' in parser.get_element_dictionary()
+    assert '@unknown@' not in parser.get_element_dictionary()
+
+
+def test_load_store(tmp_path):
+    store_path = str(tmp_path / 'family.sqlite')
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged', store=store_path, cache_size=2)
+
+    individual = parser.get_element_dictionary()['@1@']
+    individual.new_child_element('OCCU', value='Baker')
+    for record in parser.get_root_child_elements():
+        assert record.get_level() == 0
+    assert parser.get_element_dictionary()['@1@'] is individual
+    parser.flush_store()
+
+    stored_parser = Parser()
+    stored_parser.load_store(store_path)
+    assert stored_parser.get_element_dictionary()['@1@'].get_occupation() == 'Baker'
+    assert len(stored_parser.get_element_list()) == 397
+
+
+def test_keep_records_modified_after_eviction(tmp_path):
+    store_path = str(tmp_path / 'family.sqlite')
+    parser = Parser()
+    parser.parse_file('tests/files/Musterstammbaum.ged', store=store_path, cache_size=2)
+
+    individual = parser.get_element_dictionary()['@1@']
+    for record in parser.get_root_child_elements()[:4]:
+        assert record.get_level() == 0
+    individual.new_child_element('OCCU', value='Baker')
+    del individual
+    del record
+    gc.collect()
+    parser.flush_store()
+
+    stored_parser = Parser()
+    stored_parser.load_store(store_path)
+    assert stored_parser.get_element_dictionary()['@1@'].get_occupation() == 'Baker'
+
+
+def test_parse_file_into_store_without_hooks(tmp_path):
+    store_path = str(tmp_path / 'family.sqlite')
+    with pytest.raises(ValueError):
+        Parser().parse_file('tests/files/Musterstammbaum.ged', store=store_path, stats=True)
+    with pytest.raises(ValueError):
+        Parser().parse_file('tests/files/Musterstammbaum.ged', store=store_path, on_record=print)
+
+
+def test_parse_file_into_store_leniently(tmp_path):
+    file_path = tmp_path / 'malformed.ged'
+    file_path.write_bytes(b'0 HEAD\n0 @I1@ INDI\n1 NOTE First line\nsecond line\n1 BIRTH-PLACE Berlin\n0 TRLR\n')
+    parser = Parser()
+    parser.parse_file(str(file_path), strict=False, store=str(tmp_path / 'family.sqlite'))
+    assert len(parser.get_recovery().get_diagnostics()) == 2
+
+    individual = parser.get_root_child_elements()[1]
+    assert [child.get_tag() for child in individual.get_child_elements()] == ['NOTE', 'BIRTH-PLACE']
+    assert len(parser.get_recovery().get_diagnostics()) == 2
+
+
+def test_element_dictionary_with_duplicate_pointers(tmp_path):
+    file_path = tmp_path / 'duplicates.ged'
+    file_path.write_bytes(b'0 HEAD\n0 @I1@ INDI\n1 NAME First\n0 @I2@ INDI\n0 @I1@ INDI\n1 NAME Second\n'
+                          b'0 INDI\n0 TRLR\n')
+    parser = Parser()
+    parser.parse_file(str(file_path), store=str(tmp_path / 'family.sqlite'))
+
+    element_dictionary = parser.get_element_dictionary()
+    assert list(element_dictionary) == ['@I1@', '@I2@']
+    assert len(element_dictionary) == 2
+    assert element_dictionary['@I1@'].get_child_elements()[0].get_value() == 'First'
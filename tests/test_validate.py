@@ -0,0 +1,57 @@
+from gedcom.parser import Parser
+from gedcom.validate import validate, validate_file
+
+GEDCOM = """0 HEAD
+1 SOUR Test
+1 SUBM @U1@
+1 GEDC
+2 VERS 5.5
+1 CHAR UTF-8
+0 @U1@ SUBM
+1 NAME Submitter
+0 @I1@ INDI
+1 NAME Max /Mustermann/
+1 SEX M
+1 SEX M
+1 FAMS @F1@
+1 FOO Bar
+0 @I2@ INDI
+1 NAME Erika /Mustermann/
+1 FAMC @F1@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I3@
+1 CHIL @F1@
+0 @I1@ INDI
+0 @F2@ FAM
+"""
+
+
+def get_diagnostics(diagnostics):
+    return [(diagnostic.line_number, diagnostic.code) for diagnostic in diagnostics]
+
+
+def test_validate():
+    parser = Parser()
+    parser.parse([(line + '\n').encode('utf-8') for line in GEDCOM.splitlines()])
+
+    assert get_diagnostics(validate(parser)) == [
+        (12, 'TOO_MANY'),
+        (14, 'UNEXPECTED_TAG'),
+        (17, 'MISSING_BACK_REFERENCE'),
+        (20, 'DANGLING_POINTER'),
+        (21, 'WRONG_RECORD_TYPE'),
+        (22, 'DUPLICATE_POINTER'),
+        (23, 'MISSING_TRAILER'),
+    ]
+
+
+def test_validate_file(tmp_path):
+    assert validate_file('tests/files/Musterstammbaum.ged') == []
+
+    file_path = tmp_path / 'invalid.ged'
+    file_path.write_text(GEDCOM * 3)
+    diagnostics = validate_file(str(file_path))
+    assert validate_file(str(file_path), workers=2) == diagnostics
+    assert len([diagnostic for diagnostic in diagnostics if diagnostic.code == 'DUPLICATE_POINTER']) == 13
+    assert diagnostics[-1] == (69, 'ERROR', 'MISSING_TRAILER', "File doesn't end with TRLR")